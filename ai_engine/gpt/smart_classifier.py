@@ -19,7 +19,7 @@ def tag_audio_hermes(filepath: str) -> Dict[str, str]:
     Returns dict: {"genre": ..., "mood": ..., "instrument": ...}
     """
     try:
-        import requests
+        from core.http_client import get_session, timeouts
         HERMES_API_URL = os.getenv("HERMES_API_URL", "http://localhost:11434/api/generate")
         with open(filepath, "rb") as f:
             files = {'file': (os.path.basename(filepath), f, 'audio/wav')}
@@ -27,7 +27,7 @@ def tag_audio_hermes(filepath: str) -> Dict[str, str]:
                 "model": config.HERMES_MODEL,
                 "task": "audio_tagging"
             }
-            response = requests.post(HERMES_API_URL, data=data, files=files, timeout=60)
+            response = get_session().post(HERMES_API_URL, data=data, files=files, timeout=timeouts())
             response.raise_for_status()
             tags = response.json()
             # Eksempel på forventet Hermes-respons: {"genre": "Techno", "mood": "Dark", "instrument": "Kick"}
@@ -45,12 +45,10 @@ def tag_audio_librosa(filepath: str) -> Dict[str, str]:
     Fallback: Use librosa to extract features and classify heuristically.
     """
     try:
-        import librosa
-        import numpy as np
-        y, sr = librosa.load(filepath, sr=None, mono=True)
-        tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-        mfcc = librosa.feature.mfcc(y=y, sr=sr)
-        avg_mfcc = np.mean(mfcc, axis=1).tolist()
+        from core.features import extract_features
+        from core.tempo import estimate_tempo
+        tempo = estimate_tempo(filepath)["bpm"] or 0.0
+        avg_mfcc = extract_features(filepath, ["mfcc_means"])["mfcc_means"]
         # Simple heuristics (kan byttes med ML-modell)
         genre = "Techno" if tempo > 122 else "House" if tempo > 110 else "Unknown"
         mood = "Energetic" if avg_mfcc[0] > 0 else "Chill"
@@ -2,21 +2,22 @@ from utils.config import config
 # ai_engine/gpt/tag_analyzer.py
 
 from core.ai_backend import query_ai
+from core.catalog import get_catalog
 from rich.console import Console
 from rich.prompt import Prompt
-import os
 import json
 
 console = Console()
 
 def analyze_tags(file_path, backend="hermes"):
-    json_path = file_path + ".json"
-    if not os.path.exists(json_path):
-        console.print(f"[yellow]No tag file found for {file_path}. Skipping.[/yellow]")
+    catalog = get_catalog()
+    tags = catalog.get_tags(file_path)
+    if not tags and catalog.import_sidecar(file_path):
+        tags = catalog.get_tags(file_path)
+    if not tags:
+        console.print(f"[yellow]No tags found for {file_path}. Skipping.[/yellow]")
         return
-
-    with open(json_path, "r", encoding="utf-8") as f:
-        tags = f.read()
+    tags = json.dumps(tags, ensure_ascii=False)
 
     prompt = (
         f"Analyze and critique the tags for this audio file: {file_path}.\n"
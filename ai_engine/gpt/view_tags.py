@@ -1,26 +1,46 @@
 from utils.config import config
 # ai_engine/gpt/view_tags.py
 
-import os
-import json
 from rich.console import Console
 from rich.prompt import Prompt
+from rich.table import Table
+
+from core.catalog import get_catalog
+from core.tag_index import get_tag_index
 
 console = Console()
 
 def view_tags(file_path):
-    json_path = file_path + ".json"
-    if not os.path.exists(json_path):
-        console.print(f"[yellow]No tag file found for {file_path}.[/yellow]")
+    catalog = get_catalog()
+    tags = catalog.get_tags(file_path)
+    if not tags and catalog.import_sidecar(file_path):
+        tags = catalog.get_tags(file_path)
+    if not tags:
+        console.print(f"[yellow]No tags found for {file_path}.[/yellow]")
         return
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        tags = json.load(f)
     console.print(f"[bold green]Tags for {file_path}:[/bold green] {tags}")
 
+def browse_tags(folder=None, query=""):
+    """Show tag facet counts (genre/mood/instrument -> count) from the tag index."""
+    index = get_tag_index()
+    hits = index.query(query) & index.folder_mask(folder)
+    console.print(f"[bold]{index.count(hits)} samples[/bold]")
+    for field in index.fields():
+        table = Table(title=field.title())
+        table.add_column("Value")
+        table.add_column("Count", justify="right")
+        for value, count in index.facets(field, within=hits, top=25):
+            table.add_row(value, str(count))
+        console.print(table)
+
 def main():
-    file_path = Prompt.ask("Enter path to audio file (tags in .json file expected)")
-    view_tags(file_path)
+    file_path = Prompt.ask("Enter path to audio file (leave blank to browse all tags)", default="")
+    if file_path:
+        view_tags(file_path)
+    else:
+        query = Prompt.ask("Tag query (e.g. genre:techno NOT mood:dark, blank for all)", default="")
+        browse_tags(query=query)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,75 @@
+# api/api_router.py
+
+"""
+SampleMindAI – Library API Router
+FastAPI routes for browsing the sample library. Served from the same catalog and
+in-memory tag index as the CLI and GUI, so results are identical everywhere.
+
+Usage:
+    from api.api_router import router
+    app.include_router(router)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from core.catalog import get_catalog
+from core.tag_index import browse, get_tag_index
+from core.peaks import waveform_envelope
+
+router = APIRouter(prefix="/library", tags=["library"])
+
+
+@router.get("/search")
+def search_samples(
+    q: str = "",
+    folder: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """Tag query (e.g. `genre:techno NOT mood:dark`) -> total, page of paths and facet counts."""
+    try:
+        return browse(q, folder=folder, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/facets")
+def facet_counts(
+    field: List[str] = Query(["genre", "mood", "instrument"]),
+    q: str = "",
+    folder: Optional[str] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Value counts per tag field, optionally within a query/folder."""
+    index = get_tag_index()
+    try:
+        hits = index.query(q) & index.folder_mask(folder)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {name: dict(index.facets(name, within=hits)) for name in field}
+
+
+@router.get("/sample")
+def sample_details(path: str) -> Dict[str, Any]:
+    """Catalog record (stats + tags) for one file."""
+    record = get_catalog().get_sample(path)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Sample not in catalog")
+    return record
+
+
+@router.get("/waveform")
+def waveform(
+    path: str,
+    start: int = Query(0, ge=0),
+    stop: Optional[int] = Query(None, ge=1),
+    width: int = Query(800, ge=1, le=10000),
+) -> Dict[str, Any]:
+    """Min/max/RMS envelope columns from the cached peak pyramid (no audio decode after the first call)."""
+    if get_catalog().get_sample(path) is None:
+        raise HTTPException(status_code=404, detail="Sample not in catalog")
+    result = waveform_envelope(path, start=start, stop=stop, width=width)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Audio file not readable")
+    return result
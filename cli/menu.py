@@ -25,6 +25,7 @@ CATEGORIES: Dict[str, List[Tuple[str, str]]] = {
     "Analyze": [
         ("Analyze Sample", "analyze_sample"),
         ("Analyze Loops", "analyze_loops"),
+        ("Detect Loop Points", "detect_loops"),
         ("Analyze Audio Stats", "analyze_audio_stats"),
         ("Analyze Favorites", "analyze_favorites"),
         ("Analyze Recordings", "analyze_recordings"),
@@ -34,6 +35,7 @@ CATEGORIES: Dict[str, List[Tuple[str, str]]] = {
         ("Snapshot Library", "snapshot_library"),
         ("Snapshot Manager", "snapshot_manager"),
         ("Export CSV", "export_csv"),
+        ("Search Library", "search_library"),
     ],
     "AI Tools": [
         ("Smart Classifier", "smart_classifier"),
@@ -43,6 +45,7 @@ CATEGORIES: Dict[str, List[Tuple[str, str]]] = {
     ],
     "Batch/Compare": [
         ("Compare Folders", "compare_folders"),
+        ("Near Duplicates", "near_duplicates"),
         ("Batch Reanalyze", "batch_reanalyze"),
         ("Classify Local Fallback", "classify_local_fallback"),
     ],
@@ -117,7 +120,25 @@ def run_module(module_name: str) -> None:
             traceback.print_exc()
     input("\nPress Enter to return to the menu...")
 
+def parse_args(argv: List[str]) -> None:
+    """Apply command-line options (`--workers N`, `--no-cache`) to the config."""
+    for idx, arg in enumerate(argv):
+        if arg == "--no-cache":
+            config.LLM_CACHE = False
+            continue
+        value = None
+        if arg == "--workers" and idx + 1 < len(argv):
+            value = argv[idx + 1]
+        elif arg.startswith("--workers="):
+            value = arg.split("=", 1)[1]
+        if value is not None:
+            try:
+                config.WORKERS = max(1, int(value))
+            except ValueError:
+                console.print(f"[red]Invalid --workers value '{value}', using {config.WORKERS}.[/red]")
+
 def main() -> None:
+    parse_args(sys.argv[1:])
     while True:
         print_menu()
         menu_map = get_menu_map()
@@ -3,12 +3,13 @@
 """
 SampleMindAI – Analyze Audio Stats
 Batch analyzes all audio files in a folder for key stats and saves as .json sidecar files.
+Header stats come from the header-only probe; quality score and loudness (LUFS,
+true peak, LRA) are measured in one signal pass on a process pool (core.quality)
+and stored in the catalog too.
 Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 """
 
 import os
-import json
-import wave
 from typing import List, Dict, Any, Optional
 from rich.console import Console
 from rich.prompt import Prompt
@@ -16,51 +17,55 @@ from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
-from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from utils.file_utils import ensure_folder_exists
+from core.catalog import get_catalog
+from core.library_scanner import files_to_analyze
+from core.audio_probe import probe_files
+from core.quality import analyze_quality
 
 console = Console()
 
-def analyze_wav_stats(filepath: str) -> Optional[Dict[str, Any]]:
-    """
-    Analyze a WAV file for key stats.
-    Returns a dictionary with stats, or None on error.
-    """
-    try:
-        with wave.open(filepath, "rb") as wf:
-            return {
-                "sample_rate": wf.getframerate(),
-                "channels": wf.getnchannels(),
-                "sample_width": wf.getsampwidth(),
-                "frame_count": wf.getnframes(),
-                "duration_sec": wf.getnframes() / float(wf.getframerate()),
-            }
-    except Exception as e:
-        console.print(f"[red]Failed to analyze {filepath}: {e}[/]")
-        log_event(f"Failed to analyze {filepath}: {e}")
-        return None
-
-def analyze_audio_stats(folder: str) -> List[Dict[str, Any]]:
+def analyze_audio_stats(
+    folder: str,
+    incremental: bool = True,
+    workers: Optional[int] = None,
+    signal: bool = True,
+) -> List[Dict[str, Any]]:
     """
     Analyze all supported audio files in the given folder.
+    In incremental mode only new/changed (or never analyzed) files are processed.
     """
     ensure_folder_exists(folder)
-    audio_files = find_all_audio_files(folder, [".wav"])  # Focus on .wav for universal support
+    catalog = get_catalog()
+    audio_files = files_to_analyze(folder, config.SUPPORTED_EXTENSIONS, "duration_sec", incremental)
+    if not signal:
+        signal_files: List[str] = []
+    elif incremental:
+        # the folder was just synced: only the per-column work list is needed
+        signal_files = catalog.paths_missing(folder, "quality_score", config.SUPPORTED_EXTENSIONS)
+    else:
+        signal_files = audio_files
+    audio_files = sorted(set(audio_files) | set(signal_files))
     if not audio_files:
-        console.print(f"[yellow]No .wav files found in {folder}[/]")
+        console.print(f"[yellow]No new or changed audio files found in {folder}[/]")
         return []
 
     console.print(f"[bold cyan]Analyzing {len(audio_files)} files in {folder}...[/bold cyan]")
     results = []
 
-    for audio_path in track(audio_files, description="Analyzing"):
-        stats = analyze_wav_stats(audio_path)
+    # Header-only probe on a thread pool; stats are stored in the catalog
+    probed = probe_files(audio_files, workers=workers)
+    measured = analyze_quality(signal_files, workers=workers) if signal_files else {}
+    for audio_path in track(audio_files, description="Saving"):
+        stats = probed.get(audio_path)
         if stats:
-            # Save per-file stats as .json
-            json_path = os.path.splitext(audio_path)[0] + ".json"
-            with open(json_path, "w") as f:
-                json.dump(stats, f, indent=2)
+            if audio_path in measured:
+                stats = {**stats, "quality_score": measured[audio_path]["quality_score"]}
+            catalog.export_sidecar(audio_path)
             results.append({"path": audio_path, **stats})
             log_event(f"Analyzed audio stats: {audio_path} [{stats}]")
+        else:
+            console.print(f"[red]Failed to analyze {audio_path}[/]")
 
     return results
 
@@ -76,7 +81,7 @@ def main() -> None:
 
     results = analyze_audio_stats(folder)
     if results:
-        console.print(f"[green]Analyzed {len(results)} audio files. Stats saved as .json files.[/green]")
+        console.print(f"[green]Analyzed {len(results)} audio files. Stats saved to the catalog and .json files.[/green]")
     else:
         console.print("[yellow]No valid audio files analyzed.[/yellow]")
 
@@ -8,13 +8,14 @@ Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 
 import os
 import json
-import wave
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from rich.console import Console
 from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
+from core.audio_probe import probe_files
 
 BOOKMARKS_FILE = os.path.join(config.OUTPUT_DIR, "bookmarked_samples.json")
 console = Console()
@@ -32,43 +33,27 @@ def load_bookmarks() -> List[str]:
         pass
     return []
 
-def analyze_wav_stats(filepath: str) -> Optional[Dict[str, Any]]:
-    """
-    Analyze a WAV file for key stats.
-    Returns a dictionary with stats, or None on error.
-    """
-    try:
-        with wave.open(filepath, "rb") as wf:
-            return {
-                "sample_rate": wf.getframerate(),
-                "channels": wf.getnchannels(),
-                "sample_width": wf.getsampwidth(),
-                "frame_count": wf.getnframes(),
-                "duration_sec": wf.getnframes() / float(wf.getframerate()),
-            }
-    except Exception as e:
-        console.print(f"[red]Failed to analyze {filepath}: {e}[/]")
-        log_event(f"Failed to analyze {filepath}: {e}")
-        return None
-
 def analyze_favorites() -> List[Dict[str, Any]]:
-    """Analyze all bookmarked WAV files and save their stats as .json."""
+    """Analyze all bookmarked audio files and save their stats to the catalog and .json sidecars."""
     files = load_bookmarks()
-    wav_files = [f for f in files if f.lower().endswith(".wav")]
-    if not wav_files:
-        console.print(f"[yellow]No bookmarked .wav files found.[/yellow]")
+    exts = tuple(ext.lower() for ext in config.SUPPORTED_EXTENSIONS)
+    audio_files = [f for f in files if f.lower().endswith(exts)]
+    if not audio_files:
+        console.print(f"[yellow]No bookmarked audio files found.[/yellow]")
         return []
 
-    console.print(f"[bold cyan]Analyzing {len(wav_files)} favorite WAV files...[/bold cyan]")
+    console.print(f"[bold cyan]Analyzing {len(audio_files)} favorite audio files...[/bold cyan]")
+    catalog = get_catalog()
+    probed = probe_files(audio_files)
     results = []
-    for f in track(wav_files, description="Analyzing favorites"):
-        stats = analyze_wav_stats(f)
+    for f in track(audio_files, description="Saving favorites"):
+        stats = probed.get(f)
         if stats:
-            json_path = os.path.splitext(f)[0] + ".json"
-            with open(json_path, "w") as fp:
-                json.dump(stats, fp, indent=2)
+            catalog.export_sidecar(f)
             results.append({"path": f, **stats})
             log_event(f"Analyzed favorite: {f} [{stats}]")
+        else:
+            console.print(f"[red]Failed to analyze {f}[/]")
     return results
 
 def main() -> None:
@@ -78,7 +63,7 @@ def main() -> None:
     console.print("[bold magenta]SampleMindAI – Analyze Favorites[/bold magenta]")
     results = analyze_favorites()
     if results:
-        console.print(f"[green]Analyzed {len(results)} favorites. Stats saved as .json files.[/green]")
+        console.print(f"[green]Analyzed {len(results)} favorites. Stats saved to the catalog and .json files.[/green]")
     else:
         console.print("[yellow]No valid favorites analyzed.[/yellow]")
 
@@ -3,12 +3,13 @@
 """
 SampleMindAI – Analyze Loops Module
 Batch analyzes all audio loops in a folder, extracts key features, and saves stats as .json.
+Tempo comes from the autocorrelation tempo engine (core.tempo), which uses the
+BPM in the file name and whole-bar loop lengths as priors; keys come from
+batch chroma/profile matching (modules.key_estimation.estimate_key).
 Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 """
 
 import os
-import json
-import wave
 from typing import List, Dict, Any, Optional
 from rich.console import Console
 from rich.progress import track
@@ -16,51 +17,55 @@ from rich.prompt import Prompt
 
 from utils.config import config
 from utils.logger import log_event
-from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from utils.file_utils import ensure_folder_exists
+from core.catalog import get_catalog
+from core.audio_probe import probe_files
+from core.library_scanner import files_to_analyze
+from core.tempo import analyze_tempo
+from modules.key_estimation.estimate_key import analyze_keys
 
 console = Console()
 
-def analyze_wav_file(filepath: str) -> Optional[Dict[str, Any]]:
-    """
-    Analyze a WAV file and extract features.
-    Returns a dictionary with stats, or None on error.
-    """
-    try:
-        with wave.open(filepath, "rb") as wf:
-            return {
-                "sample_rate": wf.getframerate(),
-                "channels": wf.getnchannels(),
-                "sample_width": wf.getsampwidth(),
-                "frame_count": wf.getnframes(),
-                "duration_sec": wf.getnframes() / float(wf.getframerate()),
-            }
-    except Exception as e:
-        console.print(f"[red]Failed to analyze {filepath}: {e}[/]")
-        log_event(f"Failed to analyze {filepath}: {e}")
-        return None
-
-def analyze_loop_files(folder: str) -> List[Dict[str, Any]]:
+def analyze_loop_files(folder: str, incremental: bool = True, workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Analyze all supported audio loops in the given folder.
+    In incremental mode only loops not tempo- or key-analyzed yet (new, changed,
+    or never analyzed) are processed, each analyzer on its own work list; loops
+    already found to have no pulse or no key are not read again.
     """
     ensure_folder_exists(folder)
-    audio_files = find_all_audio_files(folder, [".wav"])  # Loops are usually WAV, can expand as needed
+    catalog = get_catalog()
+    tempo_files = files_to_analyze(folder, config.SUPPORTED_EXTENSIONS, "bpm_analyzed_at", incremental)
+    # the folder was just synced: the key work list only needs the catalog
+    key_files = (catalog.paths_missing(folder, "key_analyzed_at", config.SUPPORTED_EXTENSIONS)
+                 if incremental else tempo_files)
+    audio_files = sorted(set(tempo_files) | set(key_files))
     if not audio_files:
-        console.print(f"[yellow]No .wav loop files found in {folder}[/]")
+        console.print(f"[yellow]No new or unanalyzed loop files found in {folder}[/]")
         return []
 
     console.print(f"[bold cyan]Analyzing {len(audio_files)} loop files in {folder}...[/bold cyan]")
     results = []
 
-    for audio_path in track(audio_files, description="Analyzing"):
-        stats = analyze_wav_file(audio_path)
+    # Header-only probe on a thread pool; stats are stored in the catalog
+    probed = probe_files(audio_files, workers=workers)
+    # Tempo and key estimation on a process pool; bpm and key are stored in the catalog
+    tempos = analyze_tempo(tempo_files, workers=workers, force=not incremental) if tempo_files else {}
+    keys = analyze_keys(key_files, workers=workers, force=not incremental) if key_files else {}
+    for audio_path in track(audio_files, description="Saving"):
+        stats = probed.get(audio_path)
         if stats:
-            # Save per-file stats as .json
-            json_path = os.path.splitext(audio_path)[0] + ".json"
-            with open(json_path, "w") as f:
-                json.dump(stats, f, indent=2)
+            tempo = tempos.get(audio_path)
+            if tempo:
+                stats = {**stats, "bpm": tempo["bpm"], "bpm_confidence": tempo["confidence"]}
+            key = keys.get(audio_path)
+            if key:
+                stats = {**stats, "key": key["key"], "key_confidence": key["confidence"]}
+            catalog.export_sidecar(audio_path)
             results.append({"path": audio_path, **stats})
             log_event(f"Analyzed loop: {audio_path} [{stats}]")
+        else:
+            console.print(f"[red]Failed to analyze {audio_path}[/]")
 
     return results
 
@@ -76,7 +81,7 @@ def main() -> None:
 
     results = analyze_loop_files(folder)
     if results:
-        console.print(f"[green]Analyzed {len(results)} loops. Stats saved as .json files.[/green]")
+        console.print(f"[green]Analyzed {len(results)} loops. Stats saved to the catalog and .json files.[/green]")
     else:
         console.print("[yellow]No valid loop files analyzed.[/yellow]")
 
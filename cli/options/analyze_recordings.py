@@ -3,65 +3,67 @@
 """
 SampleMindAI – Analyze Recordings CLI
 Extracts audio features from all recordings in a folder and saves as .json.
+Files are decoded and analyzed on a process pool (core.batch_executor).
+Recordings longer than STREAM_AFTER_SEC are analyzed block by block
+(core.features.StreamingExtractor), so hour-long sessions use bounded memory.
 """
 
 import os
 import json
-from typing import List, Dict, Optional
+from functools import partial
+from typing import Dict, Optional
 from rich.console import Console
 from rich.prompt import Prompt
-from rich.progress import track
 
 from utils.config import config
-import librosa
+from utils.file_utils import find_all_audio_files
+from core.batch_executor import run_batch
+from core.features import FeatureExtractor, StreamingExtractor
+from core.audio_probe import probe_file
 
 console = Console()
 
 FEATURES = [
     "duration", "sample_rate", "rms", "zero_crossings", "mfcc_mean"
 ]
+EXTRACTOR = FeatureExtractor(FEATURES, n_mfcc=13)
+STREAMING_EXTRACTOR = StreamingExtractor(FEATURES, n_mfcc=13)
+STREAM_AFTER_SEC = 300.0
 
 
-def get_audio_files(folder: str, extensions: List[str]) -> List[str]:
-    """Recursively find all audio files in a folder."""
-    files = []
-    for root, _, filenames in os.walk(folder):
-        for f in filenames:
-            if any(f.lower().endswith(ext) for ext in extensions):
-                files.append(os.path.join(root, f))
-    return files
-
-
-def extract_audio_features(filepath: str) -> Dict[str, Optional[float]]:
-    """Extract audio features from one file."""
+def extract_audio_features(filepath: str, streaming: Optional[bool] = None) -> Dict[str, Optional[float]]:
+    """
+    Extract audio features from one file. streaming=None picks block-wise
+    analysis for recordings longer than STREAM_AFTER_SEC (from the file header).
+    """
     try:
-        y, sr = librosa.load(filepath, sr=None, mono=True)
-        duration = librosa.get_duration(y=y, sr=sr)
-        rms = float(librosa.feature.rms(y=y).mean())
-        zero_crossings = int(librosa.zero_crossings(y).sum())
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-        mfcc_mean = float(mfcc.mean())
-        return {
-            "duration": duration,
-            "sample_rate": sr,
-            "rms": rms,
-            "zero_crossings": zero_crossings,
-            "mfcc_mean": mfcc_mean,
-        }
+        if streaming is None:
+            info = probe_file(filepath)
+            streaming = bool(info and (info.get("duration_sec") or 0) > STREAM_AFTER_SEC)
+        if streaming:
+            try:
+                return STREAMING_EXTRACTOR.extract(filepath)
+            except Exception as e:
+                # formats soundfile cannot stream (e.g. some MP3 builds) fall back to a full decode
+                console.print(f"[yellow]Streaming failed for {filepath} ({e}); decoding fully[/yellow]")
+        return EXTRACTOR.extract(filepath)
     except Exception as e:
         console.print(f"[red]Failed to extract features from {filepath}: {e}[/red]")
         return {k: None for k in FEATURES}
 
 
-def analyze_recordings_folder(folder: str, debug: bool = False) -> None:
+def analyze_recordings_folder(
+    folder: str, debug: bool = False, workers: Optional[int] = None, streaming: Optional[bool] = None
+) -> None:
     """Analyze all recordings in a folder and write feature .json files."""
-    files = get_audio_files(folder, config.SUPPORTED_EXTENSIONS)
+    files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
     if not files:
         console.print(f"[red]No audio files found in {folder}[/red]")
         return
 
-    for f in track(files, description="Analyzing recordings..."):
-        features = extract_audio_features(f)
+    extractor = partial(extract_audio_features, streaming=streaming)
+    for f, features in run_batch(extractor, files, workers=workers, description="Analyzing recordings..."):
+        features = features or {k: None for k in FEATURES}
         json_path = os.path.splitext(f)[0] + "_features.json"
         try:
             with open(json_path, "w") as fp:
@@ -7,60 +7,45 @@ Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 """
 
 import os
-import json
-import wave
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from rich.console import Console
 from rich.progress import track
 from rich.prompt import Prompt
 
 from utils.config import config
 from utils.logger import log_event
-from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from utils.file_utils import ensure_folder_exists
+from core.catalog import get_catalog
+from core.library_scanner import files_to_analyze
+from core.audio_probe import probe_files
 
 console = Console()
 
-def analyze_wav_file(filepath: str) -> Optional[Dict[str, Any]]:
-    """
-    Analyze a WAV file and extract features.
-    Returns a dictionary with stats, or None on error.
-    """
-    try:
-        with wave.open(filepath, "rb") as wf:
-            return {
-                "sample_rate": wf.getframerate(),
-                "channels": wf.getnchannels(),
-                "sample_width": wf.getsampwidth(),
-                "frame_count": wf.getnframes(),
-                "duration_sec": wf.getnframes() / float(wf.getframerate()),
-            }
-    except Exception as e:
-        console.print(f"[red]Failed to analyze {filepath}: {e}[/]")
-        log_event(f"Failed to analyze {filepath}: {e}")
-        return None
-
-def analyze_sample_files(folder: str) -> List[Dict[str, Any]]:
+def analyze_sample_files(folder: str, incremental: bool = True) -> List[Dict[str, Any]]:
     """
     Analyze all supported audio samples in the given folder.
+    In incremental mode only new/changed (or never analyzed) files are processed.
     """
     ensure_folder_exists(folder)
-    audio_files = find_all_audio_files(folder, [".wav"])  # Usually .wav, add more as needed
+    audio_files = files_to_analyze(folder, config.SUPPORTED_EXTENSIONS, "duration_sec", incremental)
     if not audio_files:
-        console.print(f"[yellow]No .wav sample files found in {folder}[/]")
+        console.print(f"[yellow]No new or changed sample files found in {folder}[/]")
         return []
 
     console.print(f"[bold cyan]Analyzing {len(audio_files)} sample files in {folder}...[/bold cyan]")
+    catalog = get_catalog()
     results = []
 
-    for audio_path in track(audio_files, description="Analyzing"):
-        stats = analyze_wav_file(audio_path)
+    # Header-only probe on a thread pool; stats are stored in the catalog
+    probed = probe_files(audio_files)
+    for audio_path in track(audio_files, description="Saving"):
+        stats = probed.get(audio_path)
         if stats:
-            # Save per-file stats as .json
-            json_path = os.path.splitext(audio_path)[0] + ".json"
-            with open(json_path, "w") as f:
-                json.dump(stats, f, indent=2)
+            catalog.export_sidecar(audio_path)
             results.append({"path": audio_path, **stats})
             log_event(f"Analyzed sample: {audio_path} [{stats}]")
+        else:
+            console.print(f"[red]Failed to analyze {audio_path}[/]")
 
     return results
 
@@ -76,7 +61,7 @@ def main() -> None:
 
     results = analyze_sample_files(folder)
     if results:
-        console.print(f"[green]Analyzed {len(results)} samples. Stats saved as .json files.[/green]")
+        console.print(f"[green]Analyzed {len(results)} samples. Stats saved to the catalog and .json files.[/green]")
     else:
         console.print("[yellow]No valid sample files analyzed.[/yellow]")
 
@@ -7,9 +7,7 @@ Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 """
 
 import os
-import json
-import wave
-from typing import Dict, Any, Optional, List
+from typing import List
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.progress import track
@@ -17,38 +15,25 @@ from rich.progress import track
 from utils.config import config
 from utils.logger import log_event
 from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from core.catalog import get_catalog
+from core.audio_probe import probe_files
 
 console = Console()
 
-def analyze_wav_file(filepath: str) -> Optional[Dict[str, Any]]:
-    """
-    Analyze a WAV file for basic stats.
-    """
-    try:
-        with wave.open(filepath, "rb") as wf:
-            return {
-                "sample_rate": wf.getframerate(),
-                "channels": wf.getnchannels(),
-                "sample_width": wf.getsampwidth(),
-                "frame_count": wf.getnframes(),
-                "duration_sec": wf.getnframes() / float(wf.getframerate()),
-            }
-    except Exception as e:
-        console.print(f"[red]Failed to analyze {filepath}: {e}[/]")
-        log_event(f"Analyzer error: {filepath}: {e}")
-        return None
-
 def analyze_files(files: List[str]) -> int:
-    """Analyze a list of files and save their stats as .json sidecars. Returns count processed."""
+    """Analyze a list of files and save their stats to the catalog and .json sidecars. Returns count processed."""
+    catalog = get_catalog()
+    probed = probe_files(files)
     processed = 0
-    for f in track(files, description="Analyzing"):
-        stats = analyze_wav_file(f)
+    for f in track(files, description="Saving"):
+        stats = probed.get(f)
         if stats:
-            json_path = os.path.splitext(f)[0] + ".json"
-            with open(json_path, "w") as fp:
-                json.dump(stats, fp, indent=2)
+            catalog.export_sidecar(f)
             log_event(f"Analyzed: {f} [{stats}]")
             processed += 1
+        else:
+            console.print(f"[red]Failed to analyze {f}[/]")
+            log_event(f"Analyzer error: {f}")
     return processed
 
 def main() -> None:
@@ -69,14 +54,14 @@ def main() -> None:
         if not os.path.isdir(folder):
             console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/red]")
             return
-        files = find_all_audio_files(folder, [".wav"])
+        files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
         if not files:
-            console.print(f"[yellow]No .wav files found in {folder}[/yellow]")
+            console.print(f"[yellow]No audio files found in {folder}[/yellow]")
             return
         processed = analyze_files(files)
 
     if processed:
-        console.print(f"[green]Analyzed {processed} file(s). Stats saved as .json files.[/green]")
+        console.print(f"[green]Analyzed {processed} file(s). Stats saved to the catalog and .json files.[/green]")
     else:
         console.print("[yellow]No valid files analyzed.[/yellow]")
 
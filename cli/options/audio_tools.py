@@ -3,31 +3,49 @@
 """
 SampleMindAI – Audio Tools
 Utilities for processing and manipulating audio files (e.g., normalizing, trimming, converting).
-Future functionality; currently includes placeholders.
+Normalizing and trimming use the two-pass streaming engine in
+core.audio.slicing.trim_and_normalize; format conversion is still a placeholder.
 """
 import os
+from typing import Optional
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Prompt, FloatPrompt
 from utils.config import config
 from utils.logger import log_event
+from core.audio.slicing.trim_and_normalize import process, process_folder
 
 console = Console()
 
-def normalize_audio(file_path: str) -> None:
+def _output_path(file_path: str, suffix: str) -> str:
+    return f"{os.path.splitext(file_path)[0]}_{suffix}.wav"
+
+def normalize_audio(file_path: str, target_lufs: float = -14.0, out_path: Optional[str] = None) -> Optional[str]:
     """
-    Placeholder for normalizing the audio file.
+    Normalize a file to `target_lufs` integrated loudness (peak kept under -1 dBFS).
+    Writes <name>_normalized.wav next to it unless `out_path` is given.
     """
     console.print(f"[cyan]Normalizing audio: {file_path}[/cyan]")
-    log_event(f"Audio normalization requested for: {file_path}")
-    # This would normally involve an audio processing library like librosa or pydub
+    result = process(file_path, out_path or _output_path(file_path, "normalized"), target_lufs=target_lufs, trim=False)
+    if result is None:
+        console.print(f"[yellow]{file_path} is silent; nothing to normalize.[/yellow]")
+        return None
+    console.print(f"[green]Gain {result['gain_db']:+.1f} dB → {result['integrated_lufs']:.1f} LUFS: {result['path']}[/green]")
+    log_event(f"Normalized {file_path} by {result['gain_db']:+.2f} dB to {result['path']}")
+    return result["path"]
 
-def trim_audio(file_path: str) -> None:
+def trim_audio(file_path: str, out_path: Optional[str] = None) -> Optional[str]:
     """
-    Placeholder for trimming silence or sections from an audio file.
+    Trim leading and trailing silence from a file.
+    Writes <name>_trimmed.wav next to it unless `out_path` is given.
     """
     console.print(f"[cyan]Trimming audio: {file_path}[/cyan]")
-    log_event(f"Audio trimming requested for: {file_path}")
-    # This would normally involve an audio processing library like librosa or pydub
+    result = process(file_path, out_path or _output_path(file_path, "trimmed"))
+    if result is None:
+        console.print(f"[yellow]{file_path} is silent; nothing to keep.[/yellow]")
+        return None
+    console.print(f"[green]Kept frames {result['start']}–{result['stop']}: {result['path']}[/green]")
+    log_event(f"Trimmed {file_path} to frames {result['start']}-{result['stop']}: {result['path']}")
+    return result["path"]
 
 def convert_audio_format(file_path: str, target_format: str) -> None:
     """
@@ -40,24 +58,34 @@ def convert_audio_format(file_path: str, target_format: str) -> None:
 def main() -> None:
     """
     CLI entrypoint for audio tools.
-    Placeholder for audio manipulation features.
     """
     console.print("[bold magenta]SampleMindAI – Audio Tools[/bold magenta]")
 
-    console.print("[yellow]Audio Tools functionality is currently a placeholder.[/yellow]")
     action = Prompt.ask(
-        "Select an action: [1] Normalize, [2] Trim, [3] Convert format",
-        choices=["1", "2", "3"],
+        "Select an action: [1] Normalize, [2] Trim, [3] Convert format, [4] Trim + normalize a folder",
+        choices=["1", "2", "3", "4"],
         default="1",
     )
 
+    if action == "4":
+        folder = Prompt.ask("Enter folder path", default=config.SAMPLES_DIR)
+        if not os.path.isdir(folder):
+            console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/red]")
+            return
+        output = Prompt.ask("Enter output folder", default=os.path.join(config.DATA_DIR, "normalized"))
+        target = FloatPrompt.ask("Target loudness (LUFS)", default=-14.0)
+        results = process_folder(folder, output, target_lufs=target)
+        console.print(f"[green]Wrote {len(results)} file(s) to {output}[/green]")
+        log_event(f"Trim + normalize of {folder} complete: {len(results)} file(s)")
+        return
+
     file_path = Prompt.ask("Enter the path to the audio file")
     if not file_path or not os.path.isfile(file_path):
         console.print(f"[red]File '{file_path}' does not exist. Aborting.[/red]")
         return
 
     if action == "1":
-        normalize_audio(file_path)
+        normalize_audio(file_path, FloatPrompt.ask("Target loudness (LUFS)", default=-14.0))
     elif action == "2":
         trim_audio(file_path)
     elif action == "3":
@@ -2,67 +2,53 @@
 """
 Advanced Audio Tools: Spectral analysis, harmonic content, pitch contour,
 ML-ready feature extraction using librosa + essentia (if available).
+Folders are analyzed on a process pool (core.batch_executor); every feature
+comes from one decode and one shared STFT (core.features).
 """
 
 import os
 from pathlib import Path
 from typing import Optional
 
-import numpy as np
-import librosa
-
 from rich.console import Console
 from rich.prompt import Prompt
-from utils.config import get_config
+from utils.config import config
 from utils.logger import log_event
 from utils.file_utils import find_all_audio_files
+from core.batch_executor import run_batch
+from core.features import FeatureExtractor
 
 console = Console()
-config = get_config()
+
+ADVANCED_FEATURES = FeatureExtractor([
+    "spectral_centroid", "spectral_bandwidth", "spectral_rolloff", "zero_crossing_rate", "dominant_pitch",
+])
 
 
 def extract_advanced_features(file_path: Path) -> Optional[dict]:
     try:
-        y, sr = librosa.load(file_path, sr=None)
-
-        # Spectral features
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr).mean()
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr).mean()
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr).mean()
-        zero_crossing_rate = librosa.feature.zero_crossing_rate(y).mean()
-
-        # Pitch and harmony
-        pitches, _ = librosa.piptrack(y=y, sr=sr)
-        dominant_pitch = np.max(pitches)
-
-        return {
-            "spectral_centroid": float(spectral_centroid),
-            "spectral_bandwidth": float(spectral_bandwidth),
-            "spectral_rolloff": float(spectral_rolloff),
-            "zero_crossing_rate": float(zero_crossing_rate),
-            "dominant_pitch": float(dominant_pitch)
-        }
+        return ADVANCED_FEATURES.extract(str(file_path))
     except Exception as e:
         console.print(f"[red]Error analyzing {file_path.name}: {e}")
         log_event("audio_analysis_failed", {"file": str(file_path), "error": str(e)})
         return None
 
-def main(debug: bool = False):
+def main(debug: bool = False, workers: Optional[int] = None):
     console.rule("[bold magenta]SampleMindAI – Advanced Audio Tools")
-    folder = Prompt.ask("Enter path to folder with audio files", default=config["sample_library"])
+    folder = Prompt.ask("Enter path to folder with audio files", default=config.SAMPLES_DIR)
     folder_path = Path(folder).expanduser()
     if not folder_path.exists():
         console.print("[bold red]Folder does not exist.")
         return
 
-    audio_files = find_all_audio_files(folder_path)
+    audio_files = [Path(p) for p in find_all_audio_files(str(folder_path))]
     if not audio_files:
         console.print("[yellow]No audio files found.")
         return
 
-    for path in audio_files:
-        console.print(f"\n[bold cyan]Analyzing:[/bold cyan] {path.name}")
-        features = extract_advanced_features(path)
+    for path, features in run_batch(extract_advanced_features, audio_files, workers=workers, ordered=True,
+                                     description="Analyzing"):
+        console.print(f"\n[bold cyan]Analyzed:[/bold cyan] {path.name}")
         if features:
             for key, value in features.items():
                 console.print(f"{key}: {value:.2f}")
@@ -3,21 +3,21 @@
 """
 SampleMindAI – Auto Tag Module
 Automatically tags all audio files in a folder using Hermes AI (primary) or fallback.
-Supports batch mode, config-driven paths, robust error handling, and Pylance-clean code.
+Supports batch mode (parallel via core.batch_executor), config-driven paths, robust error handling, and Pylance-clean code.
 """
 
 import os
+from functools import partial
 from typing import Dict, Optional
 from rich.console import Console
-from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
 from utils.file_utils import find_all_audio_files, ensure_folder_exists
 from ai_engine.hermes.hermes_tagger import tag_file_with_hermes
 from ai_engine.cnn.cnn_model import tag_file_with_cnn
-
-import json
+from core.catalog import get_catalog
+from core.batch_executor import run_batch
 
 console = Console()
 
@@ -51,9 +51,10 @@ def auto_tag_file(audio_path: str, ai_backend: str) -> Optional[Dict[str, str]]:
         log_event(f"Tagging failed for {audio_path}: {e}")
         return None
 
-def auto_tag_folder(folder: str, ai_backend: str) -> None:
+def auto_tag_folder(folder: str, ai_backend: str, workers: Optional[int] = None) -> None:
     """
     Batch-tag all audio files in the given folder and print/save their tags.
+    Hermes calls run on threads (I/O-bound); the local CNN runs on a process pool.
     """
     ensure_folder_exists(folder)
     audio_files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
@@ -63,12 +64,12 @@ def auto_tag_folder(folder: str, ai_backend: str) -> None:
 
     console.print(f"[bold cyan]Tagging {len(audio_files)} audio files in {folder}...[/]")
 
-    for audio_path in track(audio_files, description="Auto-tagging"):
-        tags = auto_tag_file(audio_path, ai_backend)
+    kind = "thread" if ai_backend == "hermes" else "process"
+    tagger = partial(auto_tag_file, ai_backend=ai_backend)
+    catalog = get_catalog()
+    for audio_path, tags in run_batch(tagger, audio_files, kind=kind, workers=workers, description="Auto-tagging"):
         if tags:
-            json_path = os.path.splitext(audio_path)[0] + ".json"
-            with open(json_path, "w") as f:
-                json.dump(tags, f, indent=2)
+            catalog.set_tags(audio_path, tags)
             console.print(f"[green]Tagged and saved: {audio_path}[/]", highlight=False)
 
 def main() -> None:
@@ -7,33 +7,46 @@ Config-driven, Pylance-clean, robust error handling, and Rich CLI UX.
 """
 
 import os
-import json
-from typing import List, Dict
+from functools import partial
+from typing import List, Dict, Optional
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
-from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
 from utils.file_utils import find_all_audio_files, ensure_folder_exists
 from ai_engine.hermes.hermes_tagger import tag_file_with_hermes
 from ai_engine.cnn.cnn_model import tag_file_with_cnn
+from core.catalog import get_catalog
+from core.library_scanner import pending_files
+from core.batch_executor import run_batch
 
 console = Console()
 
+def retag_file(audio_path: str, ai_backend: str) -> Dict[str, str]:
+    """
+    Tags an audio file using the selected AI backend without saving (safe to run in a worker).
+    Returns the tag dict, or {} on error.
+    """
+    try:
+        if ai_backend == "hermes":
+            return tag_file_with_hermes(audio_path)
+        return tag_file_with_cnn(audio_path)
+    except Exception as e:
+        console.print(f"[red]Failed to reanalyze {audio_path}: {e}[/]")
+        log_event(f"Reanalyze error for {audio_path}: {e}")
+        return {}
+
 def reanalyze_and_tag(audio_path: str, ai_backend: str) -> Dict[str, str]:
     """
-    Tags an audio file using the selected AI backend and overwrites its .json metadata.
+    Tags an audio file using the selected AI backend and overwrites its catalog tags (and .json sidecar).
     Returns the tag dict.
     """
+    tags = retag_file(audio_path, ai_backend)
+    if not tags:
+        return {}
     try:
-        if ai_backend == "hermes":
-            tags = tag_file_with_hermes(audio_path)
-        else:
-            tags = tag_file_with_cnn(audio_path)
-        json_path = os.path.splitext(audio_path)[0] + ".json"
-        with open(json_path, "w") as f:
-            json.dump(tags, f, indent=2)
+        get_catalog().set_tags(audio_path, tags, replace=True)
         log_event(f"Batch reanalyze: {audio_path} -> {tags}")
         return tags
     except Exception as e:
@@ -41,24 +54,33 @@ def reanalyze_and_tag(audio_path: str, ai_backend: str) -> Dict[str, str]:
         log_event(f"Reanalyze error for {audio_path}: {e}")
         return {}
 
-def batch_reanalyze(folder: str, ai_backend: str) -> int:
+def batch_reanalyze(folder: str, ai_backend: str, incremental: bool = False, workers: Optional[int] = None) -> int:
     """
     Batch reanalyzes all supported audio files in the folder.
-    Overwrites all .json tags.
+    Overwrites all .json tags. In incremental mode only files that are new or
+    changed since the last scan (or have no tags yet) are retagged.
     Returns the count of files processed.
     """
     ensure_folder_exists(folder)
-    audio_files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
+    if incremental:
+        catalog = get_catalog()
+        report = catalog.sync_folder(folder, config.SUPPORTED_EXTENSIONS)
+        audio_files = sorted(set(pending_files(report)) | set(catalog.untagged_paths(folder, config.SUPPORTED_EXTENSIONS)))
+    else:
+        audio_files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
     if not audio_files:
-        console.print(f"[yellow]No audio files found in {folder}[/yellow]")
+        console.print(f"[yellow]No audio files to reanalyze in {folder}[/yellow]")
         return 0
 
     console.print(f"[bold cyan]Batch reanalyzing {len(audio_files)} audio files in {folder}...[/bold cyan]")
     processed = 0
-
-    for audio_path in track(audio_files, description="Reanalyzing"):
-        tags = reanalyze_and_tag(audio_path, ai_backend)
+    catalog = get_catalog()
+    kind = "thread" if ai_backend == "hermes" else "process"
+    retagger = partial(retag_file, ai_backend=ai_backend)
+    for audio_path, tags in run_batch(retagger, audio_files, kind=kind, workers=workers, description="Reanalyzing"):
         if tags:
+            catalog.set_tags(audio_path, tags, replace=True)
+            log_event(f"Batch reanalyze: {audio_path} -> {tags}")
             processed += 1
 
     return processed
@@ -74,12 +96,14 @@ def main() -> None:
         return
 
     ai_backend = config.AI_BACKEND
-    confirm = Confirm.ask("This will overwrite all .json tags in this folder. Proceed?", default=False)
+    incremental = Confirm.ask("Only reanalyze new/changed or untagged files?", default=True)
+    scope = "new/changed" if incremental else "all"
+    confirm = Confirm.ask(f"This will overwrite .json tags for {scope} files in this folder. Proceed?", default=False)
     if not confirm:
         console.print("[yellow]Operation cancelled.[/yellow]")
         return
 
-    count = batch_reanalyze(folder, ai_backend)
+    count = batch_reanalyze(folder, ai_backend, incremental=incremental)
     if count > 0:
         console.print(f"[green]Reanalyzed and updated {count} files.[/green]")
     else:
@@ -2,56 +2,79 @@
 
 """
 SampleMindAI – Delete Duplicates
-Detect and remove duplicate audio files based on filename, size, or hash.
-Future functionality; currently includes a placeholder.
+Detect and remove (or hard-link) byte-identical audio files.
+Uses the staged engine in core.dedup (size buckets -> first/last 64 KB -> full hash),
+shows the plan, and only touches files after confirmation.
 """
 
+from typing import Any, Dict
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Prompt, Confirm
+from rich.table import Table
 from utils.config import config
 from utils.logger import log_event
+from core.content_hash import content_hashes
+from core.dedup import apply_plan, find_duplicates_in_folder
 import os
-import hashlib
 
 console = Console()
 
 def get_file_hash(file_path: str) -> str:
     """
-    Generates a hash for a file to detect duplicates. Uses SHA256 by default.
+    Returns the content hash of a file from the shared hash store (core.content_hash);
+    it is only recomputed when the file's size, mtime or inode changed.
     """
-    hash_sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        while chunk := f.read(4096):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+    return content_hashes([file_path], workers=1).get(file_path, "")
 
-def delete_duplicate_files(folder: str) -> None:
+def display_plan(plan: Dict[str, Any], limit: int = 50) -> None:
+    """Show duplicate groups (kept file and what happens to the rest) and scan stats."""
+    table = Table(title=f"Duplicate Groups ({len(plan['groups'])})")
+    table.add_column("Keep")
+    table.add_column("Duplicates")
+    table.add_column("Size", justify="right")
+    table.add_column("Action")
+    for group in plan["groups"][:limit]:
+        table.add_row(
+            group["keep"],
+            "\n".join(group["duplicates"]),
+            f"{group['size'] / 1024:.0f} KB",
+            group["action"],
+        )
+    console.print(table)
+    if len(plan["groups"]) > limit:
+        console.print(f"[dim]... and {len(plan['groups']) - limit} more group(s)[/dim]")
+
+    stats = plan["stats"]
+    read_pct = 100.0 * stats["bytes_read"] / stats["bytes_total"] if stats["bytes_total"] else 0.0
+    console.print(
+        f"[cyan]{stats['files']} files → {stats['after_size']} share a size → "
+        f"{stats['after_edges']} match on first/last 64 KB → {stats['groups']} duplicate group(s). "
+        f"Read at most {read_pct:.1f}% of {stats['bytes_total'] / 1e6:.1f} MB; "
+        f"{stats['reclaimable'] / 1e6:.1f} MB reclaimable.[/cyan]"
+    )
+
+def delete_duplicate_files(folder: str, action: str = "delete", confirm: bool = True) -> None:
     """
-    Detects and deletes duplicate files in a folder.
-    Placeholder for future implementation with real duplicate detection.
+    Detects duplicate files in a folder, shows the plan, and deletes or hard-links
+    the duplicates (keeping the shallowest path of each group).
     """
-    seen_files = {}
-    duplicates = []
-    
-    # Placeholder logic: checking for duplicates based on file hash
-    for root, _, files in os.walk(folder):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if not file_path.lower().endswith(tuple(config.SUPPORTED_EXTENSIONS)):
-                continue
-
-            file_hash = get_file_hash(file_path)
-            if file_hash in seen_files:
-                duplicates.append(file_path)
-                os.remove(file_path)
-                log_event(f"Deleted duplicate: {file_path}")
-            else:
-                seen_files[file_hash] = file_path
-    
-    if not duplicates:
+    plan = find_duplicates_in_folder(folder, action=action)
+    if not plan["groups"]:
         console.print(f"[green]No duplicates found in {folder}[/green]")
-    else:
-        console.print(f"[green]Deleted {len(duplicates)} duplicate file(s) from {folder}[/green]")
+        return
+
+    display_plan(plan)
+    if confirm and not Confirm.ask(f"Apply plan ({action} duplicates)?", default=False):
+        console.print("[yellow]No files changed.[/yellow]")
+        return
+
+    result = apply_plan(plan)
+    verb = "Deleted" if action == "delete" else "Hard-linked"
+    console.print(f"[green]{verb} {len(result['done'])} duplicate file(s) in {folder}[/green]")
+    if result["skipped"]:
+        console.print(f"[yellow]Skipped {len(result['skipped'])} file(s) that changed since the scan[/yellow]")
+    if result["errors"]:
+        console.print(f"[red]{len(result['errors'])} file(s) failed; see log[/red]")
 
 def main() -> None:
     """
@@ -64,10 +87,11 @@ def main() -> None:
         console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/red]")
         return
 
-    delete_duplicate_files(folder)
+    action = Prompt.ask("What to do with duplicates", choices=["delete", "hardlink"], default="delete")
+    delete_duplicate_files(folder, action=action)
 
-    console.print("[green]Duplicate deletion complete![/green]")
-    log_event(f"Duplicate deletion complete for folder: {folder}")
+    console.print("[green]Duplicate check complete![/green]")
+    log_event(f"Duplicate check complete for folder: {folder}")
 
 if __name__ == "__main__":
     main()
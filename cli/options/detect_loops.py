@@ -0,0 +1,79 @@
+# cli/options/detect_loops.py
+
+"""
+SampleMindAI – Detect Loop Points
+Batch finds seamless whole-bar loop points for every loop in a folder
+(modules.loop_detection.loop_detector) and optionally writes crossfaded loops
+(loop_creator). Loop points are stored in the catalog, so folders are processed
+incrementally: only new or changed loops are analyzed again.
+"""
+
+import os
+from typing import Any, Dict, Optional
+from rich.console import Console
+from rich.prompt import Confirm, Prompt
+from rich.table import Table
+
+from utils.config import config
+from utils.logger import log_event
+from utils.file_utils import ensure_folder_exists
+from core.library_scanner import files_to_analyze
+from modules.loop_detection.loop_creator import create_loops
+from modules.loop_detection.loop_detector import SEAMLESS_SCORE, detect_loops
+
+console = Console()
+
+def detect_folder_loops(
+    folder: str,
+    incremental: bool = True,
+    workers: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Find loop points for the loops in `folder` (only new/changed ones in incremental mode).
+    """
+    ensure_folder_exists(folder)
+    audio_files = files_to_analyze(folder, config.SUPPORTED_EXTENSIONS, "loop_end", incremental)
+    if not audio_files:
+        console.print(f"[yellow]No new or changed loop files found in {folder}[/]")
+        return {}
+    console.print(f"[bold cyan]Finding loop points in {len(audio_files)} files in {folder}...[/bold cyan]")
+    return detect_loops(audio_files, workers=workers, force=not incremental)
+
+def display_loops(loops: Dict[str, Dict[str, Any]], limit: int = 50) -> None:
+    """Show loop points (frames) and seam scores; seamless ones in green."""
+    table = Table(title=f"Loop Points ({len(loops)})")
+    for column in ("File", "Start", "End", "Score"):
+        table.add_column(column, justify="left" if column == "File" else "right")
+    for path, points in sorted(loops.items())[:limit]:
+        style = "green" if points["score"] >= SEAMLESS_SCORE else "yellow"
+        table.add_row(os.path.basename(path), str(points["start"]), str(points["end"]),
+                      f"[{style}]{points['score']:.2f}[/{style}]")
+    console.print(table)
+    if len(loops) > limit:
+        console.print(f"[dim]... and {len(loops) - limit} more loop(s)[/dim]")
+
+def main() -> None:
+    """
+    CLI entrypoint for detecting loop points in a folder and writing seamless loops.
+    """
+    console.print("[bold magenta]SampleMindAI – Detect Loop Points[/bold magenta]")
+    folder = Prompt.ask("Loops folder", default=config.LOOPS_DIR)
+    if not os.path.isdir(folder):
+        console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/]")
+        return
+
+    incremental = not Confirm.ask("Re-detect every loop (ignore stored loop points)?", default=False)
+    loops = detect_folder_loops(folder, incremental=incremental)
+    if not loops:
+        console.print("[yellow]No loop points found.[/yellow]")
+        return
+    display_loops(loops)
+    log_event(f"Loop points: {len(loops)} loop(s) in {folder}")
+
+    if Confirm.ask("Write crossfaded loops?", default=False):
+        out_dir = Prompt.ask("Output folder", default=os.path.join(config.OUTPUT_DIR, "loops"))
+        written = create_loops(loops, out_dir, root=folder)
+        console.print(f"[green]Wrote {len(written)} loop(s) to {out_dir}[/green]")
+
+if __name__ == "__main__":
+    main()
@@ -3,46 +3,37 @@
 """
 SampleMindAI – Export Pack Module
 Exports a curated pack of samples/loops from your library with filtering by tags and smart selection.
+Tag, BPM and key filtering is answered by the catalog's in-memory indexes (core.library_query).
 Config-driven, robust, Pylance-clean, with Rich CLI and logging.
 """
 
 import os
-import shutil
 import json
-from typing import List, Dict, Optional
+import shutil
+from datetime import datetime
+from typing import List, Dict
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Prompt, Confirm
 from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
-from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from utils.file_utils import ensure_folder_exists
+from core.catalog import get_catalog, sidecar_path
+from core.tag_index import get_tag_index
+from core.library_query import parse_range, search
+from core.content_hash import content_hashes
 
 console = Console()
 
-def load_tags(json_path: str) -> Optional[Dict[str, str]]:
-    """Loads tags from a .json file, returns None if missing or invalid."""
-    try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            return None
-    except Exception:
-        return None
-
 def filter_files_by_tags(file_list: List[str], tag_filter: Dict[str, str]) -> List[str]:
     """
-    Filters audio files by tags in their adjacent .json metadata.
+    Filters audio files by their catalog tags.
     Only files whose tags match all keys/values in tag_filter are included.
     """
-    filtered = []
-    for f in file_list:
-        json_path = os.path.splitext(f)[0] + ".json"
-        tags = load_tags(json_path)
-        if tags and all(tags.get(k, "").lower() == v.lower() for k, v in tag_filter.items() if v):
-            filtered.append(f)
-    return filtered
+    index = get_tag_index()
+    matches = set(index.to_paths(index.match(tag_filter)))
+    return [f for f in file_list if os.path.abspath(f) in matches]
 
 def export_files(files: List[str], export_dir: str) -> None:
     """Copies files and their .json metadata to the export directory."""
@@ -50,7 +41,7 @@ def export_files(files: List[str], export_dir: str) -> None:
     for f in track(files, description="Exporting"):
         try:
             shutil.copy2(f, export_dir)
-            json_path = os.path.splitext(f)[0] + ".json"
+            json_path = sidecar_path(f)
             if os.path.exists(json_path):
                 shutil.copy2(json_path, export_dir)
             log_event(f"Exported: {f}")
@@ -58,6 +49,31 @@ def export_files(files: List[str], export_dir: str) -> None:
             console.print(f"[red]Failed to export {f}: {e}[/]")
             log_event(f"Export failed for {f}: {e}")
 
+def write_manifest(files: List[str], export_dir: str) -> str:
+    """
+    Write pack_manifest.json listing each exported file with its size and content
+    hash (taken from the shared hash store, so unchanged sources are not re-read).
+    """
+    hashes = content_hashes(files)
+    manifest = {
+        "created": datetime.now().isoformat(),
+        "files": [
+            {
+                "file": os.path.basename(f),
+                "source": os.path.abspath(f),
+                "size": os.path.getsize(f),
+                "content_hash": hashes.get(f),
+            }
+            for f in files
+            if os.path.exists(f)
+        ],
+    }
+    manifest_path = os.path.join(export_dir, "pack_manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    log_event(f"Export manifest written: {manifest_path}")
+    return manifest_path
+
 def main() -> None:
     """
     CLI entrypoint for exporting a curated pack of audio files, filtered by tags.
@@ -76,9 +92,23 @@ def main() -> None:
     mood = Prompt.ask("Filter by mood (leave blank for any)", default="")
     instrument = Prompt.ask("Filter by instrument (leave blank for any)", default="")
     tag_filter = {"genre": genre, "mood": mood, "instrument": instrument}
+    query = " ".join(f'{field}:"{value.strip()}"' for field, value in tag_filter.items() if value.strip())
+    try:
+        bpm = parse_range(Prompt.ask("Filter by BPM range, e.g. 118-124 (leave blank for any)", default=""))
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
+    key = Prompt.ask("Filter by key, e.g. A minor or 8A (leave blank for any)", default="").strip()
+    compatible = bool(key) and Confirm.ask("Include harmonically compatible keys?", default=False)
 
-    all_files = find_all_audio_files(source_dir, config.SUPPORTED_EXTENSIONS)
-    filtered_files = filter_files_by_tags(all_files, tag_filter) if any(tag_filter.values()) else all_files
+    get_catalog().sync_folder(source_dir, config.SUPPORTED_EXTENSIONS)
+    try:
+        result = search(query, folder=source_dir, ranges={"bpm": bpm} if bpm else None,
+                        key=key or None, compatible=compatible)
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
+    filtered_files = result["paths"]
 
     if not filtered_files:
         console.print(f"[yellow]No files found matching the selected filters.[/]")
@@ -86,6 +116,7 @@ def main() -> None:
 
     console.print(f"[cyan]Exporting {len(filtered_files)} files to {export_dir}...[/cyan]")
     export_files(filtered_files, export_dir)
+    write_manifest(filtered_files, export_dir)
 
     console.print(f"[bold green]Export complete! {len(filtered_files)} files saved to {export_dir}[/bold green]")
 
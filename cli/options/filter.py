@@ -3,37 +3,27 @@
 """
 SampleMindAI – Filter
 Filter audio files by metadata tags (e.g., genre, mood, instrument).
-Future functionality; currently includes a placeholder.
+Answers queries from the library catalog (core.catalog).
 """
 
 from rich.console import Console
 from rich.prompt import Prompt
 from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
 import os
-import json
 
 console = Console()
 
 def filter_audio_files(folder: str, tag: str, value: str) -> None:
     """
-    Placeholder function for filtering audio files by metadata tags.
-    In the future, this would filter based on real metadata (genre, mood, instrument).
+    Filter audio files below a folder by a single metadata tag (case-insensitive).
     """
-    filtered_files = []
-    for root, _, files in os.walk(folder):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if file_path.lower().endswith(tuple(config.SUPPORTED_EXTENSIONS)):
-                json_path = os.path.splitext(file_path)[0] + ".json"
-                if os.path.exists(json_path):
-                    with open(json_path, "r") as f:
-                        metadata = json.load(f)
-                        if metadata.get(tag) == value:
-                            filtered_files.append(file_path)
-                            console.print(f"[cyan]Filtered: {file_path}[/cyan]")
-                            log_event(f"Filtered file: {file_path} based on {tag}: {value}")
-    
+    catalog = get_catalog()
+    catalog.sync_folder(folder, config.SUPPORTED_EXTENSIONS)
+    filtered_files = [hit["path"] for hit in catalog.query_tags({tag: value}, folder=folder)]
+    log_event(f"Filtered {len(filtered_files)} file(s) in {folder} based on {tag}: {value}")
+
     if filtered_files:
         console.print(f"[green]Found {len(filtered_files)} file(s) matching the filter:[/green]")
         for file in filtered_files:
@@ -3,50 +3,29 @@
 """
 SampleMindAI – Filter By Tags Module
 Filter audio files in a folder/library by tags (genre, mood, instrument, etc).
+Queries the library catalog and its in-memory tag index instead of reading every .json sidecar.
 Config-driven, Pylance-clean, with robust error handling.
 """
 
 import os
-import json
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Any
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.table import Table
 
 from utils.config import config
 from utils.logger import log_event
-from utils.file_utils import find_all_audio_files, ensure_folder_exists
+from core.catalog import get_catalog
+from core.tag_index import TagIndex, get_tag_index
 
 console = Console()
 
-def load_tags(json_path: str) -> Optional[Dict[str, str]]:
-    """Loads tag data from .json file, returns None if not a dict or invalid."""
-    try:
-        with open(json_path, "r") as f:
-            data: Any = json.load(f)
-            if isinstance(data, dict):
-                return data
-    except Exception:
-        pass
-    return None
-
 def filter_files_by_tags(file_list: List[str], tag_filter: Dict[str, str]) -> List[Dict[str, Any]]:
     """
     Returns a list of dicts: {'path': ..., 'tags': {...}} for files matching the tag_filter.
-    Skips files with invalid tag JSONs (str, list, etc).
+    Matching is case-insensitive; blank filter values match anything.
     """
-    matches = []
-    for f in file_list:
-        json_path = os.path.splitext(f)[0] + ".json"
-        tags = load_tags(json_path)
-        if not isinstance(tags, dict):
-            continue
-        if all(
-            not v or (isinstance(tags.get(k, ""), str) and tags.get(k, "").lower() == v.lower())
-            for k, v in tag_filter.items()
-        ):
-            matches.append({"path": f, "tags": tags})
-    return matches
+    return get_catalog().query_tags(tag_filter, paths=file_list)
 
 def display_results(results: List[Dict[str, Any]]) -> None:
     """Display filtered results in a Rich table."""
@@ -66,6 +45,13 @@ def display_results(results: List[Dict[str, Any]]) -> None:
         )
     console.print(table)
 
+def display_facets(index: TagIndex, hits: int) -> None:
+    """Show genre/mood/instrument counts within the filtered results."""
+    for field in ("genre", "mood", "instrument"):
+        counts = index.facets(field, within=hits, top=10)
+        if counts:
+            console.print(f"[bold]{field.title()}:[/bold] " + ", ".join(f"{value} ({n})" for value, n in counts))
+
 def main() -> None:
     """
     CLI entrypoint for filtering audio files by tags and displaying the results.
@@ -81,14 +67,18 @@ def main() -> None:
     instrument = Prompt.ask("Filter by instrument (leave blank for any)", default="")
     tag_filter = {"genre": genre, "mood": mood, "instrument": instrument}
 
-    all_files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
-    filtered = filter_files_by_tags(all_files, tag_filter)
+    catalog = get_catalog()
+    catalog.sync_folder(folder, config.SUPPORTED_EXTENSIONS)
+    index = get_tag_index(catalog)
+    hits = index.match(tag_filter) & index.folder_mask(folder)
+    filtered = [{"path": path, "tags": catalog.get_tags(path)} for path in index.to_paths(hits)]
 
     if not filtered:
         console.print(f"[yellow]No files found matching the selected filters.[/]")
         return
 
     display_results(filtered)
+    display_facets(index, hits)
     log_event(f"Filtered by tags: {tag_filter} ({len(filtered)} results)")
 
 if __name__ == "__main__":
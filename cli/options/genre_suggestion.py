@@ -10,8 +10,8 @@ from rich.console import Console
 from rich.prompt import Prompt
 from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
 import os
-import json
 
 console = Console()
 
@@ -21,14 +21,14 @@ def suggest_genre(file_path: str) -> str:
     In the future, this would be based on audio analysis or metadata.
     """
     try:
-        json_path = os.path.splitext(file_path)[0] + ".json"
-        if not os.path.exists(json_path):
+        catalog = get_catalog()
+        metadata = catalog.get_tags(file_path)
+        if not metadata and catalog.import_sidecar(file_path):
+            metadata = catalog.get_tags(file_path)
+        if not metadata:
             console.print(f"[yellow]No metadata found for {file_path}. Skipping genre suggestion.[/yellow]")
             return "No metadata available."
 
-        with open(json_path, "r") as f:
-            metadata = json.load(f)
-        
         # Placeholder: Suggest genre based on some metadata (e.g., genre tag)
         suggested_genre = metadata.get("genre", "Unknown Genre")
         return suggested_genre
@@ -7,7 +7,7 @@ Future functionality; currently includes a placeholder.
 """
 
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Confirm, Prompt
 from utils.config import config
 from utils.logger import log_event
 import os
@@ -15,10 +15,11 @@ import shutil
 
 console = Console()
 
-def import_sample(file_path: str, destination_folder: str) -> None:
+def import_sample(file_path: str, destination_folder: str, check_duplicates: bool = False) -> None:
     """
     Placeholder function for importing a sample and assigning metadata tags.
     In the future, this would assign tags based on AI classification or metadata extraction.
+    With check_duplicates, the new file is fingerprinted and compared with the library.
     """
     if not os.path.isfile(file_path):
         console.print(f"[red]File '{file_path}' does not exist. Aborting.[/red]")
@@ -30,6 +31,15 @@ def import_sample(file_path: str, destination_folder: str) -> None:
     shutil.copy(file_path, destination_path)
     console.print(f"[cyan]Imported {file_name} to {destination_folder}[/cyan]")
 
+    if check_duplicates:
+        # Fingerprint the new file and warn if the library already has a version of it
+        from core.fingerprint import similar_to  # loads librosa, so only when asked
+        matches = similar_to(destination_path)
+        if matches:
+            console.print(f"[yellow]{file_name} looks like {len(matches)} sample(s) already in the library:[/yellow]")
+            for other, score in matches[:5]:
+                console.print(f"[yellow]  {other} (similarity {score:.2f})[/yellow]")
+
     # Placeholder: Here we would assign metadata tags (e.g., genre, mood, instrument) to the sample
     log_event(f"Imported sample: {file_name} to {destination_folder}")
 
@@ -49,7 +59,8 @@ def main() -> None:
         console.print(f"[red]Destination folder '{destination_folder}' does not exist. Aborting.[/red]")
         return
 
-    import_sample(file_path, destination_folder)
+    check_duplicates = Confirm.ask("Check the library for near-duplicates of this sample?", default=False)
+    import_sample(file_path, destination_folder, check_duplicates=check_duplicates)
 
     console.print(f"[green]Sample import complete![/green]")
     log_event(f"Sample import complete for {file_path} to {destination_folder}")
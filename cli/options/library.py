@@ -4,6 +4,7 @@ SampleMindAI – Central library manager for samples and loops.
 Future support for GUI/plugin and full metadata control.
 """
 
+import os
 import json
 from pathlib import Path
 from typing import Dict
@@ -12,14 +13,14 @@ from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt, IntPrompt
 
-from utils.config import get_config
-from utils.file_utils import find_all_audio_files
+from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
 
 console = Console()
-config = get_config()
 
-LIBRARY_PATH = config["sample_library"]
+LIBRARY_PATH = config.SAMPLES_DIR
+LIBRARY_EXTS = [".wav", ".mp3", ".flac", ".aiff"]
 META_PATH = "data/library_metadata.json"
 
 def load_metadata() -> Dict[str, dict]:
@@ -35,17 +36,30 @@ def save_metadata(data: Dict[str, dict]):
     with open(META_PATH, "w") as f:
         json.dump(data, f, indent=2)
 
-def scan_library() -> Dict[str, dict]:
+def scan_library(full: bool = False) -> Dict[str, dict]:
+    """
+    Sync the library into the catalog and return it keyed by relative path.
+    Incremental by default: unchanged folders are skipped via the directory manifest.
+    """
     console.print("[cyan]Scanning audio library for metadata...[/cyan]")
+    catalog = get_catalog()
+    report = catalog.sync_folder(str(LIBRARY_PATH), LIBRARY_EXTS, full=full)
+    summary = report["summary"]
+    console.print(
+        f"[cyan]{summary['added']} added, {summary['changed']} changed, {summary['deleted']} deleted "
+        f"({summary['dirs_skipped']} unchanged folders skipped)[/cyan]"
+    )
     library = {}
-    files = find_all_audio_files(str(LIBRARY_PATH), [".wav", ".mp3", ".flac", ".aiff"])
-    for path_str in files:
-        path = Path(path_str)
-        key = str(path.relative_to(Path(LIBRARY_PATH)))
+    exts = tuple(LIBRARY_EXTS)
+    for record in catalog.iter_samples(str(LIBRARY_PATH), with_tags=False):
+        if not record["path"].lower().endswith(exts):
+            continue
+        path = Path(record["path"])
+        key = os.path.relpath(record["path"], os.path.abspath(LIBRARY_PATH))
         library[key] = {
             "filename": path.name,
             "path": str(path),
-            "size_kb": round(path.stat().st_size / 1024, 1)
+            "size_kb": round((record["size"] or 0) / 1024, 1)
         }
     return library
 
@@ -62,11 +76,11 @@ def main(debug: bool = False):
     library = load_metadata()
 
     while True:
-        console.print("\n[1] Scan and rebuild library\n[2] View current library\n[3] Export to JSON\n[0] Exit")
+        console.print("\n[1] Scan library (incremental)\n[2] View current library\n[3] Export to JSON\n[4] Full rescan\n[0] Exit")
         choice = IntPrompt.ask("Choose an option", default=0)
 
-        if choice == 1:
-            library = scan_library()
+        if choice in (1, 4):
+            library = scan_library(full=choice == 4)
             save_metadata(library)
             log_event("library_scanned", {"items": len(library)})
             console.print(f"[green]Library updated with {len(library)} files.")
@@ -0,0 +1,59 @@
+# cli/options/near_duplicates.py
+
+"""
+SampleMindAI – Near Duplicates
+Find the same sample saved in different versions (other bit depth or sample rate,
+normalized, converted to MP3) using perceptual audio fingerprints (core.fingerprint).
+Fingerprints are computed once per file and kept in the library catalog.
+"""
+
+import os
+from typing import Any, Dict, List
+from rich.console import Console
+from rich.prompt import Prompt, Confirm
+from rich.table import Table
+
+from utils.config import config
+from utils.logger import log_event
+from core.fingerprint import DEFAULT_THRESHOLD, find_near_duplicates, fingerprint_folder
+
+console = Console()
+
+def display_groups(groups: List[Dict[str, Any]], limit: int = 50) -> None:
+    """Show near-duplicate groups with their lowest pairwise similarity."""
+    table = Table(title=f"Near-Duplicate Groups ({len(groups)})")
+    table.add_column("#", justify="right")
+    table.add_column("Files")
+    table.add_column("Similarity", justify="right")
+    for idx, group in enumerate(groups[:limit], 1):
+        table.add_row(str(idx), "\n".join(group["paths"]), f"{group['similarity']:.2f}")
+    console.print(table)
+    if len(groups) > limit:
+        console.print(f"[dim]... and {len(groups) - limit} more group(s)[/dim]")
+
+def main() -> None:
+    """
+    CLI entrypoint for fingerprinting a folder and listing near-duplicate samples.
+    """
+    console.print("[bold magenta]SampleMindAI – Near Duplicates[/bold magenta]")
+    folder = Prompt.ask("Folder to check", default=config.SAMPLES_DIR)
+    if not os.path.isdir(folder):
+        console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/]")
+        return
+
+    incremental = not Confirm.ask("Re-fingerprint every file (ignore stored fingerprints)?", default=False)
+    threshold = float(Prompt.ask("Similarity threshold (0-1)", default=str(DEFAULT_THRESHOLD)))
+
+    console.print("[cyan]Fingerprinting new and changed files...[/cyan]")
+    count = fingerprint_folder(folder, incremental=incremental)
+    console.print(f"[cyan]{count} file(s) fingerprinted.[/cyan]")
+
+    groups = find_near_duplicates(folder, threshold=threshold)
+    if not groups:
+        console.print(f"[green]No near-duplicates found in {folder}[/green]")
+        return
+    display_groups(groups)
+    log_event(f"Near duplicates: {len(groups)} group(s) in {folder}")
+
+if __name__ == "__main__":
+    main()
@@ -2,47 +2,94 @@
 
 """
 SampleMindAI – Quality Score
-Assign quality scores to audio files based on predefined criteria (e.g., audio clarity, metadata completeness).
-Future functionality; currently includes a placeholder.
+Assign 0-100 quality scores to audio files from signal metrics (clipping, DC
+offset, noise floor, bandwidth, silence, truncation) computed by core.quality.
+Scores are stored in the catalog, so folders are scored incrementally and the
+results can be sorted and filtered from the index (core.library_query).
 """
 
+from typing import Any, Dict, Optional
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Prompt, IntPrompt
+from rich.table import Table
 from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
+from core.library_query import search
+from core.library_scanner import files_to_analyze
+from core.loudness import loudness_columns
+from core.quality import analyze_quality, measure_quality, quality_issues, quality_score
 import os
 
 console = Console()
 
 def assign_quality_score(file_path: str) -> str:
     """
-    Placeholder function for assigning a quality score to an audio file.
-    In the future, this could be based on audio analysis or metadata completeness.
+    Score one audio file, store the score in the catalog and print what lowered it.
     """
     console.print(f"[cyan]Assigning quality score to: {file_path}[/cyan]")
     log_event(f"Quality score assignment requested for: {file_path}")
-    
-    # Placeholder: Simple mock scoring logic based on file name length (just for simulation)
-    score = len(file_path) % 10  # Simulating a score from 0 to 9
-    
+
+    metrics = measure_quality(file_path)
+    score = quality_score(metrics)
+    get_catalog().update_fields(file_path, {"quality_score": score, **loudness_columns(metrics["loudness"])})
+    for issue, penalty in quality_issues(metrics):
+        console.print(f"[yellow]  -{penalty:.1f}: {issue}[/yellow]")
+
     console.print(f"[green]Assigned quality score: {score}[/green]")
     return f"Quality Score: {score}"
 
+def score_folder(folder: str, incremental: bool = True, workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Score every audio file in `folder` (only new/changed/unscored ones in incremental mode).
+    """
+    audio_files = files_to_analyze(folder, config.SUPPORTED_EXTENSIONS, "quality_score", incremental)
+    if not audio_files:
+        console.print(f"[yellow]No new or changed audio files to score in {folder}[/yellow]")
+        return {}
+    console.print(f"[bold cyan]Scoring {len(audio_files)} files in {folder}...[/bold cyan]")
+    return analyze_quality(audio_files, workers=workers)
+
+def display_lowest(folder: str, count: int) -> None:
+    """Show the lowest-scoring files of `folder`, straight from the index."""
+    catalog = get_catalog()
+    matches = search(folder=folder, order_by="quality_score", limit=count)
+    table = Table(title=f"Lowest quality scores in {folder}")
+    table.add_column("File")
+    table.add_column("Score", justify="right")
+    table.add_column("LUFS", justify="right")
+    table.add_column("True peak", justify="right")
+    for path in matches["paths"]:
+        row = catalog.get_sample(path) or {}
+        table.add_row(
+            os.path.basename(path),
+            f"{row['quality_score']:.1f}",
+            f"{row['loudness_lufs']:.1f}" if row.get("loudness_lufs") is not None else "",
+            f"{row['true_peak_db']:.1f}" if row.get("true_peak_db") is not None else "",
+        )
+    console.print(table)
+
 def main() -> None:
     """
-    CLI entrypoint for assigning quality scores to audio files.
+    CLI entrypoint for assigning quality scores to an audio file or a whole folder.
     """
     console.print("[bold magenta]SampleMindAI – Quality Score[/bold magenta]")
 
-    file_path = Prompt.ask("Enter the path to the audio file to evaluate")
-    if not file_path or not os.path.isfile(file_path):
-        console.print(f"[red]File '{file_path}' does not exist. Aborting.[/red]")
+    target = Prompt.ask("Enter an audio file or folder to evaluate", default=config.SAMPLES_DIR)
+    if os.path.isdir(target):
+        scored = score_folder(target)
+        console.print(f"[green]Scored {len(scored)} file(s).[/green]")
+        display_lowest(target, IntPrompt.ask("How many of the lowest scores to show", default=20))
+        log_event(f"Quality scores assigned for {target}: {len(scored)} file(s)")
+        return
+    if not target or not os.path.isfile(target):
+        console.print(f"[red]File '{target}' does not exist. Aborting.[/red]")
         return
 
-    quality_score = assign_quality_score(file_path)
-    console.print(f"[green]Quality score assigned: {quality_score}[/green]")
+    quality_score_text = assign_quality_score(target)
+    console.print(f"[green]Quality score assigned: {quality_score_text}[/green]")
 
-    log_event(f"Quality score assigned for {file_path}: {quality_score}")
+    log_event(f"Quality score assigned for {target}: {quality_score_text}")
 
 if __name__ == "__main__":
     main()
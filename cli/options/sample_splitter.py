@@ -2,34 +2,63 @@
 
 """
 SampleMindAI – Sample Splitter
-Split audio files into smaller segments (e.g., based on time, beats, etc.).
-Future functionality; currently includes a placeholder.
+Split audio files into fixed-length segments.
+PCM WAV files are cut straight from a memory-mapped view of the data chunk
+(core.pcm_reader): segment bytes are written as stored, with no decode or
+full-file copy. Other formats are read segment by segment with soundfile.
+Onset/silence modes cut at detected transients or silence gaps instead
+(core.audio.slicing.auto_slicer), for one file or a whole folder.
 """
 
+from typing import List
 from rich.console import Console
 from rich.prompt import Prompt
 from utils.config import config
 from utils.logger import log_event
+from core.pcm_reader import open_pcm
+from core.audio.slicing.auto_slicer import register_slices, slice_file, slice_folder
 import os
-import shutil
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
 
 console = Console()
 
-def split_audio(file_path: str, segment_length: int) -> None:
+def split_audio(file_path: str, segment_length: int) -> List[str]:
     """
-    Placeholder function for splitting an audio file into smaller segments.
-    In the future, this could split the file by time or beats.
+    Split an audio file into `segment_length`-second segments next to the original
+    (<name>_segment_<n>.wav). Returns the segment paths.
     """
     console.print(f"[cyan]Splitting audio file: {file_path} into {segment_length}-second segments[/cyan]")
     log_event(f"Splitting audio: {file_path} into {segment_length}-second segments")
-    
-    # Placeholder: Simulate splitting by copying the file to new paths
+
     base_name = os.path.splitext(file_path)[0]
-    for i in range(3):  # Simulate 3 segments for now
-        segment_file = f"{base_name}_segment_{i + 1}.wav"
-        shutil.copy(file_path, segment_file)
+    segments: List[str] = []
+    wave = open_pcm(file_path)
+    if wave is not None:
+        step = max(1, int(segment_length * wave.sample_rate))
+        for i, start in enumerate(range(0, wave.frame_count, step)):
+            segment_file = f"{base_name}_segment_{i + 1}.wav"
+            wave.write_segment(segment_file, start, start + step)
+            segments.append(segment_file)
+    elif SOUNDFILE_AVAILABLE:
+        with sf.SoundFile(file_path) as src:
+            step = max(1, int(segment_length * src.samplerate))
+            for i, block in enumerate(src.blocks(blocksize=step, always_2d=True)):
+                segment_file = f"{base_name}_segment_{i + 1}.wav"
+                sf.write(segment_file, block, src.samplerate)
+                segments.append(segment_file)
+    else:
+        console.print(f"[red]Cannot split {file_path}: only PCM WAV is supported without soundfile.[/red]")
+        return segments
+
+    for segment_file in segments:
         console.print(f"[cyan]Created segment: {segment_file}[/cyan]")
         log_event(f"Created segment: {segment_file}")
+    return segments
 
 def main() -> None:
     """
@@ -37,6 +66,22 @@ def main() -> None:
     """
     console.print("[bold magenta]SampleMindAI – Sample Splitter[/bold magenta]")
 
+    mode = Prompt.ask("Split by", choices=["time", "onset", "silence"], default="time")
+    if mode != "time":
+        target = Prompt.ask("Enter an audio file or folder to slice", default=config.SAMPLES_DIR)
+        output = Prompt.ask("Enter output folder", default=os.path.join(config.DATA_DIR, "slices"))
+        if os.path.isdir(target):
+            results = slice_folder(target, output, mode=mode)
+            count = sum(len(s) for s in results.values())
+            console.print(f"[green]Created {count} slice(s) from {len(results)} file(s) in {output}[/green]")
+        elif os.path.isfile(target):
+            slices = slice_file(target, output, mode=mode)
+            register_slices(slices, mode)
+            console.print(f"[green]Created {len(slices)} slice(s) in {output}[/green]")
+        else:
+            console.print(f"[red]'{target}' does not exist. Aborting.[/red]")
+        return
+
     file_path = Prompt.ask("Enter the path to the audio file to split")
     if not file_path or not os.path.isfile(file_path):
         console.print(f"[red]File '{file_path}' does not exist. Aborting.[/red]")
@@ -0,0 +1,95 @@
+# cli/options/search_library.py
+
+"""
+SampleMindAI – Search Library
+Find samples by tags, BPM range, key (optionally harmonically compatible keys),
+duration and loudness in one query, e.g. "118-124 BPM in A minor shorter than 8 s".
+Answered from the catalog's tag and range indexes (core.library_query); no sidecar is opened.
+"""
+
+import os
+from typing import Dict, List, Optional
+from rich.console import Console
+from rich.prompt import Prompt, Confirm
+from rich.table import Table
+
+from utils.config import config
+from utils.logger import log_event
+from core.catalog import get_catalog
+from core.library_query import Range, parse_range, search
+
+console = Console()
+
+RANGE_PROMPTS = (
+    ("bpm", "BPM range (e.g. 118-124, blank for any)"),
+    ("duration_sec", "Duration in seconds (e.g. <8, 2-30, blank for any)"),
+    ("loudness_lufs", "Loudness in LUFS (e.g. -14--8, >-10, blank for any)"),
+    ("true_peak_db", "True peak in dBTP (e.g. <-1, blank for any)"),
+    ("quality_score", "Quality score 0-100 (e.g. >=80, blank for any)"),
+)
+
+def ask_range(label: str) -> Optional[Range]:
+    """Prompt until the answer is blank or a valid range."""
+    while True:
+        try:
+            return parse_range(Prompt.ask(label, default=""))
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+
+def display_results(paths: List[str], total: int) -> None:
+    """Show matches with their tempo, key, duration and loudness."""
+    catalog = get_catalog()
+    table = Table(title=f"Search Results ({total})")
+    table.add_column("File")
+    table.add_column("BPM", justify="right")
+    table.add_column("Key")
+    table.add_column("Duration", justify="right")
+    table.add_column("LUFS", justify="right")
+    for path in paths:
+        row = catalog.get_sample(path) or {}
+        table.add_row(
+            os.path.basename(path),
+            f"{row['bpm']:.1f}" if row.get("bpm") is not None else "",
+            row.get("key") or "",
+            f"{row['duration_sec']:.2f}s" if row.get("duration_sec") is not None else "",
+            f"{row['loudness_lufs']:.1f}" if row.get("loudness_lufs") is not None else "",
+        )
+    console.print(table)
+
+def main() -> None:
+    """
+    CLI entrypoint for searching the library by tags, tempo, key, duration and loudness.
+    """
+    console.print("[bold magenta]SampleMindAI – Search Library[/bold magenta]")
+    folder = Prompt.ask("Search folder", default=config.SAMPLES_DIR)
+    if not os.path.isdir(folder):
+        console.print(f"[red]Folder '{folder}' does not exist. Aborting.[/]")
+        return
+
+    query = Prompt.ask("Tag query (e.g. genre:techno AND mood:dark, blank for any)", default="")
+    ranges: Dict[str, Range] = {}
+    for column, label in RANGE_PROMPTS:
+        bounds = ask_range(label)
+        if bounds:
+            ranges[column] = bounds
+    key = Prompt.ask("Key (e.g. A minor, F#m, 8A, blank for any)", default="").strip()
+    compatible = bool(key) and Confirm.ask("Include harmonically compatible keys?", default=False)
+    limit = int(Prompt.ask("Max results to show", default="50"))
+
+    get_catalog().sync_folder(folder, config.SUPPORTED_EXTENSIONS)
+    try:
+        result = search(query, folder=folder, ranges=ranges, key=key or None, compatible=compatible, limit=limit)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    if not result["total"]:
+        console.print("[yellow]No samples match the search.[/yellow]")
+        return
+    display_results(result["paths"], result["total"])
+    if config.DEBUG_MODE:
+        console.print("[dim]" + " | ".join(result["plan"]) + "[/dim]")
+    log_event(f"Search Library: {result['total']} match(es) in {folder} ({result['plan']})")
+
+if __name__ == "__main__":
+    main()
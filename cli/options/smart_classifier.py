@@ -7,17 +7,18 @@ Config-driven, robust, with Rich CLI, logging, and full error handling.
 """
 
 import os
-import json
+from functools import partial
 from typing import Dict, Optional, List, Union
 from rich.console import Console
 from rich.prompt import Prompt
-from rich.progress import track
 
 from utils.config import config
 from utils.logger import log_event
 from utils.file_utils import find_all_audio_files, ensure_folder_exists
 from ai_engine.hermes.hermes_tagger import tag_file_with_hermes
 from ai_engine.cnn.cnn_model import tag_file_with_cnn
+from core.catalog import get_catalog, sidecar_path
+from core.batch_executor import run_batch
 
 console = Console()
 
@@ -45,21 +46,20 @@ def classify_file(audio_path: str, ai_backend: str) -> Optional[Dict[str, str]]:
 
 def classify_and_save(audio_path: str, ai_backend: str) -> Optional[Dict[str, str]]:
     """
-    Classifies the audio file and saves its tags to a .json file.
+    Classifies the audio file and saves its tags to the catalog (and its .json sidecar).
     """
     tags = classify_file(audio_path, ai_backend)
     if tags:
-        json_path = os.path.splitext(audio_path)[0] + ".json"
-        with open(json_path, "w") as f:
-            json.dump(tags, f, indent=2)
+        get_catalog().set_tags(audio_path, tags)
+        json_path = sidecar_path(audio_path)
         console.print(f"[green]Classified and saved: {audio_path} -> {json_path}[/]", highlight=False)
         return tags
     else:
         return None
 
-def classify_folder(folder: str, ai_backend: str) -> List[Dict[str, str]]:
+def classify_folder(folder: str, ai_backend: str, workers: Optional[int] = None) -> List[Dict[str, str]]:
     """
-    Batch classify all audio files in a folder.
+    Batch classify all audio files in a folder (in parallel; tags are saved as results arrive).
     Returns a list of tag dictionaries.
     """
     ensure_folder_exists(folder)
@@ -69,9 +69,12 @@ def classify_folder(folder: str, ai_backend: str) -> List[Dict[str, str]]:
         return []
     console.print(f"[bold cyan]Classifying {len(audio_files)} files in {folder}...[/]")
     results = []
-    for audio_path in track(audio_files, description="Classifying"):
-        tags = classify_and_save(audio_path, ai_backend)
+    catalog = get_catalog()
+    kind = "thread" if ai_backend == "hermes" else "process"
+    classifier = partial(classify_file, ai_backend=ai_backend)
+    for audio_path, tags in run_batch(classifier, audio_files, kind=kind, workers=workers, description="Classifying"):
         if tags:
+            catalog.set_tags(audio_path, tags)
             results.append({"path": audio_path, **tags})
     return results
 
@@ -3,50 +3,65 @@
 """
 SampleMindAI – Smart Pack Builder
 Build a sample pack from selected audio files, organized by metadata tags (e.g., genre, mood, instrument).
-Future functionality; currently includes a placeholder.
+Files can be narrowed by tag query, BPM range and key via the catalog indexes (core.library_query).
 """
 
+from typing import Any, Dict, Optional
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.prompt import Prompt, Confirm
 from utils.config import config
 from utils.logger import log_event
+from utils.file_utils import iter_audio_files
+from core.catalog import get_catalog
+from core.library_query import parse_range, search
 import os
 import shutil
-import json
 
 console = Console()
 
-def build_sample_pack_from_metadata(folder: str, destination_folder: str) -> None:
+def build_sample_pack_from_metadata(
+    folder: str,
+    destination_folder: str,
+    filters: Optional[Dict[str, Any]] = None,
+) -> None:
     """
-    Placeholder function to build a sample pack from selected audio files.
-    In the future, this can organize the files based on metadata (e.g., genre, mood).
+    Build a sample pack from the audio files in `folder`, organized by genre tag.
+    `filters` are passed to core.library_query.search (query, ranges, key, compatible).
     """
     if not os.path.isdir(destination_folder):
         os.makedirs(destination_folder)
 
-    files = [f for f in os.listdir(folder) if f.endswith(tuple(config.SUPPORTED_EXTENSIONS))]
+    files = sorted(iter_audio_files(folder, config.SUPPORTED_EXTENSIONS, recursive=False))
     if not files:
         console.print(f"[yellow]No audio files found in {folder}[/yellow]")
         return
 
-    for file in files:
-        file_path = os.path.join(folder, file)
-        json_path = os.path.splitext(file_path)[0] + ".json"
+    catalog = get_catalog()
+    catalog.sync_folder(folder, config.SUPPORTED_EXTENSIONS)
+    if filters:
+        matches = set(search(folder=folder, **filters)["paths"])
+        files = [f for f in files if os.path.abspath(f) in matches]
+        if not files:
+            console.print(f"[yellow]No audio files in {folder} match the filters[/yellow]")
+            return
 
-        if os.path.exists(json_path):
-            with open(json_path, "r") as f:
-                metadata = json.load(f)
-                genre = metadata.get("genre", "Unknown Genre")
-                genre_folder = os.path.join(destination_folder, genre)
+    for file_path in files:
+        file = os.path.basename(file_path)
+        tags = catalog.get_tags(file_path)
 
-                if not os.path.exists(genre_folder):
-                    os.makedirs(genre_folder)
-                    console.print(f"[cyan]Created folder: {genre_folder}[/cyan]")
+        if not tags:
+            continue
+        genre = tags.get("genre", "Unknown Genre")
+        genre_folder = os.path.join(destination_folder, genre)
 
-                shutil.copy(file_path, os.path.join(genre_folder, file))
-                console.print(f"[cyan]Added {file} to {genre_folder}[/cyan]")
+        if not os.path.exists(genre_folder):
+            os.makedirs(genre_folder)
+            console.print(f"[cyan]Created folder: {genre_folder}[/cyan]")
 
-                log_event(f"Added {file} to sample pack at {genre_folder}")
+        shutil.copy(file_path, os.path.join(genre_folder, file))
+        console.print(f"[cyan]Added {file} to {genre_folder}[/cyan]")
+
+        log_event(f"Added {file} to sample pack at {genre_folder}")
 
 def main() -> None:
     """
@@ -64,7 +79,26 @@ def main() -> None:
         console.print(f"[red]Destination folder '{destination_folder}' does not exist. Aborting.[/]")
         return
 
-    build_sample_pack_from_metadata(folder, destination_folder)
+    filters: Dict[str, Any] = {}
+    if Confirm.ask("Filter by tags, BPM or key?", default=False):
+        filters["query"] = Prompt.ask("Tag query (e.g. genre:techno AND mood:dark, blank for any)", default="")
+        try:
+            bpm = parse_range(Prompt.ask("BPM range, e.g. 118-124 (blank for any)", default=""))
+        except ValueError as e:
+            console.print(f"[red]{e}[/]")
+            return
+        if bpm:
+            filters["ranges"] = {"bpm": bpm}
+        key = Prompt.ask("Key, e.g. A minor or 8A (blank for any)", default="").strip()
+        if key:
+            filters["key"] = key
+            filters["compatible"] = Confirm.ask("Include harmonically compatible keys?", default=False)
+
+    try:
+        build_sample_pack_from_metadata(folder, destination_folder, filters)
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
 
     console.print(f"[green]Sample pack created successfully in {destination_folder}[/green]")
     log_event(f"Sample pack created from {folder} to {destination_folder}")
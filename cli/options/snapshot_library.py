@@ -3,15 +3,17 @@
 """
 SampleMindAI – Snapshot Library
 Take snapshots of the audio library's current state (e.g., folder structure, metadata).
-Future functionality; currently includes a placeholder.
+Each snapshot records every audio file's size, mtime and content hash (from the
+shared hash store in core.content_hash, so unchanged files are not re-read).
 """
 
 from rich.console import Console
 from rich.prompt import Prompt
 from utils.config import config
 from utils.logger import log_event
+from utils.file_utils import find_all_audio_files
+from core.content_hash import content_hashes
 import os
-import shutil
 import json
 from datetime import datetime
 
@@ -19,8 +21,8 @@ console = Console()
 
 def take_snapshot(folder: str, snapshot_name: str) -> None:
     """
-    Placeholder function for taking a snapshot of the audio library.
-    In the future, this could capture the current state of the library (e.g., metadata, folder structure).
+    Take a snapshot of the audio library: top-level folder contents plus a file
+    list with relative path, size, mtime and content hash for every audio file.
     """
     snapshot_dir = os.path.join(config.OUTPUT_DIR, "snapshots")
     if not os.path.exists(snapshot_dir):
@@ -28,11 +30,27 @@ def take_snapshot(folder: str, snapshot_name: str) -> None:
 
     snapshot_path = os.path.join(snapshot_dir, f"{snapshot_name}.json")
     
-    # Placeholder: Simulate snapshot creation with basic folder and file structure
+    audio_files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
+    hashes = content_hashes(audio_files)
+    files = []
+    for path in audio_files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        files.append({
+            "path": os.path.relpath(path, folder),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "content_hash": hashes.get(path),
+        })
+
     snapshot_data = {
         "snapshot_name": snapshot_name,
         "timestamp": datetime.now().isoformat(),
-        "folder_contents": os.listdir(folder)
+        "folder": os.path.abspath(folder),
+        "folder_contents": os.listdir(folder),
+        "files": files,
     }
 
     with open(snapshot_path, "w") as f:
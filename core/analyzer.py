@@ -13,7 +13,9 @@ Provides functions to:
 from pathlib import Path
 from typing import List, Dict
 import json
-import librosa
+
+from utils.file_utils import find_all_audio_files
+from core.audio_probe import probe_file
 
 VALID_FIELDS: set[str] = {"genre", "mood", "instrument"}
 config.SUPPORTED_EXTENSIONS: List[str] = [".wav", ".aiff", ".flac", ".mp3"]
@@ -21,10 +23,7 @@ config.SUPPORTED_EXTENSIONS: List[str] = [".wav", ".aiff", ".flac", ".mp3"]
 
 def find_audio_files(directory: Path) -> List[Path]:
     """Recursively find supported audio files in a directory."""
-    return [
-        f for f in directory.rglob("*")
-        if f.suffix.lower() in config.SUPPORTED_EXTENSIONS and f.is_file()
-    ]
+    return [Path(p) for p in find_all_audio_files(str(directory), config.SUPPORTED_EXTENSIONS)]
 
 
 def get_json_path(file_path: Path) -> Path:
@@ -33,11 +32,9 @@ def get_json_path(file_path: Path) -> Path:
 
 
 def get_audio_duration(file_path: Path) -> float:
-    """Get duration of audio file in seconds."""
-    try:
-        return float(librosa.get_duration(path=str(file_path)))  # type: ignore
-    except Exception:
-        return 0.0
+    """Get duration of audio file in seconds (header probe, no decoding)."""
+    stats = probe_file(str(file_path))
+    return float(stats["duration_sec"]) if stats else 0.0
 
 
 def is_valid_metadata(json_path: Path, debug: bool = False) -> bool:
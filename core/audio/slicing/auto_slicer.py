@@ -1,2 +1,143 @@
+# core/audio/slicing/auto_slicer.py
+
+"""
+SampleMindAI – Auto Slicer
+Cuts audio files into slices at detected onsets or silence gaps
+(core.audio.slicing.waveform_segmenter) and registers every slice in the
+library catalog.
+
+Slices are frame-range copies: PCM WAV slices are written straight from the
+memory-mapped data chunk (core.pcm_reader), other formats read only the
+frames of each slice with soundfile. No file is ever decoded whole.
+Folders are sliced on a process pool (core.batch_executor); catalog writes
+happen in the calling process. With an output folder, slices keep the source's
+path relative to the sliced folder, so same-named files in different
+subfolders never overwrite each other's slices.
+
+Usage:
+    from core.audio.slicing.auto_slicer import slice_file, slice_folder
+    slices = slice_file("break.wav", "data/slices", mode="onset")
+"""
+
+import os
+from functools import partial
+from typing import Any, Dict, List, Optional
+
 from utils.config import config
-# Empty module: auto_slicer
\ No newline at end of file
+from utils.logger import log_event
+from utils.file_utils import find_all_audio_files
+from core.batch_executor import run_batch
+from core.catalog import STAT_FIELDS, get_catalog
+from core.pcm_reader import open_pcm
+from core.audio.slicing.waveform_segmenter import MODES, segment
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+SLICE_MARKER = "_slice_"
+
+
+def _write_slices(path: str, out_dir: str, slices: List[tuple]) -> List[Dict[str, Any]]:
+    base = os.path.splitext(os.path.basename(path))[0]
+    written: List[Dict[str, Any]] = []
+    wave = open_pcm(path)
+    src = None
+    if wave is not None:
+        sample_rate, channels, width = wave.sample_rate, wave.channels, wave.sample_width
+    elif SOUNDFILE_AVAILABLE:
+        src = sf.SoundFile(path)
+        sample_rate, channels, width = src.samplerate, src.channels, 2  # sf.write defaults to PCM_16 WAV
+    else:
+        raise RuntimeError("soundfile is required to slice non-WAV files")
+
+    try:
+        for index, (start, stop) in enumerate(slices, 1):
+            out_path = os.path.join(out_dir, f"{base}{SLICE_MARKER}{index:03d}.wav")
+            if wave is not None:
+                wave.write_segment(out_path, start, stop)
+            else:
+                src.seek(start)
+                sf.write(out_path, src.read(stop - start, dtype="float32", always_2d=True), sample_rate)
+            written.append(_slice_info(out_path, path, start, stop, sample_rate, channels, width))
+    finally:
+        if src is not None:
+            src.close()
+    return written
+
+
+def _slice_info(out_path: str, source: str, start: int, stop: int,
+                sample_rate: int, channels: int, width: int) -> Dict[str, Any]:
+    frames = stop - start
+    return {
+        "path": out_path,
+        "source": source,
+        "start": start,
+        "stop": stop,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "sample_width": width,
+        "frame_count": frames,
+        "duration_sec": frames / float(sample_rate),
+    }
+
+
+def slice_file(path: str, out_dir: Optional[str] = None, mode: str = "onset", **options: Any) -> List[Dict[str, Any]]:
+    """
+    Detect slice points in `path` and write each slice as <name>_slice_NNN.wav
+    into `out_dir` (default: next to the source). Returns slice metadata dicts;
+    does not touch the catalog (see register_slices), so it is safe in workers.
+    """
+    out_dir = out_dir or os.path.dirname(os.path.abspath(path))
+    os.makedirs(out_dir, exist_ok=True)
+    plan = segment(path, mode=mode, **options)
+    return _write_slices(path, out_dir, plan["slices"])
+
+
+def register_slices(slices: List[Dict[str, Any]], mode: str = "onset") -> None:
+    """Add slices to the library catalog with their stats and a pointer to the source file."""
+    catalog = get_catalog()
+    with catalog.transaction():
+        for info in slices:
+            catalog.upsert_file(info["path"], **{k: info[k] for k in STAT_FIELDS if k in info})
+            catalog.set_tags(info["path"], {
+                "slice_of": os.path.abspath(info["source"]),
+                "slice_range": f"{info['start']}-{info['stop']}",
+                "slice_mode": mode,
+            }, sync_sidecar=False)
+
+
+def _slice_pair(pair: tuple, **options: Any) -> List[Dict[str, Any]]:
+    return slice_file(pair[0], pair[1], **options)
+
+
+def slice_folder(
+    folder: str,
+    out_dir: Optional[str] = None,
+    mode: str = "onset",
+    workers: Optional[int] = None,
+    **options: Any,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Slice every audio file below `folder` on a process pool. With `out_dir`, slices
+    are written to the source's relative subfolder inside it (as process_folder in
+    trim_and_normalize does); without, next to each source. Returns
+    {source: [slice info, ...]}.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown slicing mode '{mode}' (expected one of {', '.join(MODES)})")
+    # never re-slice the output of an earlier run
+    files = [f for f in find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
+             if SLICE_MARKER not in os.path.basename(f)]
+    pairs = [(path, os.path.join(out_dir, os.path.dirname(os.path.relpath(path, folder))) if out_dir else None)
+             for path in files]
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for pair, slices in run_batch(partial(_slice_pair, mode=mode, **options), pairs, workers=workers,
+                                  description="Slicing"):
+        if slices:
+            register_slices(slices, mode)
+            results[pair[0]] = slices
+    log_event(f"Auto slicer: {sum(len(s) for s in results.values())} slice(s) from {len(results)} file(s) in {folder}")
+    return results
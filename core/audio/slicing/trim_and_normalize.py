@@ -1 +1,200 @@
+# core/audio/slicing/trim_and_normalize.py
+
+"""
+SampleMindAI – Trim & Normalize
+Two-pass streaming engine for preparing samples and packs:
+
+1. analyze(): one read finds sample and true peak, integrated loudness
+   (core.loudness) and the first/last frame above the silence threshold. The result is cached
+   per file content (core.feature_cache), so re-running with another target
+   level goes straight to pass two.
+2. process(): reads only the kept frame range block by block, applies the gain
+   and writes the output; nothing is decoded whole.
+
+Gain targets either integrated loudness (LUFS) or sample peak (dBFS), and is
+always limited so the true peak stays under the ceiling (-1 dBTP by default).
+
+Usage:
+    from core.audio.slicing.trim_and_normalize import process, process_folder
+    process("kick.wav", "out/kick.wav", target_lufs=-14.0)
+    process_folder("pack/raw", "pack/ready", target_peak_db=-1.0, workers=8)
+"""
+
+import os
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from utils.config import config
+from utils.logger import log_event
+from utils.file_utils import find_all_audio_files
+from core.batch_executor import run_batch
+from core.content_hash import content_hash
+from core.feature_cache import get_feature_cache
+from core.loudness import SILENCE_LUFS, LoudnessMeter, iter_blocks, to_db
+from core.pcm_reader import FLOAT_FORMAT, open_pcm
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+ANALYSIS_NAME = "trim_analysis"
+ANALYSIS_VERSION = 2
+SILENCE_DB = -60.0
+PAD_SEC = 0.01                 # keep a little air around the trimmed region
+CEILING_DB = -1.0
+WRITE_FRAMES = 1 << 16
+
+
+def analyze(path: str, silence_db: float = SILENCE_DB, cache: bool = True) -> Dict[str, Any]:
+    """
+    Pass one: {sample_rate, channels, frame_count, integrated_lufs, sample_peak_db,
+    true_peak_db, start, stop, trimmed_lufs}, where [start, stop) is the range above `silence_db`
+    (empty when silent) and trimmed_lufs the loudness of that range alone.
+    """
+    params = {"silence_db": silence_db}
+    digest = content_hash(path) if cache else None
+    if digest:
+        cached = get_feature_cache().load(digest, {ANALYSIS_NAME: (ANALYSIS_VERSION, params)})
+        if ANALYSIS_NAME in cached:
+            return cached[ANALYSIS_NAME]
+
+    sample_rate, channels, blocks = iter_blocks(path)
+    meter = LoudnessMeter(sample_rate, channels, true_peak=True)
+    threshold = 10.0 ** (silence_db / 20.0)
+    first, last = None, None
+    for block in blocks:
+        offset = meter.frame_count
+        meter.process(block)
+        loud = np.flatnonzero(np.abs(block).max(axis=1) > threshold)
+        if len(loud):
+            if first is None:
+                first = offset + int(loud[0])
+            last = offset + int(loud[-1])
+
+    result = {
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "frame_count": meter.frame_count,
+        "integrated_lufs": meter.integrated(),
+        "sample_peak_db": to_db(meter.peak),
+        "true_peak_db": to_db(meter.true_peak),
+        "start": first if first is not None else 0,
+        "stop": last + 1 if last is not None else 0,
+    }
+    result["trimmed_lufs"] = meter.integrated(result["start"], result["stop"]) if last is not None else SILENCE_LUFS
+    if digest:
+        get_feature_cache().store(digest, {ANALYSIS_NAME: (ANALYSIS_VERSION, params, result)})
+    return result
+
+
+def gain_for(analysis: Dict[str, Any], target_lufs: Optional[float] = None,
+             target_peak_db: Optional[float] = None, ceiling_db: float = CEILING_DB,
+             trim: bool = False) -> float:
+    """Gain in dB that reaches the target without pushing the true peak over `ceiling_db`."""
+    peak = analysis["sample_peak_db"]
+    loudness = analysis["trimmed_lufs" if trim else "integrated_lufs"]
+    if not np.isfinite(peak):
+        return 0.0
+    if target_lufs is not None and np.isfinite(loudness):
+        gain = target_lufs - loudness
+    elif target_peak_db is not None:
+        gain = target_peak_db - peak
+    else:
+        return 0.0
+    return min(gain, ceiling_db - analysis["true_peak_db"])
+
+
+def output_subtype(path: str) -> str:
+    """Keep the source sample format where WAV can store it, else 24-bit PCM."""
+    wave = open_pcm(path)
+    if wave is not None:
+        if wave.format_tag == FLOAT_FORMAT:
+            return "FLOAT" if wave.bits == 32 else "DOUBLE"
+        return {8: "PCM_U8", 16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}.get(wave.bits, "PCM_24")
+    subtype = sf.info(path).subtype
+    return subtype if sf.check_format("WAV", subtype) else "PCM_24"
+
+
+def process(
+    path: str,
+    out_path: str,
+    target_lufs: Optional[float] = None,
+    target_peak_db: Optional[float] = None,
+    trim: bool = True,
+    silence_db: float = SILENCE_DB,
+    ceiling_db: float = CEILING_DB,
+) -> Optional[Dict[str, Any]]:
+    """
+    Pass two: write the trimmed, gain-adjusted copy of `path` to `out_path` (WAV).
+    Returns {path, source, start, stop, gain_db, integrated_lufs, sample_peak_db, true_peak_db}
+    with the output's expected levels, or None for a silent file.
+    """
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("soundfile is required to write processed audio")
+    analysis = analyze(path, silence_db)
+    sample_rate, channels = analysis["sample_rate"], analysis["channels"]
+    if trim:
+        if analysis["stop"] <= analysis["start"]:
+            log_event(f"Trim & normalize: {path} is silent, skipped")
+            return None
+        pad = int(PAD_SEC * sample_rate)
+        start, stop = max(0, analysis["start"] - pad), min(analysis["frame_count"], analysis["stop"] + pad)
+    else:
+        start, stop = 0, analysis["frame_count"]
+    gain_db = gain_for(analysis, target_lufs, target_peak_db, ceiling_db, trim)
+    gain = np.float32(10.0 ** (gain_db / 20.0))
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    wave = open_pcm(path)
+    with sf.SoundFile(tmp, "w", sample_rate, channels, subtype=output_subtype(path), format="WAV") as dst:
+        if wave is not None:
+            for offset in range(start, stop, WRITE_FRAMES):
+                dst.write(wave.read(offset, min(offset + WRITE_FRAMES, stop)) * gain)
+        else:
+            with sf.SoundFile(path) as src:
+                src.seek(start)
+                for block in src.blocks(WRITE_FRAMES, frames=stop - start, dtype="float32", always_2d=True):
+                    dst.write(block * gain)
+    os.replace(tmp, out_path)
+
+    return {
+        "path": out_path,
+        "source": path,
+        "start": start,
+        "stop": stop,
+        "gain_db": gain_db,
+        "integrated_lufs": analysis["trimmed_lufs" if trim else "integrated_lufs"] + gain_db,
+        "sample_peak_db": analysis["sample_peak_db"] + gain_db,
+        "true_peak_db": analysis["true_peak_db"] + gain_db,
+    }
+
+
+def _process_pair(pair: tuple, **options: Any) -> Optional[Dict[str, Any]]:
+    return process(pair[0], pair[1], **options)
+
+
+def process_folder(
+    folder: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Trim/normalize every audio file below `folder` into `out_dir` (same relative
+    layout, as WAV) on a process pool. `options` are passed to process().
+    """
+    files = find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS)
+    pairs = [(path, os.path.join(out_dir, os.path.splitext(os.path.relpath(path, folder))[0] + ".wav"))
+             for path in files]
+    results: List[Dict[str, Any]] = []
+    for _, result in run_batch(partial(_process_pair, **options), pairs, workers=workers,
+                               description="Trim & normalize"):
+        if result:
+            results.append(result)
+    log_event(f"Trim & normalize: {len(results)} of {len(files)} file(s) written to {out_dir}")
+    return results
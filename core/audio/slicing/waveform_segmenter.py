@@ -1,2 +1,157 @@
-from utils.config import config
-# Empty module: waveform_segmenter
\ No newline at end of file
+# core/audio/slicing/waveform_segmenter.py
+
+"""
+SampleMindAI – Waveform Segmenter
+Finds slice points in an audio file without holding it in memory: one streaming
+pass builds a per-frame spectral-flux (onset) envelope and an RMS envelope, and
+slice boundaries are picked from those small arrays.
+
+- mode "onset": cut just before each detected transient (drum loops, one-shots)
+- mode "silence": keep the sounding regions between silence gaps (multi-sample recordings)
+
+Blocks come from a memory-mapped view for PCM WAV (core.pcm_reader) or from
+soundfile otherwise; the STFT is a vectorized numpy rfft over framed views.
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.pcm_reader import open_pcm
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+MODES = ("onset", "silence")
+N_FFT = 1024
+HOP = 512
+BLOCK_FRAMES = 512            # STFT frames per streamed block
+ONSET_DELTA = 0.07            # peak must exceed the local mean by this (envelope normalized to 1)
+ONSET_WINDOW_SEC = 0.1        # local-mean / local-max neighbourhood
+MIN_SLICE_SEC = 0.1
+PRE_ROLL_SEC = 0.005          # cut slightly before the transient
+SILENCE_DB = -50.0
+MIN_SILENCE_SEC = 0.25
+
+
+def _blocks(path: str, block_frames: int, overlap: int) -> Tuple[int, int, Iterator[np.ndarray]]:
+    """(sample_rate, frame_count, mono float32 blocks overlapping by `overlap`)."""
+    wave = open_pcm(path)
+    if wave is not None:
+        return wave.sample_rate, wave.frame_count, wave.blocks(block_frames, overlap=overlap)
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("soundfile is required to segment non-WAV files")
+    info = sf.info(path)
+
+    def _gen() -> Iterator[np.ndarray]:
+        for block in sf.blocks(path, blocksize=block_frames, overlap=overlap, dtype="float32", always_2d=True):
+            yield block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+    return info.samplerate, info.frames, _gen()
+
+
+def envelopes(path: str, n_fft: int = N_FFT, hop: int = HOP) -> Dict[str, Any]:
+    """
+    Stream `path` once and return {sample_rate, frame_count, n_fft, hop, flux, rms}:
+    per-STFT-frame spectral flux (positive log-magnitude change) and RMS.
+    """
+    window = np.hanning(n_fft).astype(np.float32)
+    sr, frame_count, blocks = _blocks(path, n_fft + (BLOCK_FRAMES - 1) * hop, overlap=n_fft - hop)
+    flux_parts: List[np.ndarray] = []
+    rms_parts: List[np.ndarray] = []
+    previous = None
+    for block in blocks:
+        if len(block) < n_fft:
+            continue
+        frames = sliding_window_view(block, n_fft)[::hop]
+        rms_parts.append(np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)))
+        spectrum = np.log1p(100.0 * np.abs(np.fft.rfft(frames * window, axis=1)))
+        if previous is None:
+            previous = spectrum[:1]
+        flux_parts.append(np.maximum(np.diff(np.vstack([previous, spectrum]), axis=0), 0.0).sum(axis=1))
+        previous = spectrum[-1:]
+    flux = np.concatenate(flux_parts) if flux_parts else np.zeros(0, dtype=np.float32)
+    rms = np.concatenate(rms_parts) if rms_parts else np.zeros(0, dtype=np.float32)
+    return {"sample_rate": sr, "frame_count": frame_count, "n_fft": n_fft, "hop": hop, "flux": flux, "rms": rms}
+
+
+def pick_onsets(flux: np.ndarray, sr: int, hop: int, delta: float = ONSET_DELTA,
+                min_gap_sec: float = MIN_SLICE_SEC) -> np.ndarray:
+    """Frame indices of onset peaks: local maxima above the local mean + delta, at least min_gap apart."""
+    if len(flux) < 3 or not flux.max():
+        return np.zeros(0, dtype=np.int64)
+    env = flux / flux.max()
+    radius = max(1, int(ONSET_WINDOW_SEC * sr / hop / 2))
+    padded = np.pad(env, radius, mode="edge")
+    local_max = sliding_window_view(padded, 2 * radius + 1).max(axis=1)
+    local_mean = np.convolve(padded, np.ones(2 * radius + 1) / (2 * radius + 1), mode="valid")
+    candidates = np.flatnonzero((env >= local_max) & (env > local_mean + delta))
+    min_gap = max(1, int(min_gap_sec * sr / hop))
+    onsets: List[int] = []
+    for frame in candidates:
+        if not onsets or frame - onsets[-1] >= min_gap:
+            onsets.append(int(frame))
+    return np.asarray(onsets, dtype=np.int64)
+
+
+def onset_slices(env: Dict[str, Any], min_slice_sec: float = MIN_SLICE_SEC) -> List[Tuple[int, int]]:
+    """(start, stop) sample ranges from one onset to the next."""
+    sr, hop, total = env["sample_rate"], env["hop"], env["frame_count"]
+    onsets = pick_onsets(env["flux"], sr, hop, min_gap_sec=min_slice_sec)
+    pre_roll = int(PRE_ROLL_SEC * sr)
+    cuts = sorted({0, *(max(0, int(frame) * hop - pre_roll) for frame in onsets)})
+    bounds = cuts + [total]
+    min_len = int(min_slice_sec * sr)
+    slices: List[Tuple[int, int]] = []
+    pending = None  # a too-short leading region is joined to the next slice
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop - start < min_len:
+            if slices:
+                slices[-1] = (slices[-1][0], stop)  # too short: merge into the previous slice
+            elif pending is None:
+                pending = start
+            continue
+        slices.append((start if pending is None else pending, stop))
+        pending = None
+    if pending is not None and not slices and total > pending:
+        slices.append((pending, total))
+    return slices
+
+
+def silence_slices(env: Dict[str, Any], silence_db: float = SILENCE_DB, min_silence_sec: float = MIN_SILENCE_SEC,
+                   min_slice_sec: float = MIN_SLICE_SEC) -> List[Tuple[int, int]]:
+    """(start, stop) sample ranges of sounding regions separated by at least min_silence_sec of silence."""
+    sr, hop, total, n_fft = env["sample_rate"], env["hop"], env["frame_count"], env["n_fft"]
+    loud = 20.0 * np.log10(env["rms"] + 1e-10) > silence_db
+    if not loud.any():
+        return []
+    # run boundaries of the loud mask
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], loud.astype(np.int8), [0]))))
+    regions = list(zip(edges[::2], edges[1::2]))
+    min_gap = int(min_silence_sec * sr / hop)
+    merged = [regions[0]]
+    for start, stop in regions[1:]:
+        if start - merged[-1][1] < min_gap:
+            merged[-1] = (merged[-1][0], stop)
+        else:
+            merged.append((start, stop))
+    min_len = int(min_slice_sec * sr)
+    slices = []
+    for start, stop in merged:
+        begin, end = int(start) * hop, min(total, int(stop) * hop + (n_fft - hop))
+        if end - begin >= min_len:
+            slices.append((begin, end))
+    return slices
+
+
+def segment(path: str, mode: str = "onset", **options: Any) -> Dict[str, Any]:
+    """Slice points for one file: {sample_rate, frame_count, slices: [(start, stop), ...]}."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown slicing mode '{mode}' (expected one of {', '.join(MODES)})")
+    env = envelopes(path)
+    slices = onset_slices(env, **options) if mode == "onset" else silence_slices(env, **options)
+    return {"sample_rate": env["sample_rate"], "frame_count": env["frame_count"], "slices": slices}
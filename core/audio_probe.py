@@ -0,0 +1,365 @@
+# core/audio_probe.py
+
+"""
+SampleMindAI – Audio Probe
+Header-only audio stats (sample rate, channels, sample width, frame count,
+duration) for every format in config.SUPPORTED_EXTENSIONS, without decoding audio.
+
+RIFF/WAVE, AIFF/AIFC, FLAC, MP3 (Xing/Info/VBRI or CBR estimate) and Ogg
+Vorbis/Opus headers are parsed directly from a few KB at the start (and, for Ogg,
+the end) of the file. Anything else falls back to soundfile.info or mutagen,
+which also only read headers. Results are cached in the library catalog and
+batches are probed on a thread pool, so probing is I/O-bound.
+
+Usage:
+    from core.audio_probe import probe_file, probe_files
+    stats = probe_file(path)        # dict or None
+    stats = probe_files(paths)      # {path: dict}, cached in the catalog
+"""
+
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+from utils.config import config
+from utils.logger import log_event
+from core.catalog import LibraryCatalog, get_catalog
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+PROBE_FIELDS = ("format", "sample_rate", "channels", "sample_width", "frame_count", "duration_sec")
+HEAD_BYTES = 64 * 1024
+
+
+def _stats(fmt: str, sample_rate: int, channels: int, sample_width: Optional[int], frame_count: int) -> Dict[str, Any]:
+    return {
+        "format": fmt,
+        "sample_rate": int(sample_rate),
+        "channels": int(channels),
+        "sample_width": sample_width,
+        "frame_count": int(frame_count),
+        "duration_sec": frame_count / float(sample_rate) if sample_rate else 0.0,
+    }
+
+
+# ---------------------------------------------------------------- RIFF / WAVE
+
+def wav_layout(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Walk the RIFF chunks of an open WAVE file: {format_tag, channels, sample_rate,
+    block_align, bits, data_offset, data_size, fact_frames}, or None without fmt/data.
+    Shared with core.pcm_reader, which maps the data chunk directly.
+    """
+    pos = 12
+    fmt = None
+    data_offset = data_size = fact_frames = None
+    while pos + 8 <= size:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        chunk_id, chunk_size = header[:4], struct.unpack("<I", header[4:])[0]
+        if chunk_id == b"fmt ":
+            body = f.read(min(chunk_size, 40))
+            audio_format, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+            if audio_format == 0xFFFE and len(body) >= 26:  # WAVE_FORMAT_EXTENSIBLE: real format in the GUID
+                audio_format = struct.unpack("<H", body[24:26])[0]
+            fmt = (audio_format, channels, sample_rate, block_align, bits)
+        elif chunk_id == b"fact":
+            fact_frames = struct.unpack("<I", f.read(4))[0]
+        elif chunk_id == b"data":
+            data_offset, data_size = pos + 8, min(chunk_size, size - pos - 8)
+            if fmt is not None:
+                break
+        pos += 8 + chunk_size + (chunk_size & 1)
+    if fmt is None or data_size is None:
+        return None
+    audio_format, channels, sample_rate, block_align, bits = fmt
+    return {
+        "format_tag": audio_format, "channels": channels, "sample_rate": sample_rate, "block_align": block_align,
+        "bits": bits, "data_offset": data_offset, "data_size": data_size, "fact_frames": fact_frames,
+    }
+
+
+def _probe_wav(f: BinaryIO, head: bytes, size: int) -> Optional[Dict[str, Any]]:
+    layout = wav_layout(f, size)
+    if layout is None:
+        return None
+    audio_format, block_align, bits = layout["format_tag"], layout["block_align"], layout["bits"]
+    if audio_format in (1, 3) and block_align:  # PCM / IEEE float
+        frames = layout["data_size"] // block_align
+    elif layout["fact_frames"] is not None:
+        frames = layout["fact_frames"]
+    else:
+        return None
+    return _stats("wav", layout["sample_rate"], layout["channels"],
+                  (bits + 7) // 8 if audio_format in (1, 3) else None, frames)
+
+
+# ---------------------------------------------------------------- AIFF / AIFC
+
+def _extended_to_float(data: bytes) -> float:
+    """IEEE 754 80-bit extended (AIFF sample rate) to float."""
+    exponent, mantissa = struct.unpack(">HQ", data[:10])
+    sign = -1.0 if exponent & 0x8000 else 1.0
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def _probe_aiff(f: BinaryIO, head: bytes, size: int) -> Optional[Dict[str, Any]]:
+    pos = 12
+    while pos + 8 <= size:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        chunk_id, chunk_size = header[:4], struct.unpack(">I", header[4:])[0]
+        if chunk_id == b"COMM":
+            body = f.read(18)
+            channels, frames, bits = struct.unpack(">hIh", body[:8])
+            sample_rate = _extended_to_float(body[8:18])
+            return _stats("aiff", round(sample_rate), channels, (bits + 7) // 8, frames)
+        pos += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+# ---------------------------------------------------------------- FLAC
+
+def _id3v2_size(head: bytes) -> int:
+    """Length of a leading ID3v2 tag (0 if none)."""
+    if head[:3] != b"ID3" or len(head) < 10:
+        return 0
+    size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+    return 10 + size + (10 if head[5] & 0x10 else 0)
+
+
+def _probe_flac(f: BinaryIO, head: bytes, size: int) -> Optional[Dict[str, Any]]:
+    start = _id3v2_size(head)
+    f.seek(start)
+    block = f.read(4 + 4 + 34)
+    if block[:4] != b"fLaC" or block[4] & 0x7F != 0:  # first block must be STREAMINFO
+        return None
+    info = block[8:42]
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits = ((packed >> 36) & 0x1F) + 1
+    frames = packed & 0xFFFFFFFFF
+    if not sample_rate or not frames:
+        return None  # unknown total length: let a fallback decide
+    return _stats("flac", sample_rate, channels, (bits + 7) // 8, frames)
+
+
+# ---------------------------------------------------------------- MP3
+
+# kbit/s by (MPEG-1?, layer); MPEG-2/2.5 layers II and III share a table
+_MP3_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+
+def _probe_mp3(f: BinaryIO, head: bytes, size: int) -> Optional[Dict[str, Any]]:
+    start = _id3v2_size(head)
+    if start + 4 > len(head):
+        f.seek(start)
+        head, start = f.read(HEAD_BYTES), 0
+    for pos in range(start, len(head) - 4):
+        if head[pos] != 0xFF or head[pos + 1] & 0xE0 != 0xE0:
+            continue
+        b1, b2, b3 = head[pos + 1], head[pos + 2], head[pos + 3]
+        version = {3: 1, 2: 2, 0: 25}.get((b1 >> 3) & 0x3)
+        layer = 4 - ((b1 >> 1) & 0x3)
+        bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 0x3
+        if version is None or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        mpeg1 = version == 1
+        bitrate = _MP3_BITRATES[(mpeg1, layer if mpeg1 else min(layer, 2))][bitrate_index]
+        sample_rate = _MP3_RATES[version][rate_index]
+        channels = 1 if (b3 >> 6) == 3 else 2
+        samples_per_frame = 384 if layer == 1 else (1152 if mpeg1 or layer == 2 else 576)
+
+        # Xing/Info (VBR or LAME CBR) header sits after the side info of the first frame
+        side_info = (17 if channels == 1 else 32) if mpeg1 else (9 if channels == 1 else 17)
+        xing = pos + 4 + side_info
+        if head[xing:xing + 4] in (b"Xing", b"Info") and struct.unpack(">I", head[xing + 4:xing + 8])[0] & 1:
+            frames = struct.unpack(">I", head[xing + 8:xing + 12])[0]
+            return _stats("mp3", sample_rate, channels, None, frames * samples_per_frame)
+        vbri = pos + 4 + 32
+        if head[vbri:vbri + 4] == b"VBRI":
+            frames = struct.unpack(">I", head[vbri + 14:vbri + 18])[0]
+            return _stats("mp3", sample_rate, channels, None, frames * samples_per_frame)
+
+        # CBR: estimate from the audio payload size
+        payload = size - pos - (128 if _has_id3v1(f, size) else 0)
+        duration = payload * 8 / (bitrate * 1000.0)
+        return _stats("mp3", sample_rate, channels, None, int(duration * sample_rate))
+    return None
+
+
+def _has_id3v1(f: BinaryIO, size: int) -> bool:
+    if size < 128:
+        return False
+    f.seek(size - 128)
+    return f.read(3) == b"TAG"
+
+
+# ---------------------------------------------------------------- Ogg Vorbis / Opus
+
+def _last_granule(f: BinaryIO, size: int) -> Optional[int]:
+    """Granule position of the last Ogg page (= total samples for Vorbis)."""
+    f.seek(max(0, size - HEAD_BYTES))
+    tail = f.read()
+    pos = tail.rfind(b"OggS")
+    while pos != -1:
+        if pos + 14 <= len(tail):
+            granule = struct.unpack("<q", tail[pos + 6:pos + 14])[0]
+            if granule >= 0:
+                return granule
+        pos = tail.rfind(b"OggS", 0, pos)
+    return None
+
+
+def _probe_ogg(f: BinaryIO, head: bytes, size: int) -> Optional[Dict[str, Any]]:
+    if head[:4] != b"OggS" or len(head) < 28:
+        return None
+    segments = head[26]
+    packet = head[27 + segments:27 + segments + 64]
+    granule = _last_granule(f, size)
+    if granule is None:
+        return None
+    if packet[:7] == b"\x01vorbis":
+        channels, sample_rate = packet[11], struct.unpack("<I", packet[12:16])[0]
+        return _stats("ogg", sample_rate, channels, None, granule)
+    if packet[:8] == b"OpusHead":
+        channels, pre_skip = packet[9], struct.unpack("<H", packet[10:12])[0]
+        return _stats("opus", 48000, channels, None, max(0, granule - pre_skip))
+    return None
+
+
+# ---------------------------------------------------------------- fallbacks
+
+def _probe_fallback(path: str) -> Optional[Dict[str, Any]]:
+    if SOUNDFILE_AVAILABLE:
+        try:
+            info = sf.info(path)
+            if info.samplerate and info.frames:
+                width = {"PCM_16": 2, "PCM_24": 3, "PCM_32": 4, "PCM_U8": 1, "PCM_S8": 1, "FLOAT": 4, "DOUBLE": 8}
+                return _stats(info.format.lower(), info.samplerate, info.channels, width.get(info.subtype), info.frames)
+        except Exception:
+            pass
+    if MUTAGEN_AVAILABLE:
+        try:
+            meta = mutagen.File(path)
+            info = getattr(meta, "info", None)
+            sample_rate = int(getattr(info, "sample_rate", 0) or 0)
+            if info is not None and sample_rate:
+                bits = getattr(info, "bits_per_sample", None)
+                frames = int(round(float(info.length) * sample_rate))
+                return _stats(os.path.splitext(path)[1].lstrip(".").lower(), sample_rate,
+                              getattr(info, "channels", 0) or 0, (bits + 7) // 8 if bits else None, frames)
+        except Exception:
+            pass
+    return None
+
+
+def probe_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Header-only stats for one audio file:
+    {format, sample_rate, channels, sample_width, frame_count, duration_sec}.
+    sample_width is None for lossy formats. Returns None if the file cannot be probed.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(HEAD_BYTES)
+            result = None
+            if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+                result = _probe_wav(f, head, size)
+            elif head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+                result = _probe_aiff(f, head, size)
+            elif head[:4] == b"fLaC" or (head[:3] == b"ID3" and path.lower().endswith(".flac")):
+                result = _probe_flac(f, head, size)
+            elif head[:4] == b"OggS":
+                result = _probe_ogg(f, head, size)
+            elif head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+                result = _probe_mp3(f, head, size)
+    except (OSError, struct.error, IndexError, KeyError) as e:
+        log_event(f"Probe: cannot parse {path}: {e}")
+        result = None
+    return result or _probe_fallback(path)
+
+
+def probe_files(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+    use_cache: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Probe many files. Catalog rows whose size/mtime still match are reused; the
+    rest are probed on a thread pool and written back to the catalog.
+    Returns {path: stats} for every file that could be probed.
+    """
+    catalog = catalog or get_catalog()
+    paths = list(paths)
+    result: Dict[str, Dict[str, Any]] = {}
+    todo: List[str] = []
+    stats_by_path: Dict[str, os.stat_result] = {}
+    cached = catalog.get_samples(paths, ("size", "mtime_ns", *PROBE_FIELDS)) if use_cache else {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats_by_path[path] = st
+        row = cached.get(os.path.abspath(path))
+        if (row and row["duration_sec"] is not None and row["format"] is not None
+                and (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns)):
+            result[path] = {name: row[name] for name in PROBE_FIELDS}
+        else:
+            todo.append(path)
+
+    reused = len(result)
+    workers = config.IO_WORKERS if workers is None else workers
+    if workers > 1 and len(todo) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as pool:
+            probed = list(pool.map(probe_file, todo))
+    else:
+        probed = [probe_file(path) for path in todo]
+
+    with catalog.transaction():
+        for path, stats in zip(todo, probed):
+            if stats is None:
+                log_event(f"Probe failed: {path}")
+                continue
+            result[path] = stats
+            catalog.upsert_file(path, stats_by_path[path], **{k: stats[k] for k in PROBE_FIELDS})
+    log_event(f"Probed {len(todo)} file(s), {reused} from catalog cache")
+    return result
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    from utils.file_utils import find_all_audio_files
+
+    files = find_all_audio_files(config.SAMPLES_DIR)
+    stats = probe_files(files)
+    print(f"Probed {len(stats)} of {len(files)} files in {config.SAMPLES_DIR}")
@@ -0,0 +1,185 @@
+# core/batch_executor.py
+
+"""
+SampleMindAI – Batch Executor
+One way to run a function over many files for every batch tool:
+
+    for path, result in run_batch(extract_features, files, description="Analyzing"):
+        save(path, result)
+
+- kind="process" for CPU/decode work (librosa, CNN), kind="thread" for I/O
+  (HTTP backends, header reads)
+- items are submitted in chunks with a bounded number of tasks in flight, so
+  100k files do not become 100k pending futures; a lazy iterable (a directory
+  walk generator) is only consumed as chunks are submitted
+- results come back unordered (as they finish) or ordered (input order)
+- a Rich progress bar advances on every completed item
+- Ctrl-C cancels pending work and stops cleanly; everything already yielded
+  has been handled by the caller, so finished results are kept (ordered mode
+  still yields results that finished after a gap, in input order)
+- a worker process that dies (segfault, OOM kill) breaks the process pool: the
+  items of the chunks in flight are counted as errors and the remaining chunks
+  run on a fresh pool
+
+Workers default to config.WORKERS (env SAMPLEMIND_WORKERS, or `--workers` on
+the CLI menu). Results are handled in the calling process, so catalog writes
+never happen inside workers.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+from utils.config import config
+from utils.logger import log_event
+
+console = Console()
+
+KINDS = ("process", "thread")
+
+
+def _run_chunk(func: Callable[[Any], Any], chunk: List[Tuple[int, Any]]) -> List[Tuple[int, Any, Optional[str]]]:
+    """Worker side: run func over a chunk, capturing per-item errors instead of failing the chunk."""
+    out = []
+    for index, item in chunk:
+        try:
+            out.append((index, func(item), None))
+        except Exception as e:
+            out.append((index, None, f"{type(e).__name__}: {e}"))
+    return out
+
+
+STREAM_CHUNKSIZE = 16          # default chunk size when the number of items is not known upfront
+
+
+def _default_chunksize(total: Optional[int], workers: int) -> int:
+    if total is None:
+        return STREAM_CHUNKSIZE
+    # ~8 chunks per worker balances IPC overhead against stragglers
+    return max(1, min(64, total // (workers * 8) or 1))
+
+
+def _chunks(items: Iterable[Any], chunksize: int) -> Iterator[List[Tuple[int, Any]]]:
+    numbered = enumerate(items)
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _make_pool(kind: str, workers: int) -> Executor:
+    if workers == 1:
+        return ThreadPoolExecutor(max_workers=1)  # keeps Ctrl-C handling identical
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+
+
+def run_batch(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    kind: str = "process",
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    chunksize: Optional[int] = None,
+    description: str = "Processing",
+    show_progress: bool = True,
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Run `func(item)` for each item on a process or thread pool and yield
+    (item, result) pairs. Items whose call raised yield (item, None); the error
+    is logged. For kind="process" `func` must be picklable: a top-level function,
+    or functools.partial(func, option=value) to pass extra arguments.
+    `items` is read lazily, a chunk at a time; the progress bar shows a total
+    when it has a len().
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown executor kind '{kind}' (expected one of {', '.join(KINDS)})")
+    total: Optional[int] = len(items) if hasattr(items, "__len__") else None
+    workers = max(1, workers or config.WORKERS)
+    queue = _chunks(items, chunksize or _default_chunksize(total, workers))
+    first = next(queue, None)
+    if first is None:
+        return
+    queue = chain([first], queue)
+
+    progress = Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        disable=not show_progress,
+    )
+    pool = _make_pool(kind, workers)
+
+    done_count = errors = 0
+    interrupted = stopped_early = False
+    buffered: Dict[int, Tuple[Any, Any]] = {}
+    next_index = 0
+    pending: Dict[Future, List[Tuple[int, Any]]] = {}
+    max_in_flight = workers * 2
+    try:
+        with progress:
+            task = progress.add_task(description, total=total)
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = next(queue, None)
+                    if chunk is None:
+                        break
+                    pending[pool.submit(_run_chunk, func, chunk)] = chunk
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in finished:
+                    chunk = pending.pop(future)
+                    try:
+                        outcomes = future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        outcomes = [(index, None, f"worker process died: {e}") for index, _ in chunk]
+                    chunk_items = dict(chunk)
+                    for index, result, error in outcomes:
+                        if error is not None:
+                            errors += 1
+                            log_event(f"Batch {description}: {chunk_items[index]} failed: {error}")
+                        progress.advance(task)
+                        done_count += 1
+                        if ordered:
+                            buffered[index] = (chunk_items[index], result)
+                        else:
+                            yield chunk_items[index], result
+                    if ordered:
+                        while next_index in buffered:
+                            yield buffered.pop(next_index)
+                            next_index += 1
+                if broken:
+                    # the chunks still in flight fail with the same error on the next wait
+                    log_event(f"Batch {description}: a worker process died, restarting the pool")
+                    pool.shutdown(wait=False)
+                    pool = _make_pool(kind, workers)
+    except KeyboardInterrupt:
+        interrupted = True
+        of_total = f" of {total}" if total is not None else ""
+        console.print(f"[yellow]Interrupted: stopping after {done_count}{of_total} item(s); "
+                      f"finished results were kept.[/yellow]")
+        # results that finished after a gap were never yielded: hand them over in input order
+        for index in sorted(buffered):
+            yield buffered.pop(index)
+    except GeneratorExit:
+        stopped_early = True  # caller broke out of the loop (or was interrupted itself)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=not (interrupted or stopped_early), cancel_futures=True)
+        log_event(
+            f"Batch {description}: {done_count}{'' if total is None else f'/{total}'} done, {errors} error(s), "
+            f"{workers} {kind} worker(s){' (interrupted)' if interrupted else ''}"
+        )
@@ -0,0 +1,787 @@
+# core/catalog.py
+
+"""
+SampleMindAI – Library Catalog
+Persistent SQLite catalog of the sample library (path, size, mtime, content hash,
+probe stats and tags) plus a directory manifest for incremental rescans, a
+content-hash table keyed by file identity (see core.content_hash) and scalar
+feature values keyed by content hash (see core.feature_cache).
+Query tools read from here instead of opening one .json
+sidecar per audio file; sidecars are kept in sync as an export format.
+
+Usage:
+    from core.catalog import get_catalog
+    catalog = get_catalog()
+    catalog.sync_folder(config.SAMPLES_DIR)
+    hits = catalog.query_tags({"genre": "Techno"}, folder=config.SAMPLES_DIR)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.config import config
+from utils.logger import log_event
+from utils.music_keys import to_camelot
+
+SCHEMA_VERSION = 1
+
+# Column name -> SQLite type for the `samples` table. New columns are added
+# here and picked up automatically by `_migrate` on existing catalogs.
+SAMPLE_COLUMNS: Dict[str, str] = {
+    "path": "TEXT NOT NULL UNIQUE",
+    "folder": "TEXT NOT NULL",
+    "filename": "TEXT NOT NULL",
+    "size": "INTEGER",
+    "mtime_ns": "INTEGER",
+    "inode": "INTEGER",
+    "device": "INTEGER",
+    "sidecar_mtime_ns": "INTEGER",
+    "content_hash": "TEXT",
+    "format": "TEXT",
+    "sample_rate": "INTEGER",
+    "channels": "INTEGER",
+    "sample_width": "INTEGER",
+    "frame_count": "INTEGER",
+    "duration_sec": "REAL",
+    "bpm": "REAL",
+    "bpm_confidence": "REAL",
+    "bpm_analyzed_at": "REAL",
+    "key": "TEXT",
+    "key_confidence": "REAL",
+    "key_analyzed_at": "REAL",
+    "camelot": "TEXT",
+    "loudness_lufs": "REAL",
+    "true_peak_db": "REAL",
+    "loudness_range_lu": "REAL",
+    "quality_score": "REAL",
+    "loop_start": "INTEGER",
+    "loop_end": "INTEGER",
+    "loop_score": "REAL",
+    "fingerprint_version": "INTEGER",
+    "updated_at": "REAL",
+}
+
+# Columns with a SQLite index for range/equality queries (see core.range_index)
+INDEXED_COLUMNS = (
+    "bpm", "duration_sec", "sample_rate", "loudness_lufs", "true_peak_db", "quality_score", "key", "camelot",
+)
+
+# Columns the in-memory indexes (core.tag_index, core.range_index) load; writing
+# only other columns (stat info, hashes, loop points, ...) keeps the generation
+GENERATION_COLUMNS = frozenset((*INDEXED_COLUMNS, "loudness_range_lu"))
+
+# Probe/analysis fields that live in columns rather than in the tags table
+STAT_FIELDS = ("sample_rate", "channels", "sample_width", "frame_count", "duration_sec", "bpm", "key")
+
+# Columns that become stale when the underlying file content changes
+DERIVED_FIELDS = (
+    "content_hash", "format", "sample_rate", "channels", "sample_width", "frame_count", "duration_sec",
+    "bpm", "bpm_confidence", "bpm_analyzed_at", "key", "key_confidence", "key_analyzed_at", "camelot", "loudness_lufs",
+    "true_peak_db", "loudness_range_lu", "quality_score", "loop_start", "loop_end", "loop_score", "fingerprint_version",
+)
+
+
+def normalize_tag(value: Any) -> str:
+    """Normalized form of a tag value used for matching (trimmed, lowercase)."""
+    return str(value).strip().lower()
+
+
+def _column_values(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Sample column values from `fields`; the Camelot code always follows the key."""
+    values = {k: v for k, v in fields.items() if k in SAMPLE_COLUMNS and k != "path"}
+    if "key" in values:
+        values["camelot"] = to_camelot(values["key"])
+    return values
+
+
+def sidecar_path(audio_path: str) -> str:
+    """Return the .json sidecar path for an audio file."""
+    return os.path.splitext(audio_path)[0] + ".json"
+
+
+def folder_bounds(folder: str) -> tuple:
+    """
+    Return (low, high) path bounds covering every path below `folder`,
+    so folder filters can use the path index instead of a LIKE scan.
+    """
+    prefix = os.path.join(os.path.abspath(folder), "")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _filter_exts(paths: List[str], supported_exts: Optional[List[str]]) -> List[str]:
+    if supported_exts is None:
+        return paths
+    exts = tuple(ext.lower() for ext in supported_exts)
+    return [p for p in paths if p.lower().endswith(exts)]
+
+
+class LibraryCatalog:
+    """
+    SQLite-backed catalog of samples and their tags.
+    Safe to share between threads; each process opens its own connection.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path: str = db_path or config.CATALOG_PATH
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+
+    # ---------------------------------------------------------------- schema
+
+    def _migrate(self) -> None:
+        """Create tables and add any columns missing from older catalogs."""
+        with self.transaction():
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS samples (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                + ", ".join(f'"{name}" {sql_type}' for name, sql_type in SAMPLE_COLUMNS.items())
+                + ")"
+            )
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(samples)")}
+            for name, sql_type in SAMPLE_COLUMNS.items():
+                if name not in existing:
+                    # ALTER TABLE cannot add UNIQUE/NOT NULL columns; only plain types get here
+                    self._conn.execute(f'ALTER TABLE samples ADD COLUMN "{name}" {sql_type.split()[0]}')
+            if "bpm_analyzed_at" not in existing:
+                # rows tempo-analyzed before the marker existed
+                self._conn.execute("UPDATE samples SET bpm_analyzed_at = updated_at WHERE bpm IS NOT NULL")
+            if "key_analyzed_at" not in existing:
+                self._conn.execute("UPDATE samples SET key_analyzed_at = updated_at WHERE key IS NOT NULL")
+            if "camelot" not in existing:
+                keyed = self._conn.execute("SELECT id, key FROM samples WHERE key IS NOT NULL").fetchall()
+                self._conn.executemany("UPDATE samples SET camelot = ? WHERE id = ?",
+                                       [(to_camelot(row["key"]), row["id"]) for row in keyed])
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tags ("
+                "sample_id INTEGER NOT NULL REFERENCES samples(id) ON DELETE CASCADE, "
+                "field TEXT NOT NULL, value TEXT NOT NULL, norm TEXT NOT NULL, "
+                "PRIMARY KEY (sample_id, field))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tags_field_norm ON tags(field, norm)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_folder ON samples(folder)")
+            for name in INDEXED_COLUMNS:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_samples_{name} ON samples("{name}")')
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS directories ("
+                "path TEXT PRIMARY KEY, inode INTEGER, size INTEGER, mtime_ns INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS content_hashes ("
+                "device INTEGER NOT NULL, inode INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, algorithm TEXT NOT NULL, digest TEXT NOT NULL, hashed_at REAL, "
+                "PRIMARY KEY (device, inode, size, mtime_ns, algorithm))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "sample_id INTEGER PRIMARY KEY REFERENCES samples(id) ON DELETE CASCADE, "
+                "landmarks INTEGER NOT NULL, signature BLOB)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprint_buckets ("
+                "band INTEGER NOT NULL, bucket INTEGER NOT NULL, "
+                "sample_id INTEGER NOT NULL REFERENCES samples(id) ON DELETE CASCADE)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fp_buckets ON fingerprint_buckets(band, bucket)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fp_buckets_sample ON fingerprint_buckets(sample_id)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                "content_hash TEXT NOT NULL, name TEXT NOT NULL, version INTEGER NOT NULL, "
+                "params TEXT NOT NULL, value TEXT NOT NULL, computed_at REAL, "
+                "PRIMARY KEY (content_hash, name, version, params))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+            self._conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('generation', '0')")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group several writes into one transaction (much faster for bulk updates).
+        Nested calls join the outermost transaction, which commits or rolls back.
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.rollback()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------------------------------------- writes
+
+    def upsert_file(self, path: str, st: Optional[os.stat_result] = None, **fields: Any) -> int:
+        """
+        Insert or update a sample row from its stat info plus any extra column values.
+        Derived columns (hash, probe stats) are cleared when size or mtime changed.
+        Returns the sample id.
+        """
+        path = os.path.abspath(path)
+        st = st or os.stat(path)
+        values: Dict[str, Any] = {
+            "folder": os.path.dirname(path),
+            "filename": os.path.basename(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "inode": st.st_ino,
+            "device": st.st_dev,
+            "updated_at": time.time(),
+        }
+        values.update(_column_values(fields))
+        with self.transaction() as conn:
+            row = conn.execute("SELECT id, size, mtime_ns FROM samples WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                columns = ", ".join(f'"{name}"' for name in ["path", *values])
+                cur = conn.execute(
+                    f"INSERT INTO samples ({columns}) VALUES ({', '.join('?' * (len(values) + 1))})",
+                    [path, *values.values()],
+                )
+                self._touch(conn)
+                return int(cur.lastrowid)
+            if (row["size"], row["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+                for name in DERIVED_FIELDS:
+                    values.setdefault(name, None)
+            self._update_row(conn, row["id"], values)
+            return int(row["id"])
+
+    def update_fields(self, path: str, fields: Dict[str, Any]) -> None:
+        """Update column values (probe stats, bpm, key, ...) for a known or new sample."""
+        path = os.path.abspath(path)
+        columns = _column_values(fields)
+        sample_id = self.sample_id(path)
+        if sample_id is None:
+            if os.path.exists(path):
+                self.upsert_file(path, **columns)
+            return
+        with self.transaction() as conn:
+            self._update_row(conn, sample_id, columns)
+
+    def _update_row(self, conn: sqlite3.Connection, sample_id: int, values: Dict[str, Any]) -> None:
+        if not values:
+            return
+        assignments = ", ".join(f'"{name}" = ?' for name in values)
+        conn.execute(f"UPDATE samples SET {assignments} WHERE id = ?", [*values.values(), sample_id])
+        if not GENERATION_COLUMNS.isdisjoint(values):
+            self._touch(conn)
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection) -> None:
+        """Bump the catalog generation so in-memory indexes know to reload."""
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'")
+
+    def set_tags(self, path: str, tags: Dict[str, Any], replace: bool = False, sync_sidecar: bool = True) -> None:
+        """
+        Store tags for a sample. Non-string values are skipped; stat fields go to columns.
+        With replace=True all existing tags are dropped first.
+        The .json sidecar is re-exported unless sync_sidecar is False.
+        """
+        path = os.path.abspath(path)
+        sample_id = self.sample_id(path)
+        if sample_id is None:
+            sample_id = self.upsert_file(path)
+        columns = _column_values({k: tags[k] for k in STAT_FIELDS if k in tags})
+        with self.transaction() as conn:
+            if replace:
+                conn.execute("DELETE FROM tags WHERE sample_id = ?", (sample_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO tags(sample_id, field, value, norm) VALUES (?, ?, ?, ?)",
+                [
+                    (sample_id, field, str(value).strip(), normalize_tag(value))
+                    for field, value in tags.items()
+                    if field not in STAT_FIELDS and isinstance(value, str) and value.strip()
+                ],
+            )
+            self._update_row(conn, sample_id, columns)
+            self._touch(conn)
+        if sync_sidecar:
+            self.export_sidecar(path)
+
+    def remove_paths(self, paths: Iterable[str]) -> int:
+        """Drop samples (and their tags) from the catalog. Returns the number removed."""
+        with self.transaction() as conn:
+            cur = conn.executemany(
+                "DELETE FROM samples WHERE path = ?", [(os.path.abspath(p),) for p in paths]
+            )
+            self._touch(conn)
+            return cur.rowcount
+
+    # ---------------------------------------------------------------- reads
+
+    def sample_id(self, path: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM samples WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        return int(row["id"]) if row else None
+
+    def get_sample(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the catalog record for a file (columns + 'tags' dict), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM samples WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+            if row is None:
+                return None
+            record = dict(row)
+            record["tags"] = self._tags_for(row["id"])
+        return record
+
+    def get_samples(self, paths: Iterable[str], columns: Iterable[str] = ("id", "path")) -> Dict[str, sqlite3.Row]:
+        """Batch lookup: {absolute path: row} with the requested columns, for known paths."""
+        select = ", ".join(
+            f's."{name}"' for name in dict.fromkeys(["path", *columns]) if name == "id" or name in SAMPLE_COLUMNS
+        )
+        wanted = [os.path.abspath(p) for p in paths]
+        result: Dict[str, sqlite3.Row] = {}
+        with self._lock:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                for row in self._conn.execute(
+                    f"SELECT {select} FROM samples s WHERE s.path IN ({', '.join('?' * len(chunk))})", chunk
+                ):
+                    result[row["path"]] = row
+        return result
+
+    def get_tags(self, path: str) -> Dict[str, str]:
+        """Return the tags for a file ({} if unknown)."""
+        sample_id = self.sample_id(path)
+        if sample_id is None:
+            return {}
+        with self._lock:
+            return self._tags_for(sample_id)
+
+    def _tags_for(self, sample_id: int) -> Dict[str, str]:
+        return {
+            row["field"]: row["value"]
+            for row in self._conn.execute("SELECT field, value FROM tags WHERE sample_id = ?", (sample_id,))
+        }
+
+    def iter_samples(self, folder: Optional[str] = None, with_tags: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield catalog records, optionally restricted to files below `folder`."""
+        sql, params = "SELECT * FROM samples", []
+        if folder:
+            sql += " WHERE path >= ? AND path < ?"
+            params.extend(folder_bounds(folder))
+        with self._lock:
+            rows = [dict(r) for r in self._conn.execute(sql + " ORDER BY path", params)]
+            if with_tags:
+                tags: Dict[int, Dict[str, str]] = {}
+                tag_sql = "SELECT t.sample_id, t.field, t.value FROM tags t JOIN samples s ON s.id = t.sample_id"
+                if folder:
+                    tag_sql += " WHERE s.path >= ? AND s.path < ?"
+                for t in self._conn.execute(tag_sql, params):
+                    tags.setdefault(t["sample_id"], {})[t["field"]] = t["value"]
+                for r in rows:
+                    r["tags"] = tags.get(r["id"], {})
+        yield from rows
+
+    def query_tags(
+        self,
+        tag_filter: Dict[str, str],
+        folder: Optional[str] = None,
+        paths: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return [{'path': ..., 'tags': {...}}] for samples whose tags match every
+        non-empty value in tag_filter (case-insensitive). Optionally limited to a
+        folder and/or an explicit set of paths.
+        """
+        active = {k: normalize_tag(v) for k, v in tag_filter.items() if v and str(v).strip()}
+        sql = "SELECT s.id, s.path FROM samples s"
+        params: List[Any] = []
+        for i, (field, norm) in enumerate(active.items()):
+            sql += f" JOIN tags t{i} ON t{i}.sample_id = s.id AND t{i}.field = ? AND t{i}.norm = ?"
+            params.extend([field, norm])
+        if folder:
+            sql += " WHERE s.path >= ? AND s.path < ?"
+            params.extend(folder_bounds(folder))
+        wanted = {os.path.abspath(p) for p in paths} if paths is not None else None
+        results = []
+        with self._lock:
+            for row in self._conn.execute(sql + " ORDER BY s.path", params):
+                if wanted is not None and row["path"] not in wanted:
+                    continue
+                results.append({"path": row["path"], "tags": self._tags_for(row["id"])})
+        return results
+
+    def sample_rows(self, columns: Iterable[str] = ("id", "path")) -> List[sqlite3.Row]:
+        """All sample rows (selected columns) in path order – used to build in-memory indexes."""
+        select = ", ".join(f'"{c}"' for c in columns if c == "id" or c in SAMPLE_COLUMNS)
+        with self._lock:
+            return self._conn.execute(f"SELECT {select} FROM samples ORDER BY path").fetchall()
+
+    def tag_rows(self) -> List[sqlite3.Row]:
+        """All (sample_id, field, norm, value) tag rows."""
+        with self._lock:
+            return self._conn.execute("SELECT sample_id, field, norm, value FROM tags").fetchall()
+
+    def generation(self) -> int:
+        """
+        Monotonic change counter for the in-memory indexes; increases when samples
+        are added or removed, tags change or a GENERATION_COLUMNS value is written.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0])
+
+    # ---------------------------------------------------------------- sidecars
+
+    def import_sidecar(self, path: str) -> bool:
+        """Load a file's .json sidecar into the catalog. Returns False if missing/invalid."""
+        json_file = sidecar_path(path)
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            sc_mtime = os.stat(json_file).st_mtime_ns
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict):
+            return False
+        self.set_tags(path, data, replace=True, sync_sidecar=False)
+        self.update_fields(path, {"sidecar_mtime_ns": sc_mtime})
+        return True
+
+    def export_sidecar(self, path: str) -> Optional[str]:
+        """
+        Write the catalog record for `path` into its .json sidecar, merged over any
+        existing sidecar content. Returns the sidecar path, or None on failure.
+        """
+        record = self.get_sample(path)
+        if record is None:
+            return None
+        json_file = sidecar_path(record["path"])
+        data: Dict[str, Any] = {}
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+            if isinstance(existing, dict):
+                # Keep foreign keys (lists, numbers, nested data); string tags are owned by the catalog
+                data.update({k: v for k, v in existing.items() if not isinstance(v, str) or k in STAT_FIELDS})
+        except (OSError, ValueError):
+            pass
+        data.update({k: record[k] for k in STAT_FIELDS if record.get(k) is not None})
+        data.update(record["tags"])
+        try:
+            with open(json_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            self.update_fields(record["path"], {"sidecar_mtime_ns": os.stat(json_file).st_mtime_ns})
+        except OSError as e:
+            log_event(f"Catalog: failed to export sidecar {json_file}: {e}")
+            return None
+        return json_file
+
+    # ---------------------------------------------------------------- content hashes
+
+    def cached_hashes(self, keys: Iterable[tuple], algorithm: str) -> Dict[tuple, str]:
+        """
+        Look up stored content hashes. `keys` are (device, inode, size, mtime_ns)
+        tuples; returns {key: digest} for the ones hashed with `algorithm`.
+        """
+        result: Dict[tuple, str] = {}
+        with self._lock:
+            for key in set(keys):
+                row = self._conn.execute(
+                    "SELECT digest FROM content_hashes WHERE device = ? AND inode = ? AND size = ? "
+                    "AND mtime_ns = ? AND algorithm = ?",
+                    (*key, algorithm),
+                ).fetchone()
+                if row is not None:
+                    result[key] = row["digest"]
+        return result
+
+    def save_hashes(self, entries: Iterable[tuple], algorithm: str) -> None:
+        """
+        Store content hashes. `entries` are (path, (device, inode, size, mtime_ns), digest).
+        Catalog samples whose size/mtime still match also get their content_hash column set.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO content_hashes(device, inode, size, mtime_ns, algorithm, digest, hashed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, algorithm, digest, now) for _, key, digest in entries],
+            )
+            conn.executemany(
+                "UPDATE samples SET content_hash = ? WHERE path = ? AND size = ? AND mtime_ns = ?",
+                [(digest, os.path.abspath(path), key[2], key[3]) for path, key, digest in entries],
+            )
+
+    def prune_hashes(self, older_than_days: float = 90.0) -> int:
+        """Drop hash entries not refreshed for a while (files long since changed or deleted)."""
+        cutoff = time.time() - older_than_days * 86400
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM content_hashes WHERE hashed_at < ? AND NOT EXISTS ("
+                "SELECT 1 FROM samples s WHERE s.device = content_hashes.device AND s.inode = content_hashes.inode "
+                "AND s.size = content_hashes.size AND s.mtime_ns = content_hashes.mtime_ns)",
+                (cutoff,),
+            )
+            return cur.rowcount
+
+    # ---------------------------------------------------------------- fingerprints
+
+    def save_fingerprints(self, entries: Iterable[tuple], version: int) -> None:
+        """
+        Store audio fingerprints (see core.fingerprint). `entries` are
+        (path, landmarks, signature_bytes, [(band, bucket), ...]); previous
+        fingerprints of those samples are replaced.
+        """
+        with self.transaction() as conn:
+            for path, landmarks, signature, buckets in entries:
+                sample_id = self.sample_id(path)
+                if sample_id is None:
+                    sample_id = self.upsert_file(path)
+                conn.execute("DELETE FROM fingerprint_buckets WHERE sample_id = ?", (sample_id,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO fingerprints(sample_id, landmarks, signature) VALUES (?, ?, ?)",
+                    (sample_id, landmarks, signature),
+                )
+                conn.executemany(
+                    "INSERT INTO fingerprint_buckets(band, bucket, sample_id) VALUES (?, ?, ?)",
+                    [(band, bucket, sample_id) for band, bucket in buckets],
+                )
+                self._update_row(conn, sample_id, {"fingerprint_version": version})
+
+    def fingerprint_rows(self, folder: Optional[str] = None, sample_ids: Optional[Iterable[int]] = None) -> List[sqlite3.Row]:
+        """(sample_id, path, landmarks, signature) for current fingerprints, by folder or ids."""
+        sql = (
+            "SELECT f.sample_id, s.path, f.landmarks, f.signature FROM fingerprints f "
+            "JOIN samples s ON s.id = f.sample_id WHERE s.fingerprint_version IS NOT NULL"
+        )
+        with self._lock:
+            if sample_ids is not None:
+                ids = list(sample_ids)
+                rows: List[sqlite3.Row] = []
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    rows.extend(self._conn.execute(
+                        f"{sql} AND f.sample_id IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchall())
+                return rows
+            if folder:
+                return self._conn.execute(f"{sql} AND s.path >= ? AND s.path < ?", folder_bounds(folder)).fetchall()
+            return self._conn.execute(sql).fetchall()
+
+    def fingerprint_buckets(self, folder: Optional[str] = None, page_size: int = 10000) -> Iterator[sqlite3.Row]:
+        """(band, bucket, sample_id) rows grouped by bucket, streamed for the all-pairs LSH scan."""
+        sql = (
+            "SELECT b.band, b.bucket, b.sample_id FROM fingerprint_buckets b "
+            "JOIN samples s ON s.id = b.sample_id WHERE s.fingerprint_version IS NOT NULL"
+        )
+        params: tuple = ()
+        if folder:
+            sql += " AND s.path >= ? AND s.path < ?"
+            params = folder_bounds(folder)
+        # keyset pages: memory stays bounded and the lock is not held while the caller works
+        last: Optional[tuple] = None
+        while True:
+            page_sql, page_params = sql, params
+            if last is not None:
+                page_sql += " AND (b.band, b.bucket, b.sample_id) > (?, ?, ?)"
+                page_params += last
+            with self._lock:
+                rows = self._conn.execute(
+                    page_sql + " ORDER BY b.band, b.bucket, b.sample_id LIMIT ?", page_params + (page_size,)
+                ).fetchall()
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last = (rows[-1]["band"], rows[-1]["bucket"], rows[-1]["sample_id"])
+
+    def fingerprint_bucket_members(self, buckets: Iterable[tuple]) -> set:
+        """Sample ids sharing any (band, bucket) with the given list."""
+        members = set()
+        with self._lock:
+            for band, bucket in buckets:
+                members.update(
+                    row["sample_id"] for row in self._conn.execute(
+                        "SELECT b.sample_id FROM fingerprint_buckets b JOIN samples s ON s.id = b.sample_id "
+                        "WHERE b.band = ? AND b.bucket = ? AND s.fingerprint_version IS NOT NULL",
+                        (band, bucket),
+                    )
+                )
+        return members
+
+    # ---------------------------------------------------------------- feature values
+
+    def cached_features(self, content_hash: str, keys: Iterable[tuple]) -> Dict[tuple, Any]:
+        """
+        Look up scalar feature values of one file content. `keys` are
+        (name, version, params_json); returns {key: decoded value} for the hits.
+        """
+        result: Dict[tuple, Any] = {}
+        with self._lock:
+            for key in set(keys):
+                row = self._conn.execute(
+                    "SELECT value FROM features WHERE content_hash = ? AND name = ? AND version = ? AND params = ?",
+                    (content_hash, *key),
+                ).fetchone()
+                if row is not None:
+                    result[key] = json.loads(row["value"])
+        return result
+
+    def save_features(self, content_hash: str, entries: Iterable[tuple]) -> None:
+        """Store scalar feature values. `entries` are (name, version, params_json, value)."""
+        entries = list(entries)
+        if not entries:
+            return
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO features(content_hash, name, version, params, value, computed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(content_hash, name, version, params, json.dumps(value), now) for name, version, params, value in entries],
+            )
+
+    def prune_features(self, versions: Dict[str, int]) -> int:
+        """Drop feature values whose version differs from `versions[name]` (stale extractors)."""
+        with self.transaction() as conn:
+            removed = 0
+            for name, version in versions.items():
+                removed += conn.execute(
+                    "DELETE FROM features WHERE name = ? AND version != ?", (name, version)
+                ).rowcount
+            return removed
+
+    # ---------------------------------------------------------------- sync
+
+    def file_states(self, folder: str) -> Dict[str, sqlite3.Row]:
+        """Return {path: row(size, mtime_ns, inode, sidecar_mtime_ns)} for samples below `folder`."""
+        with self._lock:
+            return {
+                row["path"]: row
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns, inode, sidecar_mtime_ns FROM samples WHERE path >= ? AND path < ?",
+                    folder_bounds(folder),
+                )
+            }
+
+    def paths_missing(
+        self,
+        folder: str,
+        column: str,
+        supported_exts: Optional[List[str]] = None,
+        current: Any = None,
+    ) -> List[str]:
+        """
+        Return paths below `folder` whose `column` has not been computed yet (is NULL).
+        Derived columns are cleared when a file changes, so this is the analyzer work list.
+        With `current` (a version column such as fingerprint_version), rows computed
+        by another version are included too.
+        """
+        if column not in SAMPLE_COLUMNS:
+            raise ValueError(f"Unknown catalog column: {column}")
+        sql = f'SELECT path FROM samples WHERE path >= ? AND path < ? AND ("{column}" IS NULL'
+        params: tuple = folder_bounds(folder)
+        if current is not None:
+            sql += f' OR "{column}" != ?'
+            params += (current,)
+        with self._lock:
+            paths = [row["path"] for row in self._conn.execute(sql + ") ORDER BY path", params)]
+        return _filter_exts(paths, supported_exts)
+
+    def untagged_paths(self, folder: str, supported_exts: Optional[List[str]] = None) -> List[str]:
+        """Return paths below `folder` that have no tags at all."""
+        with self._lock:
+            paths = [
+                row["path"]
+                for row in self._conn.execute(
+                    "SELECT path FROM samples s WHERE path >= ? AND path < ? "
+                    "AND NOT EXISTS (SELECT 1 FROM tags t WHERE t.sample_id = s.id) ORDER BY path",
+                    folder_bounds(folder),
+                )
+            ]
+        return _filter_exts(paths, supported_exts)
+
+    # ---------------------------------------------------------------- directory manifest
+
+    def load_directory_manifest(self, folder: str) -> Dict[str, tuple]:
+        """Return {dir_path: (inode, size, mtime_ns)} for `folder` and every directory below it."""
+        folder = os.path.abspath(folder)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, inode, size, mtime_ns FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+                (folder, *folder_bounds(folder)),
+            ).fetchall()
+        return {row["path"]: (row["inode"], row["size"], row["mtime_ns"]) for row in rows}
+
+    def save_directory_manifest(self, folder: str, manifest: Dict[str, tuple]) -> None:
+        """Replace the stored manifest for `folder` (and below) with `manifest`."""
+        folder = os.path.abspath(folder)
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+                (folder, *folder_bounds(folder)),
+            )
+            conn.executemany(
+                "INSERT INTO directories(path, inode, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                [(path, *key) for path, key in manifest.items()],
+            )
+
+    # ---------------------------------------------------------------- sync
+
+    def sync_folder(
+        self,
+        folder: str,
+        supported_exts: Optional[List[str]] = None,
+        full: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Bring the catalog up to date with the files below `folder` using an
+        incremental scan (see core.library_scanner.scan_folder).
+        Returns the scan report: {'added', 'changed', 'deleted', 'unchanged', ...}.
+        """
+        from core.library_scanner import scan_folder
+
+        return scan_folder(self, folder, supported_exts=supported_exts, full=full)
+
+
+_catalogs: Dict[tuple, LibraryCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(db_path: Optional[str] = None) -> LibraryCatalog:
+    """
+    Return the shared catalog for this process (one connection per process,
+    so worker processes forked from a pool never reuse the parent's handle).
+    """
+    key = (os.getpid(), db_path or config.CATALOG_PATH)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = LibraryCatalog(key[1])
+        return _catalogs[key]
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    catalog = get_catalog()
+    report = catalog.sync_folder(config.SAMPLES_DIR)
+    print(f"Catalog at {catalog.db_path}: {catalog.count()} samples ({report['summary']})")
@@ -0,0 +1,132 @@
+# core/content_hash.py
+
+"""
+SampleMindAI – Content Hash Store
+One place to hash file contents, shared by duplicate detection, the feature
+cache, export manifests and library snapshots.
+
+Hashes are persisted in the catalog keyed by (device, inode, size, mtime_ns) and
+only recomputed when that stat key changes, so the same folder is never hashed
+twice. Files are read in large unbuffered chunks with xxh3-128 when the
+`xxhash` package is installed, otherwise BLAKE2b from hashlib. Digests are
+prefixed with the algorithm name ("xxh3_128:..."), so hashes from different
+installs are never confused.
+
+Usage:
+    from core.content_hash import content_hash, content_hashes
+    digest = content_hash(path)
+    digests = content_hashes(paths)   # {path: digest}, cached + parallel
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.config import config
+from utils.logger import log_event
+from core.catalog import LibraryCatalog, get_catalog
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+HASH_ALGORITHM = "xxh3_128" if XXHASH_AVAILABLE else "blake2b"
+CHUNK_SIZE = 1 << 20  # 1 MiB reads
+
+
+def _new_hasher():
+    return xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+
+
+def stat_key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    """Identity of a file's current contents: (device, inode, size, mtime_ns)."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash a file's full contents (no caching). Returns 'algorithm:hexdigest'."""
+    hasher = _new_hasher()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+
+
+def hash_range(path: str, offset: int, length: int) -> str:
+    """Hash `length` bytes at `offset` (for partial-content comparisons)."""
+    hasher = _new_hasher()
+    with open(path, "rb", buffering=0) as f:
+        f.seek(offset)
+        hasher.update(f.read(length))
+    return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+
+
+def content_hashes(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+) -> Dict[str, str]:
+    """
+    Return {path: digest} for `paths`, reusing stored hashes whose stat key still
+    matches. Missing hashes are computed on a thread pool (hashing releases the
+    GIL) and saved back to the catalog. Unreadable files are left out.
+    """
+    catalog = catalog or get_catalog()
+    keys: Dict[str, tuple] = {}
+    for path in paths:
+        try:
+            keys[path] = stat_key(os.stat(path))
+        except OSError as e:
+            log_event(f"Content hash: cannot stat {path}: {e}")
+
+    cached = catalog.cached_hashes(keys.values(), HASH_ALGORITHM)
+    result = {path: cached[key] for path, key in keys.items() if key in cached}
+    todo: List[str] = [path for path in keys if path not in result]
+    if not todo:
+        return result
+
+    def _hash(path: str) -> Optional[str]:
+        try:
+            return hash_file(path)
+        except OSError as e:
+            log_event(f"Content hash: cannot read {path}: {e}")
+            return None
+
+    workers = config.IO_WORKERS if workers is None else workers
+    if workers > 1 and len(todo) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash") as pool:
+            digests = list(pool.map(_hash, todo))
+    else:
+        digests = [_hash(path) for path in todo]
+
+    fresh = []
+    for path, digest in zip(todo, digests):
+        if digest is None:
+            continue
+        result[path] = digest
+        fresh.append((path, keys[path], digest))
+    catalog.save_hashes(fresh, HASH_ALGORITHM)
+    log_event(f"Content hash: {len(fresh)} hashed, {len(cached)} reused")
+    return result
+
+
+def content_hash(path: str, catalog: Optional[LibraryCatalog] = None) -> Optional[str]:
+    """Cached content hash of one file, or None if it cannot be read."""
+    return content_hashes([path], workers=1, catalog=catalog).get(path)
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    from utils.file_utils import find_all_audio_files
+
+    files = find_all_audio_files(config.SAMPLES_DIR)
+    hashes = content_hashes(files)
+    print(f"{len(hashes)} of {len(files)} files hashed with {HASH_ALGORITHM}")
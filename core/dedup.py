@@ -0,0 +1,217 @@
+# core/dedup.py
+
+"""
+SampleMindAI – Duplicate Detection Engine
+Finds byte-identical audio files in stages so that almost no bytes are read:
+
+    1. group by file size and drop sizes that occur once (stat only)
+    2. hash the first and last 64 KB of each remaining file and regroup
+    3. full content hash (core.content_hash: cached, thread pool) for real candidates
+
+`find_duplicates` returns a plan — one group per set of identical files with a
+file to keep and an action (delete / hardlink) for the others — which is shown
+to the user before `apply_plan` touches the disk. The plan records each file's
+identity (device, inode, size, mtime) and nothing is deleted or relinked if a
+file no longer matches it.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.config import config
+from utils.logger import log_event
+from utils.file_utils import iter_audio_files
+from core.catalog import DERIVED_FIELDS, get_catalog
+from core.content_hash import content_hashes, hash_range
+
+EDGE_BYTES = 64 * 1024
+ACTIONS = ("delete", "hardlink")
+
+
+def file_identity(st: os.stat_result) -> List[int]:
+    """[device, inode, size, mtime_ns]: changes whenever a file is replaced or rewritten."""
+    return [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _keep_shortest_path(paths: List[str]) -> str:
+    """Default keep rule: the shallowest, then alphabetically first, path."""
+    return min(paths, key=lambda p: (p.count(os.sep), len(p), p))
+
+
+def _edge_hash(path: str, size: int) -> Optional[str]:
+    """Hash of the first and last EDGE_BYTES (the whole file if it is smaller)."""
+    try:
+        if size <= 2 * EDGE_BYTES:
+            return hash_range(path, 0, size)
+        return hash_range(path, 0, EDGE_BYTES) + hash_range(path, size - EDGE_BYTES, EDGE_BYTES)
+    except OSError as e:
+        log_event(f"Dedup: cannot read {path}: {e}")
+        return None
+
+
+def _regroup(groups: List[List[str]], key: Callable[[str], Optional[str]], workers: int) -> List[List[str]]:
+    """Split each group by `key` (computed in parallel) and drop singletons."""
+    paths = [p for group in groups for p in group]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="dedup") as pool:
+        keys = dict(zip(paths, pool.map(key, paths)))
+    result: List[List[str]] = []
+    for group in groups:
+        buckets: Dict[str, List[str]] = {}
+        for path in group:
+            if keys[path] is not None:
+                buckets.setdefault(keys[path], []).append(path)
+        result.extend(sorted(b) for b in buckets.values() if len(b) > 1)
+    return result
+
+
+def find_duplicates(
+    paths: Iterable[str],
+    action: str = "delete",
+    keep: Callable[[List[str]], str] = _keep_shortest_path,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Find groups of identical files among `paths` and plan what to do with them.
+
+    Returns a plan dict:
+        groups: [{"hash", "size", "keep", "duplicates": [...], "action",
+                  "identity": {path: [device, inode, size, mtime_ns]}}]
+        stats:  files, candidates after each stage, bytes_total, bytes_read, reclaimable
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action '{action}' (expected one of {', '.join(ACTIONS)})")
+    workers = config.IO_WORKERS if workers is None else workers
+
+    # Stage 1: size buckets
+    sizes: Dict[int, List[str]] = {}
+    identities: Dict[str, List[int]] = {}
+    inodes = set()
+    bytes_total = 0
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if (st.st_dev, st.st_ino) in inodes:
+            continue  # already a hard link to a file we have seen
+        inodes.add((st.st_dev, st.st_ino))
+        identities[path] = file_identity(st)
+        bytes_total += st.st_size
+        sizes.setdefault(st.st_size, []).append(path)
+    files = sum(len(group) for group in sizes.values())
+    size_of = {p: size for size, group in sizes.items() for p in group}
+    groups = [sorted(group) for size, group in sizes.items() if len(group) > 1 and size > 0]
+    after_size = sum(len(g) for g in groups)
+    # Upper bound: full hashes already in the content-hash store are not re-read
+    bytes_read = sum(min(size_of[p], 2 * EDGE_BYTES) for g in groups for p in g)
+
+    # Stage 2: first/last 64 KB
+    groups = _regroup(groups, lambda p: _edge_hash(p, size_of[p]), workers)
+    after_edges = sum(len(g) for g in groups)
+
+    # Stage 3: full content hash (only files the edge stage could not rule out)
+    candidates = [p for g in groups for p in g]
+    digests = content_hashes(candidates, workers=workers)
+    bytes_read += sum(size_of[p] for p in candidates)
+    groups = _regroup(groups, digests.get, 1)
+
+    plan_groups = []
+    reclaimable = 0
+    for group in sorted(groups):
+        keeper = keep(group)
+        duplicates = [p for p in group if p != keeper]
+        reclaimable += size_of[keeper] * len(duplicates)
+        plan_groups.append({
+            "hash": digests[keeper],
+            "size": size_of[keeper],
+            "keep": keeper,
+            "duplicates": duplicates,
+            "action": action,
+            "identity": {p: identities[p] for p in group},
+        })
+
+    stats = {
+        "files": files,
+        "after_size": after_size,
+        "after_edges": after_edges,
+        "groups": len(plan_groups),
+        "bytes_total": bytes_total,
+        "bytes_read": bytes_read,
+        "reclaimable": reclaimable,
+    }
+    log_event(f"Dedup plan: {stats}")
+    return {"groups": plan_groups, "stats": stats}
+
+
+def find_duplicates_in_folder(folder: str, supported_exts: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+    """find_duplicates over every audio file below `folder`."""
+    return find_duplicates(iter_audio_files(folder, supported_exts), **kwargs)
+
+
+def _hardlink(source: str, target: str) -> None:
+    """Replace `target` with a hard link to `source` (atomically via a temp name)."""
+    tmp = f"{target}.dedup-tmp"
+    os.link(source, tmp)
+    os.replace(tmp, target)
+
+
+def _unchanged(group: Dict[str, Any], path: str) -> bool:
+    """True when `path` still has the identity recorded for it in the plan group."""
+    try:
+        current = file_identity(os.stat(path))
+    except OSError:
+        return False
+    return list(group.get("identity", {}).get(path, ())) == current
+
+
+def apply_plan(plan: Dict[str, Any], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Carry out a plan from find_duplicates. Each duplicate and its keeper are
+    re-stat'ed first; if either no longer has the identity recorded in the plan
+    (rewritten, replaced, even at the same size) the duplicate is skipped.
+    Deleted duplicates leave the catalog; relinked ones keep their rows, updated
+    to the keeper's file identity and analysis.
+    Returns {"done": [...], "skipped": [...], "errors": [...]}.
+    """
+    done: List[str] = []
+    skipped: List[str] = []
+    errors: List[str] = []
+    for group in plan["groups"]:
+        keeper = group["keep"]
+        for path in group["duplicates"]:
+            try:
+                if not _unchanged(group, path) or not _unchanged(group, keeper):
+                    skipped.append(path)
+                    log_event(f"Dedup skipped {path}: changed since the plan was made")
+                    continue
+                if os.path.samefile(path, keeper):
+                    skipped.append(path)
+                    continue
+                if not dry_run:
+                    if group["action"] == "hardlink":
+                        _hardlink(keeper, path)
+                    else:
+                        os.remove(path)
+                done.append(path)
+                log_event(f"Dedup {group['action']}{' (dry run)' if dry_run else ''}: {path} -> {keeper}")
+            except OSError as e:
+                errors.append(path)
+                log_event(f"Dedup failed for {path}: {e}")
+    if done and not dry_run:
+        catalog = get_catalog()
+        deleted = [g for g in plan["groups"] if g["action"] == "delete"]
+        removed = set(done)
+        catalog.remove_paths(p for g in deleted for p in g["duplicates"] if p in removed)
+        # relinked paths now have the keeper's inode and mtime; the content (and so
+        # everything derived from it) is unchanged, so the keeper's analysis carries over
+        with catalog.transaction():
+            for group in plan["groups"]:
+                if group["action"] != "hardlink":
+                    continue
+                keeper = catalog.get_sample(group["keep"]) or {}
+                derived = {name: keeper[name] for name in DERIVED_FIELDS if keeper.get(name) is not None}
+                for path in group["duplicates"]:
+                    if path in removed:
+                        catalog.upsert_file(path, **derived)
+    return {"done": done, "skipped": skipped, "errors": errors}
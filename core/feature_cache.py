@@ -0,0 +1,135 @@
+# core/feature_cache.py
+
+"""
+SampleMindAI – Feature Cache
+Persistent, content-addressed cache for extracted audio features (core.features).
+
+Key: (content hash, feature name, feature version, parameters the feature uses).
+Because the key is the file's content hash (core.content_hash) rather than its
+path, a renamed or copied sample hits the cache too, and an edited one misses.
+
+- scalars and short lists (tempo, spectral stats, mfcc_means) go into the
+  catalog's `features` table
+- arrays (mfcc, chroma, onset_env) are written as .npy files under
+  CACHE_DIR/features/ and opened memory-mapped on load
+
+A changed feature version is part of the key, so stale entries are simply never
+hit; prune() removes them from disk and catalog.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.config import config
+from utils.logger import log_event
+from core.catalog import LibraryCatalog, get_catalog
+
+FEATURE_CACHE_DIR = os.path.join(config.CACHE_DIR, "features")
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Canonical JSON for a parameter dict (stable across runs and processes)."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class FeatureCache:
+    """Load and store feature values for one content hash at a time."""
+
+    def __init__(self, root: Optional[str] = None, catalog: Optional[LibraryCatalog] = None) -> None:
+        self.root = root or FEATURE_CACHE_DIR
+        self._catalog = catalog
+
+    @property
+    def catalog(self) -> LibraryCatalog:
+        # Resolved per call so a cache created before a fork uses the worker's own connection
+        return self._catalog or get_catalog()
+
+    def _content_dir(self, digest: str) -> str:
+        name = digest.replace(":", "_")
+        return os.path.join(self.root, name[-2:], name)
+
+    def array_path(self, digest: str, name: str, version: int, params: str) -> str:
+        params_id = hashlib.blake2b(params.encode("utf-8"), digest_size=6).hexdigest()
+        return os.path.join(self._content_dir(digest), f"{name}-v{version}-{params_id}.npy")
+
+    def load(self, digest: str, keys: Dict[str, Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return {name: value} for the cached entries among `keys` ({name: (version, params)}).
+        Arrays come back as read-only memory maps.
+        """
+        wanted = {name: (name, version, params_key(params)) for name, (version, params) in keys.items()}
+        scalars = self.catalog.cached_features(digest, wanted.values())
+        result: Dict[str, Any] = {}
+        for name, key in wanted.items():
+            if key in scalars:
+                result[name] = scalars[key]
+                continue
+            path = self.array_path(digest, *key)
+            if os.path.exists(path):
+                try:
+                    result[name] = np.load(path, mmap_mode="r")
+                except (OSError, ValueError) as e:
+                    log_event(f"Feature cache: unreadable {path}: {e}")
+        return result
+
+    def store(self, digest: str, entries: Dict[str, Tuple[int, Dict[str, Any], Any]]) -> None:
+        """Store {name: (version, params, value)}; arrays to .npy files, everything else to the catalog."""
+        scalars = []
+        for name, (version, params, value) in entries.items():
+            key = (name, version, params_key(params))
+            if isinstance(value, np.ndarray):
+                path = self.array_path(digest, *key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                try:
+                    with open(tmp, "wb") as f:
+                        np.save(f, np.ascontiguousarray(value))
+                    os.replace(tmp, path)  # atomic: concurrent workers never see half a file
+                except OSError as e:
+                    log_event(f"Feature cache: cannot write {path}: {e}")
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+            else:
+                scalars.append((*key, value))
+        self.catalog.save_features(digest, scalars)
+
+    def prune(self, versions: Dict[str, int]) -> int:
+        """Remove entries whose feature version differs from `versions` ({name: current version})."""
+        removed = self.catalog.prune_features(versions)
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    name, _, rest = filename.partition("-v")
+                    version = rest.split("-", 1)[0]
+                    if name in versions and version != str(versions[name]):
+                        os.remove(os.path.join(dirpath, filename))
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Drop every cached array (catalog values are kept; they are small)."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+_cache: Optional[FeatureCache] = None
+
+
+def get_feature_cache() -> FeatureCache:
+    """Shared cache for this process."""
+    global _cache
+    if _cache is None:
+        _cache = FeatureCache()
+    return _cache
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    from core.features import FEATURE_NAMES, node_version
+
+    removed = get_feature_cache().prune({name: node_version(name) for name in FEATURE_NAMES})
+    print(f"Removed {removed} stale feature cache entries from {FEATURE_CACHE_DIR}")
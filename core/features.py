@@ -0,0 +1,351 @@
+# core/features.py
+
+"""
+SampleMindAI – Feature Graph
+Declarative audio feature extraction: tools ask for feature names, the graph
+decodes the file once and derives everything from shared intermediates.
+
+    extractor = FeatureExtractor(["spectral_centroid", "rms", "tempo"])
+    features = extractor.extract("kick.wav")   # {"spectral_centroid": ..., ...}
+
+Intermediates (each computed at most once per file):
+    y, sr -> stft (magnitude, n_fft/hop) -> power -> mel (cached mel basis)
+    -> log_mel -> mfcc / onset_env
+Every spectral feature reads the same magnitude STFT instead of running its own,
+and the mel filterbank is built once per (sr, n_fft, n_mels) for the process.
+
+Parameters (sr, n_fft, hop_length, n_mels, n_mfcc) are fixed per extractor, so
+an extractor is picklable and can be handed to core.batch_executor as-is.
+
+Results are cached per file content (core.feature_cache): each feature is keyed
+by its name, effective version and only the parameters it depends on, so a rerun
+or another tool asking for the same feature skips decoding entirely. Bump a
+node's entry in VERSIONS when its computation changes; everything derived from
+it is recomputed on next use.
+
+Uncompressed WAV at its native rate is read through core.pcm_reader (a
+memory-mapped view converted once to float32) instead of librosa.load.
+
+Long recordings can use StreamingExtractor instead: it reads fixed-size blocks
+(memory-mapped WAV or librosa.stream) and accumulates duration, RMS, zero-crossings and MFCC
+statistics, so memory stays bounded regardless of file length.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import librosa
+import scipy.fft
+
+from core.content_hash import content_hash
+from core.feature_cache import get_feature_cache
+from core.pcm_reader import open_pcm
+
+DEFAULT_PARAMS: Dict[str, Any] = {
+    "sr": None,          # None keeps the file's native rate
+    "n_fft": 2048,
+    "hop_length": 512,
+    "n_mels": 128,
+    "n_mfcc": 20,
+}
+
+
+@lru_cache(maxsize=16)
+def mel_basis(sr: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Mel filterbank, built once per (sr, n_fft, n_mels) and reused for every file."""
+    return librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+
+
+# ---------------------------------------------------------------- graph nodes
+# name -> (dependencies, fn(params, *dependency_values))
+
+def _stft(p, y):
+    return np.abs(librosa.stft(y, n_fft=p["n_fft"], hop_length=p["hop_length"]))
+
+
+def _mel(p, power, sr):
+    return mel_basis(sr, p["n_fft"], p["n_mels"]) @ power
+
+
+def _mfcc(p, log_mel):
+    return librosa.feature.mfcc(S=log_mel, n_mfcc=p["n_mfcc"])
+
+
+def _onset_env(p, log_mel, sr):
+    # median aggregation, as librosa.beat.beat_track uses when given y
+    return librosa.onset.onset_strength(S=log_mel, sr=sr, hop_length=p["hop_length"], aggregate=np.median)
+
+
+def _tempo(p, onset_env, sr):
+    tempo, _ = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=p["hop_length"])
+    return float(np.atleast_1d(tempo)[0])
+
+
+def _spectral(func):
+    def node(p, stft, sr):
+        return float(func(S=stft, sr=sr, n_fft=p["n_fft"], hop_length=p["hop_length"]).mean())
+    return node
+
+
+def _dominant_pitch(p, stft, sr):
+    pitches, _ = librosa.piptrack(S=stft, sr=sr, n_fft=p["n_fft"], hop_length=p["hop_length"])
+    return float(np.max(pitches)) if pitches.size else 0.0
+
+
+NODES: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {
+    # intermediates
+    "stft": (("y",), _stft),
+    "power": (("stft",), lambda p, stft: stft ** 2),
+    "mel": (("power", "sr"), _mel),
+    "log_mel": (("mel",), lambda p, mel: librosa.power_to_db(mel)),
+    "mfcc": (("log_mel",), _mfcc),
+    "onset_env": (("log_mel", "sr"), _onset_env),
+    "chroma": (("power", "sr"), lambda p, power, sr: librosa.feature.chroma_stft(S=power, sr=sr, n_fft=p["n_fft"])),
+    # scalar / vector features
+    "duration": (("y", "sr"), lambda p, y, sr: float(len(y) / sr) if sr else 0.0),
+    "sample_rate": (("sr",), lambda p, sr: int(sr)),
+    "rms": (("y",), lambda p, y: float(librosa.feature.rms(
+        y=y, frame_length=p["n_fft"], hop_length=p["hop_length"]).mean())),
+    "zero_crossings": (("y",), lambda p, y: int(librosa.zero_crossings(y).sum())),
+    "zero_crossing_rate": (("y",), lambda p, y: float(librosa.feature.zero_crossing_rate(
+        y, frame_length=p["n_fft"], hop_length=p["hop_length"]).mean())),
+    "spectral_centroid": (("stft", "sr"), _spectral(librosa.feature.spectral_centroid)),
+    "spectral_bandwidth": (("stft", "sr"), _spectral(librosa.feature.spectral_bandwidth)),
+    "spectral_rolloff": (("stft", "sr"), _spectral(librosa.feature.spectral_rolloff)),
+    "dominant_pitch": (("stft", "sr"), _dominant_pitch),
+    "mfcc_mean": (("mfcc",), lambda p, mfcc: float(mfcc.mean())),
+    "mfcc_means": (("mfcc",), lambda p, mfcc: np.mean(mfcc, axis=1).tolist()),
+    "chroma_means": (("chroma",), lambda p, chroma: np.mean(chroma, axis=1).tolist()),
+    "tempo": (("onset_env", "sr"), _tempo),
+}
+
+SOURCES = ("y", "sr")
+FEATURE_NAMES = tuple(name for name in NODES if name not in SOURCES)
+
+# Node -> parameters it reads directly (the cache key uses the transitive set)
+NODE_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "y": ("sr",),
+    "sr": ("sr",),
+    "stft": ("n_fft", "hop_length"),
+    "mel": ("n_mels",),
+    "mfcc": ("n_mfcc",),
+    "onset_env": ("hop_length",),
+    "chroma": ("n_fft",),
+    "rms": ("n_fft", "hop_length"),
+    "zero_crossing_rate": ("n_fft", "hop_length"),
+    "tempo": ("hop_length",),
+}
+
+# Node -> version; bump when a node's output changes (default 1)
+VERSIONS: Dict[str, int] = {"rms": 2, "onset_env": 2}
+
+# Too large to be worth caching on disk; always recomputed from the decode
+UNCACHED = ("stft", "power", "mel")
+
+
+def _closure(name: str) -> List[str]:
+    """`name` and every node it depends on."""
+    seen: List[str] = []
+    stack = [name]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.append(node)
+        stack.extend(NODES[node][0] if node in NODES else ())
+    return seen
+
+
+def node_version(name: str) -> int:
+    """Effective version: sum over the node and its dependencies, so any bump invalidates dependents."""
+    return sum(VERSIONS.get(node, 1) for node in _closure(name))
+
+
+def node_params(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """The subset of `params` that can affect `name`."""
+    used = {param for node in _closure(name) for param in NODE_PARAMS.get(node, ())}
+    return {key: params[key] for key in sorted(used)}
+
+
+def load_mono(path: str, sr: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """Mono float32 signal: mapped PCM WAV when no resampling is needed, else librosa.load."""
+    if sr is None:
+        wave = open_pcm(path)
+        if wave is not None:
+            return wave.read_mono(), wave.sample_rate
+    return librosa.load(path, sr=sr, mono=True)
+
+
+class FeatureExtractor:
+    """
+    Compute a fixed set of named features per file from one decode and one STFT.
+    Unknown names raise ValueError when the extractor is built, not per file.
+    """
+
+    def __init__(self, features: Iterable[str], cache: bool = True, **params: Any):
+        self.features: List[str] = list(features)
+        unknown = [name for name in self.features if name not in NODES]
+        if unknown:
+            raise ValueError(f"Unknown feature(s): {', '.join(unknown)} (known: {', '.join(FEATURE_NAMES)})")
+        bad = set(params) - set(DEFAULT_PARAMS)
+        if bad:
+            raise ValueError(f"Unknown feature parameter(s): {', '.join(sorted(bad))}")
+        self.params: Dict[str, Any] = {**DEFAULT_PARAMS, **params}
+        self.cache = cache
+
+    def cache_keys(self) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+        """{feature: (version, params)} for the requested features that are cached."""
+        return {
+            name: (node_version(name), node_params(name, self.params))
+            for name in self.features if name not in UNCACHED
+        }
+
+    def extract(self, path: str) -> Dict[str, Any]:
+        """
+        Return {feature: value} for the requested features. Cached values are
+        reused; otherwise `path` is decoded once (mono) and the misses are stored.
+        """
+        digest = None
+        cached: Dict[str, Any] = {}
+        keys = self.cache_keys() if self.cache else {}
+        if keys:
+            digest = content_hash(path)
+            if digest:
+                cached = get_feature_cache().load(digest, keys)
+                if all(name in cached for name in self.features):
+                    return {name: cached[name] for name in self.features}
+
+        y, sr = load_mono(path, self.params["sr"])
+        result = self.extract_signal(y, sr, known=cached)
+        if digest:
+            fresh = {name: (*keys[name], result[name]) for name in keys if name not in cached}
+            get_feature_cache().store(digest, fresh)
+        return result
+
+    def extract_signal(self, y: np.ndarray, sr: int, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Same as extract() for an already decoded mono signal (not cached); `known` seeds precomputed nodes."""
+        values: Dict[str, Any] = {**(known or {}), "y": y, "sr": sr}
+
+        def resolve(name: str) -> Any:
+            if name not in values:
+                deps, fn = NODES[name]
+                values[name] = fn(self.params, *(resolve(dep) for dep in deps))
+            return values[name]
+
+        return {name: resolve(name) for name in self.features}
+
+
+def extract_features(path: str, features: Iterable[str], **params: Any) -> Dict[str, Any]:
+    """One-off convenience wrapper: FeatureExtractor(features, **params).extract(path)."""
+    return FeatureExtractor(features, **params).extract(path)
+
+
+# ---------------------------------------------------------------- streaming
+
+STREAMING_FEATURES = ("duration", "sample_rate", "rms", "zero_crossings", "mfcc_mean")
+STREAM_BLOCK_FRAMES = 256          # STFT frames per block (~3 s at 44.1 kHz / hop 512)
+TOP_DB = 80.0                      # librosa.power_to_db default floor below the peak
+DB_MIN, DB_MAX, DB_STEP = -100.0, 100.0, 0.1   # log-mel histogram used to apply that floor
+
+
+class StreamingExtractor:
+    """
+    Block-wise variant of FeatureExtractor for STREAMING_FEATURES, at the file's
+    native sample rate. Results match a full decode within tolerance: STFT frames
+    are taken without edge padding, and the 80 dB log-mel floor (relative to the
+    file's peak, unknown until the end) is applied from a 0.1 dB histogram.
+    """
+
+    def __init__(self, features: Iterable[str], block_frames: int = STREAM_BLOCK_FRAMES,
+                 cache: bool = True, **params: Any):
+        self.features: List[str] = list(features)
+        unknown = [name for name in self.features if name not in STREAMING_FEATURES]
+        if unknown:
+            raise ValueError(f"Feature(s) not available in streaming mode: {', '.join(unknown)}")
+        self.params: Dict[str, Any] = {**DEFAULT_PARAMS, **params}
+        if self.params["sr"] is not None:
+            raise ValueError("Streaming mode reads at the native sample rate (sr must be None)")
+        self.block_frames = block_frames
+        self.cache = cache
+
+    def cache_keys(self) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+        # Kept apart from full-decode entries: the values differ slightly
+        return {
+            name: (node_version(name), {**node_params(name, self.params), "streaming": True})
+            for name in self.features
+        }
+
+    def extract(self, path: str) -> Dict[str, Any]:
+        digest = content_hash(path) if self.cache else None
+        keys = self.cache_keys()
+        if digest:
+            cached = get_feature_cache().load(digest, keys)
+            if len(cached) == len(keys):
+                return {name: cached[name] for name in self.features}
+        result = self._stream(path)
+        result = {name: result[name] for name in self.features}
+        if digest:
+            get_feature_cache().store(digest, {name: (*keys[name], result[name]) for name in self.features})
+        return result
+
+    def _stream(self, path: str) -> Dict[str, Any]:
+        n_fft, hop, n_mels = self.params["n_fft"], self.params["hop_length"], self.params["n_mels"]
+        overlap = n_fft - hop
+        wave = open_pcm(path)
+        if wave is not None:
+            sr = wave.sample_rate
+            blocks = wave.blocks(n_fft + (self.block_frames - 1) * hop, overlap=overlap)
+        else:
+            sr = librosa.get_samplerate(path)
+            blocks = librosa.stream(path, block_length=self.block_frames, frame_length=n_fft,
+                                    hop_length=hop, mono=True, fill_value=None)
+        basis = mel_basis(sr, n_fft, n_mels)
+        n_bins = int(round((DB_MAX - DB_MIN) / DB_STEP))
+
+        samples = crossings = frames = 0
+        rms_sum = 0.0
+        previous = None
+        band_sum = np.zeros(n_mels)
+        hist = np.zeros(n_mels * n_bins, dtype=np.int64)
+        peak_db = -np.inf
+        for index, block in enumerate(blocks):
+            new = block if index == 0 else block[overlap:]
+            samples += len(new)
+            if len(new):
+                if previous is None:
+                    crossings += 1  # librosa.zero_crossings pads the first sample as a crossing
+                    segment = new
+                else:
+                    segment = np.concatenate(([previous], new))
+                crossings += int(librosa.zero_crossings(segment, pad=False).sum())
+                previous = new[-1]
+            if len(block) < n_fft:
+                continue
+            mag = np.abs(librosa.stft(block, n_fft=n_fft, hop_length=hop, center=False))
+            rms_sum += float(librosa.feature.rms(y=block, frame_length=n_fft, hop_length=hop, center=False).sum())
+            frames += mag.shape[1]
+            log_mel = librosa.power_to_db(basis @ mag ** 2, top_db=None)
+            band_sum += log_mel.sum(axis=1)
+            peak_db = max(peak_db, float(log_mel.max()))
+            bins = np.clip(((log_mel - DB_MIN) / DB_STEP).astype(np.int64), 0, n_bins - 1)
+            hist += np.bincount((bins + np.arange(n_mels)[:, None] * n_bins).ravel(), minlength=hist.size)
+
+        result: Dict[str, Any] = {
+            "duration": float(samples / sr) if sr else 0.0,
+            "sample_rate": int(sr),
+            "rms": rms_sum / frames if frames else 0.0,
+            "zero_crossings": crossings,
+            "mfcc_mean": None,
+        }
+        if frames:
+            # mean(max(x, floor)) per band = (sum - sum below floor + count below floor * floor) / frames
+            floor = peak_db - TOP_DB
+            centers = DB_MIN + (np.arange(n_bins) + 0.5) * DB_STEP
+            below = centers < floor
+            counts = hist.reshape(n_mels, n_bins)[:, below]
+            band_mean = (band_sum - counts @ centers[below] + counts.sum(axis=1) * floor) / frames
+            # the DCT is linear, so the mean MFCC is the DCT of the mean log-mel frame
+            mfcc = scipy.fft.dct(band_mean, type=2, norm="ortho")[: self.params["n_mfcc"]]
+            result["mfcc_mean"] = float(mfcc.mean())
+        return result
@@ -0,0 +1,293 @@
+# core/fingerprint.py
+
+"""
+SampleMindAI – Audio Fingerprinting
+Perceptual fingerprints for near-duplicate detection: finds the same sample
+re-exported at another bit depth or sample rate, normalized, or converted to MP3,
+which byte hashing (core.dedup) cannot see.
+
+Pipeline per file (computed once, stored in the catalog):
+    mono 11.025 kHz -> log-magnitude STFT (0–2.7 kHz) -> spectral peaks
+    -> landmark hashes (f1, f2 - f1, dt) -> MinHash signature (60 values)
+A locality-sensitive index of 20 bands x 3 rows puts files whose landmark sets
+overlap in shared buckets, so near-duplicates are found without comparing every
+pair of files. Candidates are verified by signature similarity (Jaccard estimate).
+
+Batch mode runs on the shared batch executor; incremental mode only fingerprints
+files the catalog reports as new or changed (fingerprint_version is a derived
+column) or fingerprinted by an older FINGERPRINT_VERSION.
+"""
+
+import hashlib
+import os
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import librosa
+
+from utils.logger import log_event
+from core.batch_executor import run_batch
+from core.catalog import LibraryCatalog, get_catalog
+from core.library_scanner import files_to_analyze
+
+FINGERPRINT_VERSION = 1
+
+SAMPLE_RATE = 11025
+MAX_SECONDS = 60.0
+N_FFT = 1024
+HOP = 512
+MAX_BIN = 256              # ~2.7 kHz: survives MP3 low-pass and resampling
+PEAK_FREQ_RADIUS = 8       # local-maximum neighbourhood (bins)
+PEAK_TIME_RADIUS = 4       # local-maximum neighbourhood (frames)
+PEAKS_PER_FRAME = 5
+PEAK_FLOOR_DB = 60.0       # ignore peaks this far below the loudest one
+FAN_OUT = 5
+MAX_DT = 31                # frames between landmark anchor and target
+MIN_LANDMARKS = 10         # fewer than this (silence, clicks) is not indexed
+
+NUM_PERM = 60
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240611)
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+DEFAULT_THRESHOLD = 0.4
+
+
+# ---------------------------------------------------------------- landmarks
+
+def _spectrogram(y: np.ndarray) -> np.ndarray:
+    """Log-magnitude spectrogram (frames x MAX_BIN), normalized so gain does not matter."""
+    if len(y) < N_FFT:
+        y = np.pad(y, (0, N_FFT - len(y)))
+    frames = np.lib.stride_tricks.sliding_window_view(y, N_FFT)[::HOP]
+    spec = np.abs(np.fft.rfft(frames * np.hanning(N_FFT), axis=1))[:, 1:MAX_BIN + 1]
+    return 20.0 * np.log10(spec / (spec.max() + 1e-12) + 1e-9)
+
+
+def _rolling_max(a: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (radius, radius)
+    padded = np.pad(a, pad, mode="constant", constant_values=-np.inf)
+    return np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=axis).max(axis=-1)
+
+
+def find_peaks(spec: np.ndarray) -> List[Tuple[int, int]]:
+    """Spectral peaks (frame, bin): local maxima above the floor, strongest few per frame."""
+    local_max = _rolling_max(_rolling_max(spec, PEAK_FREQ_RADIUS, 1), PEAK_TIME_RADIUS, 0)
+    mask = (spec == local_max) & (spec > -PEAK_FLOOR_DB)
+    peaks: List[Tuple[int, int]] = []
+    for t in np.flatnonzero(mask.any(axis=1)):
+        bins = np.flatnonzero(mask[t])
+        if len(bins) > PEAKS_PER_FRAME:
+            bins = bins[np.argsort(spec[t, bins])[-PEAKS_PER_FRAME:]]
+        peaks.extend((int(t), int(f)) for f in sorted(bins))
+    return peaks
+
+
+def landmark_hashes(peaks: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Pair each peak with the next FAN_OUT peaks within MAX_DT frames and hash
+    (f1, f2 - f1, dt) into 18 bits. Frequencies are quantized to 2 bins so a
+    one-bin shift from lossy coding still matches. Offset-invariant by construction.
+    """
+    hashes = set()
+    for i, (t1, f1) in enumerate(peaks):
+        paired = 0
+        for j in range(i + 1, len(peaks)):
+            t2, f2 = peaks[j]
+            dt = t2 - t1
+            if dt > MAX_DT:
+                break
+            if dt < 1:
+                continue
+            q1, dq = f1 >> 1, (f2 >> 1) - (f1 >> 1)
+            if -32 <= dq < 32:
+                hashes.add((q1 << 11) | ((dq + 32) << 5) | dt)
+                paired += 1
+                if paired >= FAN_OUT:
+                    break
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    """MinHash signature of a landmark set (NUM_PERM uint32 values)."""
+    if not len(hashes):
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    values = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def lsh_buckets(signature: np.ndarray) -> List[Tuple[int, int]]:
+    """(band, bucket) keys: one stable 63-bit hash per band of ROWS signature values."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two landmark sets."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def compute_fingerprint(path: str) -> Optional[Tuple[str, int, bytes]]:
+    """
+    Fingerprint one file: returns (path, landmark count, signature bytes), or None
+    if the file cannot be decoded. Top-level so it can run in a process pool.
+    """
+    try:
+        y, _ = librosa.load(path, sr=SAMPLE_RATE, mono=True, duration=MAX_SECONDS)
+    except Exception as e:
+        log_event(f"Fingerprint: cannot decode {path}: {e}")
+        return None
+    hashes = landmark_hashes(find_peaks(_spectrogram(np.asarray(y, dtype=np.float32))))
+    return path, int(len(hashes)), minhash(hashes).tobytes()
+
+
+# ---------------------------------------------------------------- batch / incremental
+
+def fingerprint_files(
+    paths: List[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+    batch_size: int = 200,
+) -> int:
+    """
+    Fingerprint `paths` with run_batch (config.WORKERS processes by default) and
+    store the results in the catalog in batches, so an interrupted run keeps what
+    it finished. Returns the count stored.
+    """
+    catalog = catalog or get_catalog()
+    stored = 0
+
+    def _store(results: List[Optional[Tuple[str, int, bytes]]]) -> int:
+        entries = []
+        for result in results:
+            if result is None:
+                continue
+            path, landmarks, signature = result
+            buckets = lsh_buckets(np.frombuffer(signature, dtype=np.uint32)) if landmarks >= MIN_LANDMARKS else []
+            entries.append((path, landmarks, signature, buckets))
+        catalog.save_fingerprints(entries, FINGERPRINT_VERSION)
+        return len(entries)
+
+    pending: List[Optional[Tuple[str, int, bytes]]] = []
+    for _, result in run_batch(compute_fingerprint, paths, workers=workers, chunksize=8, description="Fingerprinting"):
+        pending.append(result)
+        if len(pending) >= batch_size:
+            stored += _store(pending)
+            pending = []
+    stored += _store(pending)
+    log_event(f"Fingerprinted {stored} of {len(paths)} file(s)")
+    return stored
+
+
+def fingerprint_folder(
+    folder: str,
+    incremental: bool = True,
+    workers: Optional[int] = None,
+    supported_exts: Optional[List[str]] = None,
+) -> int:
+    """Fingerprint a folder: only new/changed or outdated files when incremental, else everything."""
+    paths = files_to_analyze(folder, supported_exts, "fingerprint_version", incremental, current=FINGERPRINT_VERSION)
+    return fingerprint_files(paths, workers=workers)
+
+
+# ---------------------------------------------------------------- queries
+
+def _signatures(rows: Iterable[Any]) -> Dict[int, Tuple[str, np.ndarray]]:
+    return {
+        row["sample_id"]: (row["path"], np.frombuffer(row["signature"], dtype=np.uint32))
+        for row in rows
+        if row["landmarks"] >= MIN_LANDMARKS
+    }
+
+
+def find_near_duplicates(
+    folder: Optional[str] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    max_bucket: int = 500,
+    catalog: Optional[LibraryCatalog] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Group near-duplicate samples below `folder` using the LSH buckets.
+    Only pairs sharing a bucket are compared; buckets with more than `max_bucket`
+    members (e.g. generic one-shots) are skipped. Returns groups sorted by size:
+    [{"paths": [...], "similarity": min pairwise score}].
+    """
+    catalog = catalog or get_catalog()
+    signatures = _signatures(catalog.fingerprint_rows(folder))
+    pairs = set()
+    current, members = None, []
+    for row in chain(catalog.fingerprint_buckets(folder), [None]):
+        key = (row["band"], row["bucket"]) if row is not None else None
+        if key != current:
+            if 1 < len(members) <= max_bucket:
+                members.sort()
+                pairs.update((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+            current, members = key, []
+        if row is not None and row["sample_id"] in signatures:
+            members.append(row["sample_id"])
+
+    # Union-find over verified pairs
+    parent: Dict[int, int] = {}
+
+    def root(x: int) -> int:
+        while parent.get(x, x) != x:
+            x = parent[x]
+        return x
+
+    scores: Dict[Tuple[int, int], float] = {}
+    for a, b in pairs:
+        score = similarity(signatures[a][1], signatures[b][1])
+        if score >= threshold:
+            scores[(a, b)] = score
+            parent[root(a)] = root(b)
+
+    groups: Dict[int, List[int]] = {}
+    for sample_id in {x for pair in scores for x in pair}:
+        groups.setdefault(root(sample_id), []).append(sample_id)
+    result = []
+    for ids in groups.values():
+        ids_set = set(ids)
+        group_scores = [s for (a, b), s in scores.items() if a in ids_set]
+        result.append({
+            "paths": sorted(signatures[i][0] for i in ids),
+            "similarity": round(min(group_scores), 3),
+        })
+    result.sort(key=lambda g: (-len(g["paths"]), g["paths"][0]))
+    log_event(f"Near-duplicate scan: {len(pairs)} candidate pair(s), {len(result)} group(s)")
+    return result
+
+
+def similar_to(
+    path: str,
+    threshold: float = DEFAULT_THRESHOLD,
+    catalog: Optional[LibraryCatalog] = None,
+) -> List[Tuple[str, float]]:
+    """Library samples that are near-duplicates of `path` (fingerprinted on demand)."""
+    catalog = catalog or get_catalog()
+    path = os.path.abspath(path)
+    sample = catalog.get_sample(path)
+    if not sample or sample.get("fingerprint_version") != FINGERPRINT_VERSION:
+        fingerprint_files([path], workers=1, catalog=catalog)
+    rows = catalog.fingerprint_rows(sample_ids=[catalog.sample_id(path)])
+    own = _signatures(rows)
+    if not own:
+        return []
+    signature = next(iter(own.values()))[1]
+    candidates = catalog.fingerprint_bucket_members(lsh_buckets(signature))
+    matches = []
+    for sample_id, (other, other_sig) in _signatures(catalog.fingerprint_rows(sample_ids=candidates)).items():
+        if other == path:
+            continue
+        score = similarity(signature, other_sig)
+        if score >= threshold:
+            matches.append((other, round(score, 3)))
+    return sorted(matches, key=lambda m: -m[1])
@@ -0,0 +1,81 @@
+# core/http_client.py
+
+"""
+SampleMindAI – HTTP Client
+Shared keep-alive HTTP sessions for the model backends (Hermes/Ollama, OpenAI).
+Instead of a new TCP (and TLS) connection per prompt, every call in a process
+goes through one requests.Session with a pooled HTTPAdapter, so batch tagging
+runs reuse warm connections.
+
+- pool size: config.HTTP_POOL_SIZE connections per host (enough for the
+  thread pools in core.batch_executor)
+- timeouts: separate connect and read timeouts (config.HTTP_CONNECT_TIMEOUT,
+  config.HTTP_READ_TIMEOUT); a dead server fails fast, a slow model may still
+  take its time to answer
+- retries: connection errors, 429 and 5xx answers are retried
+  config.HTTP_RETRIES times with exponential backoff (config.HTTP_BACKOFF),
+  honouring Retry-After; read timeouts are not retried, so a slow model is
+  never sent the same (expensive) request twice
+
+Usage:
+    from core.http_client import get_session, timeouts
+    response = get_session().post(url, json=payload, timeout=timeouts())
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config import config
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def timeouts(read: Optional[float] = None) -> Tuple[float, float]:
+    """(connect, read) timeout pair for requests; `read` overrides the configured read timeout."""
+    return config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT if read is None else read
+
+
+def make_session(pool_size: Optional[int] = None, retries: Optional[int] = None) -> requests.Session:
+    """New session with a pooled, retrying adapter mounted for http:// and https://."""
+    pool_size = pool_size or config.HTTP_POOL_SIZE
+    retries = config.HTTP_RETRIES if retries is None else retries
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        # a read timeout means the server may already be generating: re-raise it, never re-send
+        read=False,
+        other=0,
+        status=retries,
+        backoff_factor=config.HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        # POST is only retried when it never reached the model or was refused (429/5xx)
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Shared session for this process (worker processes forked from a pool get
+    their own, so no connection is ever shared across processes).
+    """
+    pid = os.getpid()
+    with _sessions_lock:
+        if pid not in _sessions:
+            _sessions[pid] = make_session()
+        return _sessions[pid]
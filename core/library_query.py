@@ -0,0 +1,138 @@
+# core/library_query.py
+
+"""
+SampleMindAI – Library Query Planner
+Answers combined searches such as "loops 118–124 BPM in A minor shorter than 8 s
+tagged genre:techno" from the in-memory tag and range indexes, without opening
+any sidecar JSON.
+
+Plan: the tag query and folder give a candidate bitmap (cheap big-int ops).
+Range and key predicates are ordered by their exact match counts (two bisects
+each). While the candidate set is smaller than the next predicate's match count,
+candidates are checked one by one against the column values; otherwise the
+predicate's bitmap is built and ANDed in.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.catalog import get_catalog
+from core.range_index import NUMERIC_COLUMNS, get_range_index
+from core.tag_index import bitmap_from_positions, get_tag_index, iter_positions
+
+Range = Tuple[Optional[float], Optional[float]]
+
+_RANGE_RE = re.compile(r"^\s*([<>]=?)?\s*(-?\d+(?:\.\d+)?)\s*(?:(?:-|–|\.\.)\s*(-?\d+(?:\.\d+)?))?\s*$")
+
+
+def parse_range(text: Optional[str]) -> Optional[Range]:
+    """
+    Parse a CLI range: "118-124", "118..124", "<8", ">=120", "128" (exact).
+    Returns (low, high) with None for an open end, or None for blank input.
+    """
+    if not text or not str(text).strip():
+        return None
+    m = _RANGE_RE.match(str(text))
+    if not m:
+        raise ValueError(f"Invalid range '{text}' (use e.g. 118-124, <8, >=120)")
+    op, first, second = m.group(1), float(m.group(2)), m.group(3)
+    if second is not None:
+        low, high = first, float(second)
+        return (min(low, high), max(low, high))
+    if op in ("<", "<="):
+        return (None, first)
+    if op in (">", ">="):
+        return (first, None)
+    return (first, first)
+
+
+def _indexes():
+    """Tag and range indexes built from the same catalog generation."""
+    catalog = get_catalog()
+    tags = get_tag_index(catalog)
+    ranges = get_range_index(catalog)
+    if tags.generation != ranges.generation:
+        # A write landed between the two loads; rebuild both at the current generation
+        tags = get_tag_index(catalog)
+        ranges = get_range_index(catalog)
+    return tags, ranges
+
+
+def search(
+    query: str = "",
+    folder: Optional[str] = None,
+    ranges: Optional[Dict[str, Range]] = None,
+    key: Optional[str] = None,
+    compatible: bool = False,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Search the library catalog.
+
+    query:      tag expression (see core.tag_index.parse_query), "" for everything
+    folder:     restrict to files below this folder
+    ranges:     {column: (low, high)} over NUMERIC_COLUMNS, inclusive, None = open end
+    key:        key name or Camelot code ("A minor", "Am", "8A")
+    compatible: also match harmonically compatible keys (Camelot neighbours)
+    order_by:   NUMERIC_COLUMNS name to sort by ("-quality_score" for descending);
+                samples without a value for it are left out
+
+    Returns {"total", "paths", "plan"}; plan lists the steps taken with their counts.
+    """
+    tags, index = _indexes()
+    plan: List[str] = []
+
+    candidates = tags.folder_mask(folder)
+    if query.strip():
+        candidates &= tags.query(query)
+    plan.append(f"tags/folder -> {candidates.bit_count()}")
+
+    predicates = []
+    for column, bounds in (ranges or {}).items():
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown range column '{column}' (expected one of {', '.join(NUMERIC_COLUMNS)})")
+        if bounds is None or bounds == (None, None):
+            continue
+        low, high = bounds
+        predicates.append((index.estimate(column, low, high), "range", column, low, high))
+    if key:
+        codes = index.key_codes(key, compatible)
+        if not codes:
+            raise ValueError(f"Unknown key '{key}'")
+        predicates.append((index.estimate_key(codes), "key", codes, None, None))
+    predicates.sort(key=lambda p: p[0])
+
+    for estimate, kind, target, low, high in predicates:
+        if not candidates:
+            break
+        label = f"{target}[{low},{high}]" if kind == "range" else f"key in {','.join(target)}"
+        remaining = candidates.bit_count()
+        if remaining < estimate:
+            if kind == "range":
+                kept = [p for p in iter_positions(candidates) if index.accepts(target, p, low, high)]
+            else:
+                kept_codes = set(target)
+                kept = [p for p in iter_positions(candidates) if index.camelot_at(p) in kept_codes]
+            candidates = bitmap_from_positions(kept, len(tags))
+            plan.append(f"check {label} on {remaining} candidates -> {len(kept)}")
+        else:
+            bitmap = index.range(target, low, high) if kind == "range" else index.key(key, compatible)
+            candidates &= bitmap
+            plan.append(f"index {label} ({estimate} matches) -> {candidates.bit_count()}")
+
+    if order_by:
+        column = order_by.lstrip("-")
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown sort column '{column}' (expected one of {', '.join(NUMERIC_COLUMNS)})")
+        positions = index.ordered(column, candidates, descending=order_by.startswith("-"), limit=limit)
+        plan.append(f"order by {order_by} -> {len(positions)}")
+        paths = [tags.paths[pos] for pos in positions]
+    else:
+        paths = tags.to_paths(candidates, limit=limit)
+
+    return {
+        "total": candidates.bit_count(),
+        "paths": paths,
+        "plan": plan,
+    }
@@ -0,0 +1,190 @@
+# core/library_scanner.py
+
+"""
+SampleMindAI – Incremental Library Scanner
+Keeps the library catalog in sync with the file system without re-processing
+the whole library on every run.
+
+A directory-level manifest of (inode, size, mtime_ns) is stored in the catalog.
+A directory's mtime only changes when entries are added, removed or renamed,
+so directories whose manifest key is unchanged are skipped entirely (their
+known files and subdirectories are taken from the catalog). Only changed
+directories are listed, and only their added/changed/deleted files are reported
+to downstream analyzers.
+
+Note: a file rewritten in place (same name, no rename) does not touch its
+directory's mtime. Pass full=True to re-stat every file when that matters.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from utils.config import config
+from utils.logger import log_event
+from utils.file_utils import find_all_audio_files
+from core.catalog import get_catalog
+
+
+def _dir_key(st: os.stat_result) -> tuple:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _file_changed(row: Any, st: os.stat_result) -> bool:
+    return (row["size"], row["mtime_ns"], row["inode"]) != (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def scan_folder(
+    catalog: Any,
+    folder: str,
+    supported_exts: Optional[List[str]] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Incrementally sync `folder` into `catalog`.
+
+    The catalog always tracks every extension in config.SUPPORTED_EXTENSIONS so the
+    manifest stays valid for all callers; `supported_exts` only filters the report.
+
+    Returns a report dict:
+        added / changed / deleted: sorted lists of file paths
+        unchanged: number of known files left untouched
+        sidecars: number of .json sidecars (re)imported
+        dirs_scanned / dirs_skipped: directories listed vs. skipped via the manifest
+        summary: counts only, for logging
+    """
+    folder = os.path.abspath(folder)
+    tracked = frozenset(ext.lower() for ext in config.SUPPORTED_EXTENSIONS)
+    exts = config.SUPPORTED_EXTENSIONS if supported_exts is None else supported_exts
+    wanted = frozenset(ext.lower() for ext in exts)
+
+    manifest = catalog.load_directory_manifest(folder)
+    known = catalog.file_states(folder)
+
+    # Index the previous state by directory so skipped directories cost one stat each
+    children: Dict[str, List[str]] = {}
+    for path in manifest:
+        if path != folder:
+            children.setdefault(os.path.dirname(path), []).append(path)
+    known_by_dir: Dict[str, List[str]] = {}
+    for path in known:
+        known_by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+    added: List[str] = []
+    changed: List[str] = []
+    seen = set()
+    new_manifest: Dict[str, tuple] = {}
+    unchanged = sidecars = dirs_scanned = dirs_skipped = 0
+
+    with catalog.transaction():
+        stack = [folder]
+        while stack:
+            directory = stack.pop()
+            try:
+                key = _dir_key(os.stat(directory))
+            except OSError:
+                continue
+            new_manifest[directory] = key
+
+            if not full and manifest.get(directory) == key:
+                dirs_skipped += 1
+                stack.extend(children.get(directory, ()))
+                for path in known_by_dir.get(directory, ()):
+                    seen.add(path)
+                    unchanged += 1
+                continue
+
+            dirs_scanned += 1
+            audio_entries = []
+            sidecar_mtimes: Dict[str, int] = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                        except OSError:
+                            continue
+                        stem, ext = os.path.splitext(entry.path)
+                        ext = ext.lower()
+                        if ext in tracked:
+                            audio_entries.append(entry)
+                        elif ext == ".json":
+                            try:
+                                sidecar_mtimes[stem] = entry.stat().st_mtime_ns
+                            except OSError:
+                                pass
+            except OSError as e:
+                log_event(f"Scanner: cannot list {directory}: {e}")
+                continue
+
+            for entry in audio_entries:
+                path = entry.path
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                seen.add(path)
+                row = known.get(path)
+                if row is None:
+                    catalog.upsert_file(path, st)
+                    added.append(path)
+                elif _file_changed(row, st):
+                    catalog.upsert_file(path, st)
+                    changed.append(path)
+                else:
+                    unchanged += 1
+                sc_mtime = sidecar_mtimes.get(os.path.splitext(path)[0])
+                if sc_mtime is not None and (row is None or row["sidecar_mtime_ns"] != sc_mtime):
+                    if catalog.import_sidecar(path):
+                        sidecars += 1
+
+        deleted = sorted(p for p in known if p not in seen)
+        if deleted:
+            catalog.remove_paths(deleted)
+        catalog.save_directory_manifest(folder, new_manifest)
+
+    def _report(paths: List[str]) -> List[str]:
+        return sorted(p for p in paths if os.path.splitext(p)[1].lower() in wanted)
+
+    report: Dict[str, Any] = {
+        "added": _report(added),
+        "changed": _report(changed),
+        "deleted": _report(deleted),
+        "unchanged": unchanged,
+        "sidecars": sidecars,
+        "dirs_scanned": dirs_scanned,
+        "dirs_skipped": dirs_skipped,
+    }
+    report["summary"] = {k: len(v) if isinstance(v, list) else v for k, v in report.items()}
+    log_event(f"Incremental scan {folder}: {report['summary']}")
+    return report
+
+
+def pending_files(report: Dict[str, Any]) -> List[str]:
+    """Files a downstream analyzer needs to (re)process after a scan: added + changed."""
+    return sorted(set(report["added"]) | set(report["changed"]))
+
+
+def files_to_analyze(
+    folder: str,
+    supported_exts: List[str],
+    column: str,
+    incremental: bool = True,
+    current: Any = None,
+) -> List[str]:
+    """
+    Work list for an analyzer that stores its result in catalog `column`.
+    Full mode returns every matching file; incremental mode scans the folder and
+    returns only files that are new, changed (derived columns are reset), were
+    never analyzed or, with `current`, were analyzed by another version.
+    """
+    if not incremental:
+        return find_all_audio_files(folder, supported_exts)
+    catalog = get_catalog()
+    report = catalog.sync_folder(folder, supported_exts)
+    if report["deleted"]:
+        log_event(f"{len(report['deleted'])} file(s) removed from {folder} since last scan")
+    return catalog.paths_missing(folder, column, supported_exts, current)
@@ -0,0 +1,162 @@
+# core/llm_cache.py
+
+"""
+SampleMindAI – LLM Response Cache
+Persistent cache for model answers (core.llm_client.query_hermes,
+utils.openai_utils.query_openai). The tagging prompts are deterministic
+templates, so rerunning a pass over an unchanged library is answered from here
+without a single model call.
+
+Key: SHA-256 of (backend, model, system prompt, prompt, options). Entries live
+in a small SQLite database (config.LLM_CACHE_PATH) with least-recently-used
+eviction above config.LLM_CACHE_MAX_ENTRIES and an optional time-to-live
+(config.LLM_CACHE_TTL seconds, 0 = keep until evicted). Error answers are never
+stored. Disable with SAMPLEMIND_LLM_CACHE=0 or `--no-cache` on the CLI, or per
+call with use_cache=False.
+
+Usage:
+    from core.llm_cache import cache_key, get_llm_cache
+    cache = get_llm_cache()
+    key = cache_key("hermes", "hermes-samplemind", system, prompt)
+    answer = cache.get(key)
+    if answer is None:
+        answer = ask_the_model()
+        cache.put(key, answer)
+    cache.stats()    # {"hits": 12, "misses": 3, "entries": 845, ...}
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.config import config
+from utils.logger import log_event
+
+COUNTERS = ("hits", "misses", "stores", "evictions", "expired")
+
+
+def cache_key(backend: str, model: str, system: Optional[str], prompt: str,
+              options: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for one request; any change to model, prompts or options is a different entry."""
+    request = [backend, model, system or "", prompt, options or {}]
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)  # default: non-JSON option values
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def cache_enabled(use_cache: Optional[bool] = None) -> bool:
+    """Per-call override, else the global switch (config.LLM_CACHE)."""
+    return config.LLM_CACHE if use_cache is None else use_cache
+
+
+class LLMCache:
+    """SQLite-backed LRU cache of model answers; safe to share between threads."""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None) -> None:
+        self.db_path = db_path or config.LLM_CACHE_PATH
+        self.max_entries = config.LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl = config.LLM_CACHE_TTL if ttl is None else ttl
+        self.session = dict.fromkeys(COUNTERS, 0)   # counters of this process only
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, backend TEXT, model TEXT, response TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn.executemany("INSERT OR IGNORE INTO counters VALUES (?, 0)", [(name,) for name in COUNTERS])
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        self.session[name] += amount
+        self._conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached answer for `key`, or None (missing or expired). A hit refreshes the entry's LRU position."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count("expired")
+                row = None
+            if row is None:
+                self._count("misses")
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._count("hits")
+            return row[0]
+
+    def put(self, key: str, response: str, backend: str = "", model: str = "") -> None:
+        """Store an answer, evicting the least recently used entries above max_entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, backend, model, response, now, now))
+            self._count("stores")
+            if self.max_entries:
+                excess = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed LIMIT ?)", (excess,)
+                    )
+                    self._count("evictions", excess)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lifetime counters, this process's counters ("session") and the current entry count."""
+        with self._lock:
+            totals = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        return {
+            **{name: totals.get(name, 0) for name in COUNTERS},
+            "hit_rate": totals.get("hits", 0) / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "session": dict(self.session),
+        }
+
+    def clear(self) -> int:
+        """Drop every cached answer (counters are kept). Returns the number removed."""
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM responses").rowcount
+        log_event(f"LLM cache: cleared {removed} entries")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[tuple, LLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Shared cache for this process (one connection per process, like core.catalog)."""
+    key = (os.getpid(), config.LLM_CACHE_PATH)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = LLMCache(key[1])
+        return _caches[key]
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    import sys
+
+    cache = get_llm_cache()
+    if "--clear" in sys.argv[1:]:
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
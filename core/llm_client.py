@@ -4,25 +4,38 @@ from utils.config import config
 import requests
 from rich.console import Console
 from typing import Optional, Generator
+from core.http_client import get_session, timeouts
+from core.llm_cache import cache_enabled, cache_key, get_llm_cache
 
 console = Console()
 
 OLLAMA_ENDPOINT = "http://localhost:11434/api/generate"
 MODEL_NAME = "hermes-samplemind"
 
-def query_hermes(prompt: str, system: Optional[str] = None, stream: bool = False) -> str:
+def query_hermes(prompt: str, system: Optional[str] = None, stream: bool = False,
+                 use_cache: Optional[bool] = None) -> str:
     """
     Send a prompt to the locally running Hermes model via Ollama.
+    Answers are cached (core.llm_cache); use_cache=False forces a fresh one.
     """
+    cached = cache_enabled(use_cache)
+    key = cache_key("hermes", MODEL_NAME, system, prompt, {"stream": stream})
+    if cached:
+        answer = get_llm_cache().get(key)
+        if answer is not None:
+            return answer
     headers = {"Content-Type": "application/json"}
     payload = {"model": MODEL_NAME, "prompt": prompt, "stream": stream}
     if system:
         payload["system"] = system
     try:
-        response = requests.post(OLLAMA_ENDPOINT, json=payload, headers=headers, timeout=30)
+        response = get_session().post(OLLAMA_ENDPOINT, json=payload, headers=headers, timeout=timeouts())
         response.raise_for_status()
         data = response.json()
-        return data.get("response", "").strip()
+        answer = data.get("response", "").strip()
+        if cached and answer:
+            get_llm_cache().put(key, answer, "hermes", MODEL_NAME)
+        return answer
     except requests.exceptions.Timeout:
         console.print("[bold red]⚠️ Timeout Error:[/bold red] The request timed out.")
         return "Timeout Error"
@@ -42,7 +55,8 @@ def query_hermes_stream(prompt: str, system: Optional[str] = None) -> Generator[
     if system:
         payload["system"] = system
     try:
-        with requests.post(OLLAMA_ENDPOINT, json=payload, headers=headers, stream=True, timeout=30) as response:
+        with get_session().post(OLLAMA_ENDPOINT, json=payload, headers=headers, stream=True,
+                                timeout=timeouts()) as response:
             response.raise_for_status()
             for i, line in enumerate(response.iter_lines()):
                 if i > 100:
@@ -80,12 +94,12 @@ if __name__ == "__main__":
 import pytest
 from unittest.mock import patch
 
-@patch("requests.post")
+@patch("requests.Session.post")
 def test_query_hermes_with_mock(mock_post):
     mock_post.return_value.json.return_value = {"response": "SampleMind is a tool for AI navigation."}
     mock_post.return_value.status_code = 200
     prompt = "What is SampleMind?"
-    response = query_hermes(prompt)
+    response = query_hermes(prompt, use_cache=False)
     assert response == "SampleMind is a tool for AI navigation."
 
 def test_query_hermes_with_system():
@@ -0,0 +1,143 @@
+# core/pcm_reader.py
+
+"""
+SampleMindAI – PCM WAV Reader
+Zero-copy access to uncompressed WAV files: the RIFF `data` chunk is mapped
+with np.memmap as a (frames, channels) view of the stored integers/floats, and
+only the frames a caller asks for are converted to float32.
+
+    wave = open_pcm(path)              # None for non-PCM files -> use librosa
+    if wave is not None:
+        y = wave.read_mono()           # float32, same scaling as librosa/soundfile
+        for block in wave.blocks(65536):
+            ...                        # bounded memory, converted lazily
+        raw = wave.raw_bytes(start, stop)   # memoryview for slicing/writing
+
+Supports 8/16/24/32-bit integer PCM and 32/64-bit float, including
+WAVE_FORMAT_EXTENSIBLE. 24-bit data has no numpy dtype, so it is mapped as
+bytes and widened per block.
+"""
+
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+
+from core.audio_probe import wav_layout
+
+PCM_FORMAT = 1
+FLOAT_FORMAT = 3
+
+# (format_tag, bits) -> (stored dtype, scale to [-1, 1), offset)
+_DTYPES = {
+    (PCM_FORMAT, 8): (np.uint8, 1 / 128.0, -128),
+    (PCM_FORMAT, 16): (np.dtype("<i2"), 1 / 32768.0, 0),
+    (PCM_FORMAT, 24): (np.uint8, 1 / 2147483648.0, 0),  # widened to int32 << 8 first
+    (PCM_FORMAT, 32): (np.dtype("<i4"), 1 / 2147483648.0, 0),
+    (FLOAT_FORMAT, 32): (np.dtype("<f4"), 1.0, 0),
+    (FLOAT_FORMAT, 64): (np.dtype("<f8"), 1.0, 0),
+}
+
+
+class PCMWave:
+    """Memory-mapped view of one PCM/float WAV file."""
+
+    def __init__(self, path: str, layout: dict) -> None:
+        self.path = path
+        self.format_tag: int = layout["format_tag"]
+        self.bits: int = layout["bits"]
+        self.sample_rate: int = layout["sample_rate"]
+        self.channels: int = layout["channels"]
+        self.sample_width: int = (self.bits + 7) // 8
+        self.data_offset: int = layout["data_offset"]
+        self.frame_count: int = layout["data_size"] // (self.sample_width * self.channels)
+        self._dtype, self._scale, self._offset = _DTYPES[(self.format_tag, self.bits)]
+        if self.frame_count:
+            shape = (self.frame_count, self.channels, 3) if self.bits == 24 else (self.frame_count, self.channels)
+            self.raw: np.ndarray = np.memmap(path, dtype=self._dtype, mode="r", offset=self.data_offset, shape=shape)
+        else:
+            self.raw = np.zeros((0, self.channels), dtype=self._dtype)
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def _to_float(self, raw: np.ndarray) -> np.ndarray:
+        if self.bits == 24:
+            # little-endian 3-byte samples -> top 24 bits of an int32 (sign comes for free)
+            wide = (raw[..., 0].astype(np.int32) << 8) | (raw[..., 1].astype(np.int32) << 16) \
+                | (raw[..., 2].astype(np.int32) << 24)
+            return wide.astype(np.float32) * np.float32(self._scale)
+        if self.format_tag == FLOAT_FORMAT:
+            return raw.astype(np.float32)
+        if self._offset:
+            return (raw.astype(np.float32) + np.float32(self._offset)) * np.float32(self._scale)
+        return raw.astype(np.float32) * np.float32(self._scale)
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Frames [start, stop) as float32, shape (frames, channels). Only that range is converted."""
+        return self._to_float(self.raw[start:stop])
+
+    def read_mono(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Frames [start, stop) mixed to mono float32 (channel mean, like librosa.to_mono)."""
+        block = self.read(start, stop)
+        return block[:, 0].copy() if self.channels == 1 else block.mean(axis=1, dtype=np.float32)
+
+    def blocks(self, block_frames: int, overlap: int = 0, mono: bool = True) -> Iterator[np.ndarray]:
+        """Yield consecutive float32 blocks of `block_frames` (the last may be shorter), overlapping by `overlap`."""
+        step = max(1, block_frames - overlap)
+        read = self.read_mono if mono else self.read
+        for start in range(0, max(self.frame_count - overlap, 1), step):
+            block = read(start, min(start + block_frames, self.frame_count))
+            if len(block):
+                yield block
+
+    def raw_bytes(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """The stored bytes of frames [start, stop), without conversion or copy."""
+        stop = self.frame_count if stop is None else min(stop, self.frame_count)
+        if stop <= start:
+            return memoryview(b"")  # also covers an empty data chunk (frame_count == 0)
+        flat = self.raw.reshape(self.frame_count, -1).view(np.uint8)
+        return memoryview(flat[start:stop]).cast("B")
+
+    def write_segment(self, out_path: str, start: int = 0, stop: Optional[int] = None) -> int:
+        """Write frames [start, stop) to a new WAV with the same format. Returns frames written."""
+        data = self.raw_bytes(start, stop)
+        block_align = self.sample_width * self.channels
+        with open(out_path, "wb") as f:
+            write_wav_header(f, len(data), self.format_tag, self.channels, self.sample_rate, self.bits)
+            f.write(data)
+            if len(data) & 1:
+                f.write(b"\0")  # RIFF chunks are word-aligned; the header already counts the pad byte
+        return len(data) // block_align if block_align else 0
+
+
+def write_wav_header(f: BinaryIO, data_size: int, format_tag: int, channels: int, sample_rate: int, bits: int) -> None:
+    """Canonical 44-byte RIFF/WAVE header for `data_size` bytes of interleaved samples."""
+    block_align = channels * ((bits + 7) // 8)
+    f.write(b"RIFF" + struct.pack("<I", 36 + data_size + (data_size & 1)) + b"WAVE")
+    f.write(b"fmt " + struct.pack("<IHHIIHH", 16, format_tag, channels, sample_rate, sample_rate * block_align,
+                                  block_align, bits))
+    f.write(b"data" + struct.pack("<I", data_size))
+
+
+def open_pcm(path: str) -> Optional[PCMWave]:
+    """Map `path` if it is an uncompressed WAV this reader supports, else None."""
+    if not path.lower().endswith((".wav", ".wave")):
+        return None
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(12)
+            if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+                return None
+            layout = wav_layout(f, size)
+    except (OSError, struct.error):
+        return None
+    if layout is None or (layout["format_tag"], layout["bits"]) not in _DTYPES or not layout["channels"]:
+        return None
+    try:
+        return PCMWave(path, layout)
+    except (OSError, ValueError):
+        return None
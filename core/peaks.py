@@ -0,0 +1,211 @@
+# core/peaks.py
+
+"""
+SampleMindAI – Waveform Peak Pyramid
+Precomputed min/max/RMS envelopes at several zoom levels, so waveform displays
+(CLI renderer, GUI viewer, API, thumbnails) never decode the source audio again.
+
+Built in one streaming pass over the mono signal (memory-mapped for PCM WAV,
+soundfile blocks otherwise): the finest level has one bucket per 256 samples and
+each coarser level (1024, 4096, 16384) is reduced from it. Values are stored as
+int16 (full scale = 32767) in CACHE_DIR/peaks/, keyed by content hash, so a
+moved or copied file reuses its pyramid.
+
+Usage:
+    from core.peaks import get_peaks
+    pyramid = get_peaks(path)
+    mins, maxs, rms = pyramid.view(0, pyramid.frame_count, width=800)
+    data = waveform_envelope(path, start, stop, width)   # JSON-ready, for GUI/API
+"""
+
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from utils.config import config
+from utils.logger import log_event
+from core.content_hash import content_hash
+from core.pcm_reader import open_pcm
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+PEAKS_VERSION = 1
+LEVELS = (256, 1024, 4096, 16384)          # samples per bucket, finest first
+BLOCK_BUCKETS = 1024                       # finest-level buckets per read block
+PEAKS_DIR = os.path.join(config.CACHE_DIR, "peaks")
+_FULL_SCALE = 32767.0
+
+
+class PeakPyramid:
+    """Min/max/RMS buckets per level: levels[spb] is an int16 array of shape (buckets, 3)."""
+
+    def __init__(self, sample_rate: int, frame_count: int, levels: Dict[int, np.ndarray]) -> None:
+        self.sample_rate = sample_rate
+        self.frame_count = frame_count
+        self.levels = levels
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def level_for(self, samples_per_pixel: float) -> int:
+        """Coarsest level that still has at least one bucket per pixel."""
+        usable = [spb for spb in self.levels if spb <= samples_per_pixel]
+        return max(usable) if usable else min(self.levels)
+
+    def view(self, start: int = 0, stop: Optional[int] = None, width: int = 1000) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Envelope of frames [start, stop) reduced to at most `width` columns:
+        (mins, maxs, rms) as float32 in [-1, 1].
+        """
+        stop = self.frame_count if stop is None else min(stop, self.frame_count)
+        start = max(0, min(start, stop))
+        width = max(1, width)
+        spb = self.level_for((stop - start) / float(width))
+        data = self.levels[spb]
+        first, last = start // spb, min(len(data), -(-stop // spb))
+        buckets = data[first:last].astype(np.float32) / _FULL_SCALE
+        if len(buckets) <= width:
+            return buckets[:, 0], buckets[:, 1], buckets[:, 2]
+        edges = np.linspace(0, len(buckets), width + 1).astype(np.int64)[:-1]
+        counts = np.diff(np.append(edges, len(buckets)))
+        mins = np.minimum.reduceat(buckets[:, 0], edges)
+        maxs = np.maximum.reduceat(buckets[:, 1], edges)
+        rms = np.sqrt(np.add.reduceat(buckets[:, 2] ** 2, edges) / counts)
+        return mins, maxs, rms.astype(np.float32)
+
+
+# ---------------------------------------------------------------- building
+
+def _mono_blocks(path: str, block_frames: int) -> Tuple[int, Iterator[np.ndarray]]:
+    """(sample_rate, iterator of mono float32 blocks)."""
+    wave = open_pcm(path)
+    if wave is not None:
+        return wave.sample_rate, wave.blocks(block_frames)
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("soundfile is required for non-WAV peak files")
+    info = sf.info(path)
+
+    def _blocks() -> Iterator[np.ndarray]:
+        for block in sf.blocks(path, blocksize=block_frames, dtype="float32", always_2d=True):
+            yield block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+    return info.samplerate, _blocks()
+
+
+def _quantize(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(values * _FULL_SCALE), -32768, 32767).astype(np.int16)
+
+
+def build_peaks(path: str) -> PeakPyramid:
+    """Compute the pyramid for one file in a single streaming pass."""
+    base = LEVELS[0]
+    sample_rate, blocks = _mono_blocks(path, base * BLOCK_BUCKETS)
+    mins, maxs, power, counts = [], [], [], []
+    frames = 0
+    for block in blocks:
+        frames += len(block)
+        full = len(block) // base
+        if full:
+            grid = block[:full * base].reshape(full, base)
+            mins.append(grid.min(axis=1))
+            maxs.append(grid.max(axis=1))
+            power.append(np.mean(np.square(grid, dtype=np.float64), axis=1))
+            counts.append(np.full(full, base))
+        tail = block[full * base:]
+        if len(tail):  # only the last block can end mid-bucket
+            mins.append(tail.min(keepdims=True))
+            maxs.append(tail.max(keepdims=True))
+            power.append(np.mean(np.square(tail, dtype=np.float64), keepdims=True))
+            counts.append(np.array([len(tail)]))
+
+    if not frames:
+        empty = np.zeros((0, 3), dtype=np.int16)
+        return PeakPyramid(sample_rate, 0, {spb: empty for spb in LEVELS})
+    mins_0, maxs_0 = np.concatenate(mins), np.concatenate(maxs)
+    power_0, counts_0 = np.concatenate(power), np.concatenate(counts)
+
+    levels: Dict[int, np.ndarray] = {}
+    for spb in LEVELS:
+        step = spb // base
+        edges = np.arange(0, len(mins_0), step)
+        level_counts = np.add.reduceat(counts_0, edges)
+        level_rms = np.sqrt(np.add.reduceat(power_0 * counts_0, edges) / level_counts)
+        levels[spb] = np.stack([
+            _quantize(np.minimum.reduceat(mins_0, edges)),
+            _quantize(np.maximum.reduceat(maxs_0, edges)),
+            _quantize(level_rms),
+        ], axis=1)
+    return PeakPyramid(sample_rate, frames, levels)
+
+
+# ---------------------------------------------------------------- cache
+
+def peaks_path(digest: str) -> str:
+    return os.path.join(PEAKS_DIR, f"{digest.replace(':', '_')}-v{PEAKS_VERSION}.npz")
+
+
+def load_peaks(cache_file: str) -> Optional[PeakPyramid]:
+    try:
+        with np.load(cache_file) as data:
+            levels = {spb: data[f"l{spb}"] for spb in LEVELS}
+            return PeakPyramid(int(data["sample_rate"]), int(data["frame_count"]), levels)
+    except (OSError, KeyError, ValueError) as e:
+        log_event(f"Peaks: unreadable cache {cache_file}: {e}")
+        return None
+
+
+def save_peaks(cache_file: str, pyramid: PeakPyramid) -> None:
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, sample_rate=pyramid.sample_rate, frame_count=pyramid.frame_count,
+                     **{f"l{spb}": data for spb, data in pyramid.levels.items()})
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        log_event(f"Peaks: cannot write {cache_file}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def get_peaks(path: str, rebuild: bool = False) -> Optional[PeakPyramid]:
+    """Cached peak pyramid for `path` (built on first use), or None if it cannot be read."""
+    digest = content_hash(path)
+    cache_file = peaks_path(digest) if digest else None
+    if cache_file and not rebuild and os.path.exists(cache_file):
+        pyramid = load_peaks(cache_file)
+        if pyramid is not None:
+            return pyramid
+    try:
+        pyramid = build_peaks(path)
+    except Exception as e:
+        log_event(f"Peaks: cannot build for {path}: {e}")
+        return None
+    if cache_file:
+        save_peaks(cache_file, pyramid)
+    return pyramid
+
+
+def waveform_envelope(path: str, start: int = 0, stop: Optional[int] = None, width: int = 800) -> Optional[Dict[str, Any]]:
+    """JSON-ready min/max/RMS columns for frames [start, stop) of `path`, or None if unreadable."""
+    pyramid = get_peaks(path)
+    if pyramid is None:
+        return None
+    stop = pyramid.frame_count if stop is None else min(stop, pyramid.frame_count)
+    mins, maxs, rms = pyramid.view(start, stop, width)
+    return {
+        "path": path,
+        "sample_rate": pyramid.sample_rate,
+        "frame_count": pyramid.frame_count,
+        "start": start,
+        "stop": stop,
+        "min": mins.tolist(),
+        "max": maxs.tolist(),
+        "rms": rms.tolist(),
+    }
@@ -0,0 +1,268 @@
+# core/quality.py
+
+"""
+SampleMindAI – Quality Scoring
+Signal-based quality metrics from one streaming pass per file, turned into a
+0-100 score for triaging imports:
+
+- clipping ratio: frames in runs of two or more at full scale
+- DC offset: absolute channel mean
+- noise floor: quiet-end (5th percentile) RMS of the 2048-frame windows whose
+  level holds steady for +-0.25 s, so decaying one-shots and reverb tails are
+  not mistaken for noise; only judged when the file has quiet passages (20 dB
+  below its loud end), so dense loops are not either
+- effective bandwidth: the steepest drop of the averaged spectrum when it is a
+  brick wall (30 dB within 1 kHz: lossy transcodes, upsampled audio), else the
+  highest frequency within 70 dB of the spectral peak
+- silence ratio: windows below -60 dBFS
+- truncation: signal already loud in the last 2 ms, or in the first 2 ms
+  without decaying over the next 100 ms (a transient-first drum is an onset,
+  not a cut)
+
+The same pass feeds core.loudness, so loudness columns are filled for free.
+Metrics are cached per file content (core.feature_cache) and the score is
+stored in the catalog `quality_score` column for instant filtering/sorting
+(core.range_index / core.library_query).
+
+Usage:
+    from core.quality import analyze_quality, measure_quality, quality_score
+    metrics = measure_quality("snare.wav")
+    quality_score(metrics)               # 87.5
+    analyze_quality(paths, workers=8)    # batch + catalog
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.logger import log_event
+from core.batch_executor import run_batch
+from core.catalog import LibraryCatalog, get_catalog
+from core.content_hash import content_hash
+from core.feature_cache import get_feature_cache
+from core.loudness import LoudnessMeter, iter_blocks, loudness_columns
+
+QUALITY_NAME = "quality_metrics"
+QUALITY_VERSION = 2
+WINDOW = 2048
+CLIP_LEVEL = 0.999
+SILENCE_DB = -60.0
+EDGE_SEC = 0.002
+TRUNCATION_DB = -24.0
+ONSET_SEC = 0.05               # a loud start must fade by ONSET_DROP_DB over [ONSET_SEC, 2 * ONSET_SEC)
+ONSET_DROP_DB = 2.0
+BANDWIDTH_DB = -70.0           # relative to the spectral peak
+BRICK_WALL_DB = 30.0           # drop within BRICK_WALL_HZ that marks a hard low-pass
+BRICK_WALL_HZ = 1000.0
+MIN_CUTOFF_HZ = 2000.0
+FLOOR_DB = -120.0
+NOISE_SPAN_DB = 20.0           # loud end minus quiet end needed before the quiet end counts as noise floor
+STEADY_SEC = 0.25              # a noise-floor window must hold its level within STEADY_DB for this long each way
+STEADY_DB = 3.0
+
+
+def _db(power: np.ndarray) -> np.ndarray:
+    return 10.0 * np.log10(np.maximum(power, 10.0 ** (FLOOR_DB / 10.0)))
+
+
+def _rms_db(signal: np.ndarray) -> float:
+    if not len(signal):
+        return FLOOR_DB
+    return float(_db(np.array([np.mean(np.square(signal, dtype=np.float64))]))[0])
+
+
+def _steady(window_db: np.ndarray, radius: int) -> np.ndarray:
+    """Windows whose neighbours within `radius` stay within STEADY_DB of each other."""
+    if not len(window_db):
+        return np.zeros(0, dtype=bool)
+    padded = np.pad(window_db, radius, mode="edge")
+    spans = sliding_window_view(padded, 2 * radius + 1)
+    return spans.max(axis=1) - spans.min(axis=1) <= STEADY_DB
+
+
+class QualityMeter:
+    """Streaming quality metrics; feed (frames, channels) float blocks in order."""
+
+    def __init__(self, sample_rate: int, channels: int) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_count = 0
+        self.clipped = 0
+        self._was_clipped = False
+        self._sums = np.zeros(channels)
+        self._window = np.hanning(WINDOW).astype(np.float32)
+        self._spectrum = np.zeros(WINDOW // 2 + 1)
+        self._window_power: List[np.ndarray] = []
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._edge = max(1, int(EDGE_SEC * sample_rate))
+        self._onset = max(self._edge, int(ONSET_SEC * sample_rate))
+        self._head = np.zeros(0, dtype=np.float32)          # the opening 2 * ONSET_SEC
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def process(self, block: np.ndarray) -> None:
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block[:, None]
+        if not len(block):
+            return
+        self.frame_count += len(block)
+        over = np.abs(block).max(axis=1) >= CLIP_LEVEL
+        # a frame counts when its neighbour is also at full scale (single peaks are not clipping)
+        previous = np.concatenate(([self._was_clipped], over[:-1]))
+        following = np.concatenate((over[1:], [False]))
+        self.clipped += int(np.count_nonzero(over & (previous | following)))
+        self._was_clipped = bool(over[-1])
+        self._sums += block.sum(axis=0, dtype=np.float64)
+
+        mono = block[:, 0] if self.channels == 1 else block.mean(axis=1)
+        if len(self._head) < 2 * self._onset:
+            self._head = np.concatenate([self._head, mono[:2 * self._onset - len(self._head)]])
+        self._tail = np.concatenate([self._tail, mono])[-self._edge:]
+
+        signal = np.concatenate([self._pending, mono]) if len(self._pending) else mono
+        full = len(signal) // WINDOW
+        if full:
+            frames = signal[:full * WINDOW].reshape(full, WINDOW)
+            self._window_power.append(np.mean(np.square(frames, dtype=np.float64), axis=1))
+            self._spectrum += np.square(np.abs(np.fft.rfft(frames * self._window, axis=1))).sum(axis=0)
+        self._pending = signal[full * WINDOW:]
+
+    def _bandwidth(self) -> Dict[str, Any]:
+        nyquist = self.sample_rate / 2.0
+        if not self._spectrum.any():
+            return {"bandwidth_hz": 0.0, "bandwidth_limited": False}
+        spectrum = _db(self._spectrum)
+        spectrum -= spectrum.max()
+        hz_per_bin = nyquist / (len(spectrum) - 1)
+        half = max(1, int(BRICK_WALL_HZ / hz_per_bin / 2))
+        smooth = np.convolve(spectrum, np.ones(5) / 5, mode="same")
+        drop = smooth[:-2 * half] - smooth[2 * half:]          # level change across each 1 kHz span
+        first = int(MIN_CUTOFF_HZ / hz_per_bin)
+        if len(drop) > first:
+            wall = first + int(np.argmax(drop[first:]))
+            if drop[wall] > BRICK_WALL_DB:
+                return {"bandwidth_hz": (wall + half) * hz_per_bin, "bandwidth_limited": True}
+        cutoff = int(np.flatnonzero(spectrum > BANDWIDTH_DB)[-1])
+        return {"bandwidth_hz": cutoff * hz_per_bin, "bandwidth_limited": False}
+
+    def metrics(self) -> Dict[str, Any]:
+        frames = max(1, self.frame_count)
+        power = np.concatenate(self._window_power) if self._window_power else np.zeros(0)
+        if len(self._pending) and not len(power):
+            power = np.array([np.mean(np.square(self._pending, dtype=np.float64))])
+        window_db = _db(power)
+        sounding = window_db > FLOOR_DB
+        # noise is steady: decays and swells are not a floor, whatever their level
+        radius = max(1, int(round(STEADY_SEC * self.sample_rate / WINDOW)))
+        noise = window_db[sounding & _steady(window_db, radius)]
+        noise_floor = float(np.percentile(noise, 5)) if len(noise) else FLOOR_DB
+        head_db = _rms_db(self._head[:self._edge])
+        return {
+            "sample_rate": self.sample_rate,
+            "frame_count": self.frame_count,
+            "clipping_ratio": self.clipped / frames,
+            "dc_offset": float(np.abs(self._sums / frames).max()) if self.channels else 0.0,
+            "noise_floor_db": noise_floor,
+            "dynamic_span_db": float(np.percentile(window_db[sounding], 95)) - noise_floor if len(noise) else 0.0,
+            "silence_ratio": float(np.mean(window_db < SILENCE_DB)) if len(window_db) else 1.0,
+            "head_db": head_db,
+            "head_drop_db": head_db - _rms_db(self._head[self._onset:]),
+            "tail_db": _rms_db(self._tail),
+            **self._bandwidth(),
+        }
+
+
+def quality_score(metrics: Dict[str, Any]) -> float:
+    """0-100 score from quality metrics; 100 means no problem was found."""
+    return round(max(0.0, 100.0 - sum(penalty for _, penalty in quality_issues(metrics))), 1)
+
+
+def quality_issues(metrics: Dict[str, Any]) -> List[tuple]:
+    """[(description, penalty points), ...] for every problem found in `metrics`."""
+    issues = []
+    if metrics["frame_count"] == 0 or metrics["silence_ratio"] >= 1.0:
+        return [("silent or empty", 100.0)]
+    if metrics["clipping_ratio"] > 0:
+        issues.append((f"clipping ({metrics['clipping_ratio']:.2%} of frames)",
+                       min(40.0, metrics["clipping_ratio"] * 4000.0)))
+    if metrics["dc_offset"] > 0.01:
+        issues.append((f"DC offset ({metrics['dc_offset']:.3f})", min(10.0, metrics["dc_offset"] * 200.0)))
+    if metrics["noise_floor_db"] > -60.0 and metrics["dynamic_span_db"] >= NOISE_SPAN_DB:
+        issues.append((f"noise floor {metrics['noise_floor_db']:.0f} dBFS",
+                       min(15.0, (metrics["noise_floor_db"] + 60.0) * 0.5)))
+    reference = min(metrics["sample_rate"] / 2.0, 20000.0)
+    if metrics["bandwidth_limited"] and metrics["bandwidth_hz"] < 0.9 * reference:
+        issues.append((f"band-limited at {metrics['bandwidth_hz'] / 1000:.1f} kHz",
+                       min(20.0, (1.0 - metrics["bandwidth_hz"] / reference) * 50.0)))
+    if metrics["silence_ratio"] > 0.5:
+        issues.append((f"{metrics['silence_ratio']:.0%} silence", min(10.0, (metrics["silence_ratio"] - 0.5) * 20.0)))
+    # a loud start that decays right away is a transient (drum hit), not a cut
+    if metrics["head_db"] > TRUNCATION_DB and metrics["head_drop_db"] < ONSET_DROP_DB:
+        issues.append(("cut off at the start", 5.0))
+    if metrics["tail_db"] > TRUNCATION_DB:
+        issues.append(("cut off at the end", 5.0))
+    return issues
+
+
+def measure_quality(path: str, cache: bool = True) -> Dict[str, Any]:
+    """
+    Quality metrics plus loudness stats (core.loudness) of one file, from a single
+    streaming pass. Cached by content hash.
+    """
+    digest = content_hash(path) if cache else None
+    if digest:
+        cached = get_feature_cache().load(digest, {QUALITY_NAME: (QUALITY_VERSION, {})})
+        if QUALITY_NAME in cached:
+            return cached[QUALITY_NAME]
+
+    sample_rate, channels, blocks = iter_blocks(path)
+    quality = QualityMeter(sample_rate, channels)
+    loudness = LoudnessMeter(sample_rate, channels, true_peak=True)
+    for block in blocks:
+        quality.process(block)
+        loudness.process(block)
+    result = {**quality.metrics(), "loudness": loudness.stats()}
+    if digest:
+        get_feature_cache().store(digest, {QUALITY_NAME: (QUALITY_VERSION, {}, result)})
+    return result
+
+
+def analyze_quality(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+    force: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Score `paths` on a process pool and store quality_score (and the loudness
+    columns measured in the same pass) in the catalog. Files that already have a
+    score (it is cleared when the file changes) are not re-read.
+    Returns {path: {"quality_score": ..., "issues": [...] or None when reused}}.
+    """
+    catalog = catalog or get_catalog()
+    paths = list(paths)
+    cached = {} if force else catalog.get_samples(paths, ("quality_score",))
+    result: Dict[str, Dict[str, Any]] = {}
+    todo: List[str] = []
+    for path in paths:
+        row = cached.get(os.path.abspath(path))
+        if row is not None and row["quality_score"] is not None:
+            result[path] = {"quality_score": row["quality_score"], "issues": None}
+        else:
+            todo.append(path)
+
+    reused = len(result)
+    measured = {
+        path: metrics
+        for path, metrics in run_batch(measure_quality, todo, workers=workers, description="Scoring quality")
+        if metrics is not None
+    }
+    with catalog.transaction():
+        for path, metrics in measured.items():
+            score = quality_score(metrics)
+            catalog.update_fields(path, {"quality_score": score, **loudness_columns(metrics["loudness"])})
+            result[path] = {"quality_score": score, "issues": [text for text, _ in quality_issues(metrics)]}
+    log_event(f"Quality: {len(measured)} scored, {reused} reused")
+    return result
@@ -0,0 +1,139 @@
+# core/range_index.py
+
+"""
+SampleMindAI – Range Index
+Sorted numeric column arrays (bpm, duration_sec, sample_rate, loudness_lufs,
+true_peak_db, loudness_range_lu, quality_score)
+plus a key/Camelot index, loaded from the library catalog.
+
+Samples use the same path-ordered positions as core.tag_index, so range and
+key matches come back as bitmaps that combine directly with tag predicates.
+Ranges are inclusive; samples with no value for a column never match it.
+"""
+
+import bisect
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.catalog import LibraryCatalog, get_catalog
+from core.tag_index import bitmap_from_positions, iter_positions
+from utils.music_keys import compatible_camelot, to_camelot
+
+# all of these must be in core.catalog.GENERATION_COLUMNS, or writes would not reload the index
+NUMERIC_COLUMNS = (
+    "bpm", "duration_sec", "sample_rate", "loudness_lufs", "true_peak_db", "loudness_range_lu", "quality_score",
+)
+
+
+class RangeIndex:
+    """Immutable snapshot of the numeric/key columns of the catalog."""
+
+    def __init__(self, size: int, columns: Dict[str, List[Optional[float]]], keys: List[Optional[str]],
+                 generation: int = 0, source: str = "") -> None:
+        self.size = size
+        self.generation = generation
+        self.source = source
+        # Per column: values by position (for candidate checks) and (sorted values, positions)
+        self._by_position = columns
+        self._sorted: Dict[str, Tuple[array, array]] = {}
+        for name, values in columns.items():
+            pairs = sorted((v, pos) for pos, v in enumerate(values) if v is not None)
+            self._sorted[name] = (array("d", (v for v, _ in pairs)), array("q", (p for _, p in pairs)))
+        self._keys = keys
+        self._camelot: Dict[str, List[int]] = {}
+        for pos, code in enumerate(keys):
+            if code:
+                self._camelot.setdefault(code, []).append(pos)
+
+    @classmethod
+    def from_catalog(cls, catalog: Optional[LibraryCatalog] = None) -> "RangeIndex":
+        catalog = catalog or get_catalog()
+        generation = catalog.generation()
+        rows = catalog.sample_rows(("id", "path", "key", *NUMERIC_COLUMNS))
+        columns = {
+            name: [float(row[name]) if row[name] is not None else None for row in rows]
+            for name in NUMERIC_COLUMNS
+        }
+        keys = [to_camelot(row["key"]) for row in rows]
+        return cls(len(rows), columns, keys, generation, catalog.db_path)
+
+    # ---------------------------------------------------------------- ranges
+
+    def _bounds(self, column: str, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        values, _ = self._sorted[column]
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        stop = len(values) if high is None else bisect.bisect_right(values, high)
+        return start, max(start, stop)
+
+    def estimate(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Exact number of samples in [low, high] for `column` (two bisects, no scan)."""
+        start, stop = self._bounds(column, low, high)
+        return stop - start
+
+    def positions(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> array:
+        start, stop = self._bounds(column, low, high)
+        return self._sorted[column][1][start:stop]
+
+    def range(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Bitmap of samples with low <= column <= high."""
+        return bitmap_from_positions(self.positions(column, low, high), self.size)
+
+    def ordered(self, column: str, bitmap: int, descending: bool = False, limit: Optional[int] = None) -> List[int]:
+        """Positions in `bitmap` sorted by `column` (walks the presorted array; unvalued samples are left out)."""
+        positions = self._sorted[column][1]
+        members = set(iter_positions(bitmap))  # one pass over the bitmap, not a big-int shift per position
+        result: List[int] = []
+        for pos in (reversed(positions) if descending else positions):
+            if pos in members:
+                result.append(pos)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def value(self, column: str, position: int) -> Optional[float]:
+        return self._by_position[column][position]
+
+    def accepts(self, column: str, position: int, low: Optional[float], high: Optional[float]) -> bool:
+        v = self._by_position[column][position]
+        return v is not None and (low is None or v >= low) and (high is None or v <= high)
+
+    # ---------------------------------------------------------------- keys
+
+    def key_codes(self, key: str, compatible: bool = False) -> List[str]:
+        """Camelot codes matched by a key name/code (plus neighbours if compatible)."""
+        if compatible:
+            return sorted(compatible_camelot(key))
+        code = to_camelot(key)
+        return [code] if code else []
+
+    def estimate_key(self, codes: Iterable[str]) -> int:
+        return sum(len(self._camelot.get(code, ())) for code in codes)
+
+    def key(self, key: str, compatible: bool = False) -> int:
+        """Bitmap of samples in `key` (or any harmonically compatible key)."""
+        positions: List[int] = []
+        for code in self.key_codes(key, compatible):
+            positions.extend(self._camelot.get(code, ()))
+        return bitmap_from_positions(positions, self.size)
+
+    def camelot_at(self, position: int) -> Optional[str]:
+        return self._keys[position]
+
+    def key_counts(self) -> Dict[str, int]:
+        """Camelot code -> number of samples."""
+        return {code: len(pos) for code, pos in sorted(self._camelot.items())}
+
+
+_index: Optional[RangeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_range_index(catalog: Optional[LibraryCatalog] = None) -> RangeIndex:
+    """Return the shared range index, rebuilt only when the catalog generation changed."""
+    global _index
+    catalog = catalog or get_catalog()
+    with _index_lock:
+        if _index is None or _index.source != catalog.db_path or _index.generation != catalog.generation():
+            _index = RangeIndex.from_catalog(catalog)
+        return _index
@@ -0,0 +1,311 @@
+# core/tag_index.py
+
+"""
+SampleMindAI – Inverted Tag Index
+In-memory inverted index from (field, normalized value) to a bitmap of samples,
+loaded from the library catalog. Supports AND/OR/NOT tag predicates and instant
+facet counts (genre -> count, mood -> count) for the CLI, GUI and API.
+
+Samples are numbered in path order, so "everything below folder X" is one
+contiguous bit range. Bitmaps are plain Python ints: AND/OR/NOT are single
+big-int operations and counts use int.bit_count().
+
+Query syntax (see `parse_query`):
+    genre:techno AND (mood:dark OR mood:"deep dub") NOT instrument:vocal
+Adjacent terms are ANDed; values are matched case-insensitively.
+"""
+
+import bisect
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.catalog import LibraryCatalog, folder_bounds, get_catalog, normalize_tag
+
+# Bit offsets set in each byte value, for fast bitmap -> positions decoding
+_BYTE_BITS: List[Tuple[int, ...]] = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|([A-Za-z_][\w\-]*):(?:"([^"]*)"|([^\s()]+))|([^\s()]+))')
+
+
+def bitmap_from_positions(positions: Iterable[int], size: int) -> int:
+    """Build a bitmap int from bit positions in O(n) (no repeated big-int shifts)."""
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_positions(bitmap: int) -> Iterator[int]:
+    """Yield the set bit positions of a bitmap in ascending order."""
+    if bitmap <= 0:
+        return
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def normalize_field(field: str) -> str:
+    """Field names match case-insensitively ("Genre:techno" == "genre:techno")."""
+    return str(field).strip().lower()
+
+
+class TagIndex:
+    """Immutable snapshot of the catalog's tags as bitmaps (rebuild via `from_catalog`)."""
+
+    def __init__(self, paths: List[str], ids: List[int], postings: Dict[Tuple[str, str], int],
+                 labels: Dict[Tuple[str, str], str], generation: int = 0, source: str = "") -> None:
+        self.paths = paths
+        self.ids = ids
+        self.postings = postings
+        self.labels = labels
+        self.generation = generation
+        self.source = source
+        self.universe = (1 << len(paths)) - 1
+        self._position = {sample_id: pos for pos, sample_id in enumerate(ids)}
+        self._fields: Dict[str, List[Tuple[str, str]]] = {}
+        for key in postings:
+            self._fields.setdefault(key[0], []).append(key)
+
+    @classmethod
+    def from_catalog(cls, catalog: Optional[LibraryCatalog] = None) -> "TagIndex":
+        """Load every sample and tag from the catalog into bitmaps."""
+        catalog = catalog or get_catalog()
+        generation = catalog.generation()
+        rows = catalog.sample_rows(("id", "path"))
+        paths = [row["path"] for row in rows]
+        ids = [row["id"] for row in rows]
+        position = {sample_id: pos for pos, sample_id in enumerate(ids)}
+        members: Dict[Tuple[str, str], List[int]] = {}
+        labels: Dict[Tuple[str, str], str] = {}
+        for tag in catalog.tag_rows():
+            if tag["sample_id"] not in position:
+                continue
+            key = (normalize_field(tag["field"]), tag["norm"])
+            members.setdefault(key, []).append(position[tag["sample_id"]])
+            labels.setdefault(key, tag["value"])
+        postings = {key: bitmap_from_positions(pos, len(paths)) for key, pos in members.items()}
+        return cls(paths, ids, postings, labels, generation, catalog.db_path)
+
+    # ---------------------------------------------------------------- predicates
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def tag(self, field: str, value: str) -> int:
+        """Bitmap of samples where `field` equals `value` (case-insensitive)."""
+        return self.postings.get((normalize_field(field), normalize_tag(value)), 0)
+
+    def any_of(self, field: str, values: Iterable[str]) -> int:
+        """OR of several values for one field."""
+        result = 0
+        for value in values:
+            result |= self.tag(field, value)
+        return result
+
+    def has_field(self, field: str) -> int:
+        """Bitmap of samples that have any value for `field`."""
+        return self.any_of_keys(self._fields.get(normalize_field(field), ()))
+
+    def any_of_keys(self, keys: Iterable[Tuple[str, str]]) -> int:
+        result = 0
+        for key in keys:
+            result |= self.postings.get(key, 0)
+        return result
+
+    def invert(self, bitmap: int) -> int:
+        """NOT: every sample not in `bitmap`."""
+        return self.universe & ~bitmap
+
+    def folder_mask(self, folder: Optional[str]) -> int:
+        """Bitmap of samples below `folder` (a contiguous range, thanks to path ordering)."""
+        if not folder:
+            return self.universe
+        low, high = folder_bounds(folder)
+        start = bisect.bisect_left(self.paths, low)
+        stop = bisect.bisect_left(self.paths, high)
+        return ((1 << stop) - 1) ^ ((1 << start) - 1)
+
+    def ids_mask(self, sample_ids: Iterable[int]) -> int:
+        """Bitmap for a set of catalog sample ids (used to combine with other indexes)."""
+        return bitmap_from_positions(
+            (self._position[i] for i in sample_ids if i in self._position), len(self.paths)
+        )
+
+    def match(self, tag_filter: Dict[str, Any]) -> int:
+        """
+        AND over fields; a list value means OR within that field.
+        Blank values are ignored (match anything), like the CLI filter prompts.
+        """
+        result = self.universe
+        for field, value in tag_filter.items():
+            if isinstance(value, (list, tuple, set)):
+                values = [v for v in value if v and str(v).strip()]
+                if values:
+                    result &= self.any_of(field, values)
+            elif value and str(value).strip():
+                result &= self.tag(field, value)
+        return result
+
+    def query(self, expression: str) -> int:
+        """Evaluate a query string (see parse_query) to a bitmap."""
+        return parse_query(expression)(self) if expression.strip() else self.universe
+
+    # ---------------------------------------------------------------- results
+
+    def count(self, bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def to_paths(self, bitmap: int, limit: Optional[int] = None) -> List[str]:
+        result = []
+        for pos in iter_positions(bitmap):
+            result.append(self.paths[pos])
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def to_ids(self, bitmap: int) -> List[int]:
+        return [self.ids[pos] for pos in iter_positions(bitmap)]
+
+    def facets(self, field: str, within: Optional[int] = None, top: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Value counts for `field`, optionally restricted to the samples in `within`."""
+        counts = []
+        for key in self._fields.get(normalize_field(field), ()):
+            bitmap = self.postings[key] if within is None else self.postings[key] & within
+            n = bitmap.bit_count()
+            if n:
+                counts.append((self.labels[key], n))
+        counts.sort(key=lambda item: (-item[1], item[0].lower()))
+        return counts[:top] if top else counts
+
+    def fields(self) -> List[str]:
+        return sorted(self._fields)
+
+
+# ---------------------------------------------------------------- query parser
+
+def parse_query(expression: str):
+    """
+    Compile a tag query into a function TagIndex -> bitmap.
+    Grammar:  expr := term (OR term)* ; term := factor ((AND)? factor)* ;
+              factor := NOT factor | '(' expr ')' | field:value | field:"quoted value"
+    """
+    tokens: List[Tuple[str, Any]] = []
+    for m in _TOKEN_RE.finditer(expression):
+        lparen, rparen, field, quoted, bare, word = m.groups()
+        if lparen:
+            tokens.append(("(", None))
+        elif rparen:
+            tokens.append((")", None))
+        elif field:
+            tokens.append(("tag", (normalize_field(field), quoted if quoted is not None else bare)))
+        elif word and word.upper() in ("AND", "OR", "NOT"):
+            tokens.append((word.upper(), None))
+        elif word:
+            raise ValueError(f"Invalid query term '{word}' (expected field:value)")
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def take() -> Tuple[str, Any]:
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def expr():
+        parts = [term()]
+        while peek() == "OR":
+            take()
+            parts.append(term())
+        return parts[0] if len(parts) == 1 else lambda ix: _fold_or(ix, parts)
+
+    def term():
+        parts = [factor()]
+        while peek() in ("AND", "NOT", "tag", "("):
+            if peek() == "AND":
+                take()
+            parts.append(factor())
+        return parts[0] if len(parts) == 1 else lambda ix: _fold_and(ix, parts)
+
+    def factor():
+        kind = peek()
+        if kind == "NOT":
+            take()
+            inner = factor()
+            return lambda ix: ix.invert(inner(ix))
+        if kind == "(":
+            take()
+            inner = expr()
+            if peek() != ")":
+                raise ValueError("Unbalanced parentheses in query")
+            take()
+            return inner
+        if kind == "tag":
+            field, value = take()[1]
+            return lambda ix: ix.tag(field, value)
+        raise ValueError(f"Unexpected token in query: {kind or 'end of query'}")
+
+    compiled = expr()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected token in query: {tokens[pos][0]}")
+    return compiled
+
+
+def _fold_or(index: TagIndex, parts: List[Any]) -> int:
+    result = 0
+    for part in parts:
+        result |= part(index)
+    return result
+
+
+def _fold_and(index: TagIndex, parts: List[Any]) -> int:
+    result = index.universe
+    for part in parts:
+        result &= part(index)
+        if not result:
+            break
+    return result
+
+
+# ---------------------------------------------------------------- shared instance
+
+_index: Optional[TagIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_tag_index(catalog: Optional[LibraryCatalog] = None) -> TagIndex:
+    """
+    Return the shared index, rebuilding it only when the catalog generation changed.
+    The CLI tools, GUI and API all go through here.
+    """
+    global _index
+    catalog = catalog or get_catalog()
+    with _index_lock:
+        if _index is None or _index.source != catalog.db_path or _index.generation != catalog.generation():
+            _index = TagIndex.from_catalog(catalog)
+        return _index
+
+
+def browse(
+    expression: str = "",
+    folder: Optional[str] = None,
+    facet_fields: Iterable[str] = ("genre", "mood", "instrument"),
+    limit: int = 100,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    One call for sample browsers (CLI, GUI, API): evaluate a tag query below an
+    optional folder and return the total, a page of paths and facet counts.
+    """
+    index = get_tag_index()
+    hits = index.query(expression) & index.folder_mask(folder)
+    page = index.to_paths(hits, limit=offset + limit)[offset:]
+    return {
+        "total": index.count(hits),
+        "paths": page,
+        "facets": {field: dict(index.facets(field, within=hits)) for field in facet_fields},
+    }
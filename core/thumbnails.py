@@ -0,0 +1,178 @@
+# core/thumbnails.py
+
+"""
+SampleMindAI – Thumbnail Renderer
+Small PNG waveform and mel-spectrogram thumbnails drawn straight into a NumPy
+raster, with no matplotlib figure per file:
+
+- waveforms come from the cached peak pyramid (core.peaks)
+- spectrograms from the cached log-mel features (core.features / feature_cache)
+- PNGs are encoded with zlib (no Pillow needed)
+
+Batches run on a process pool (core.batch_executor) and skip files whose
+thumbnail is already newer than the audio. Thumbnail names carry a short hash of
+the source path, so same-named files from different folders never share one.
+
+Usage:
+    from core.thumbnails import render_thumbnails
+    written = render_thumbnails(paths, "data/waveforms", kind="waveform")
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+from functools import partial
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from utils.logger import log_event
+from core.batch_executor import run_batch
+from core.features import FeatureExtractor
+from core.peaks import get_peaks
+
+KINDS = ("waveform", "spectrogram")
+DEFAULT_WIDTH = 800
+DEFAULT_HEIGHT = 200
+
+BACKGROUND = (18, 18, 24)
+PEAK_COLOR = (80, 150, 255)
+RMS_COLOR = (170, 205, 255)
+# dark -> purple -> orange -> pale yellow, for spectrogram intensities
+COLORMAP_STOPS = np.array([
+    [0, 0, 4], [80, 18, 123], [182, 54, 121], [251, 136, 97], [252, 253, 191],
+], dtype=np.float32)
+
+SPECTROGRAM = FeatureExtractor(["log_mel"])
+
+
+# ---------------------------------------------------------------- PNG
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png(image: np.ndarray, compress_level: int = 6) -> bytes:
+    """Encode an (height, width, 3) uint8 RGB array as PNG bytes."""
+    height, width = image.shape[:2]
+    rows = np.empty((height, 1 + width * 3), dtype=np.uint8)
+    rows[:, 0] = 0  # filter type "None" for every scanline
+    rows[:, 1:] = np.ascontiguousarray(image, dtype=np.uint8).reshape(height, width * 3)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit truecolor
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), compress_level))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def write_png(path: str, image: np.ndarray) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_png(image))
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------- rasters
+
+def waveform_image(mins: np.ndarray, maxs: np.ndarray, rms: np.ndarray,
+                   width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT) -> np.ndarray:
+    """Draw min/max (and RMS) envelope columns into an RGB raster."""
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = BACKGROUND
+    if not len(mins):
+        return image
+    # stretch the envelope columns over the image width
+    cols = np.minimum((np.arange(width) * len(mins)) // width, len(mins) - 1)
+    mins, maxs, rms = mins[cols], maxs[cols], rms[cols]
+    scale = (height - 1) / 2.0
+    rows = np.arange(height)[:, None]
+
+    def _band(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        top = np.floor((1.0 - np.clip(high, -1, 1)) * scale)
+        bottom = np.ceil((1.0 - np.clip(low, -1, 1)) * scale)
+        return (rows >= top) & (rows <= bottom)
+
+    image[_band(mins, maxs)] = PEAK_COLOR
+    image[_band(-rms, rms)] = RMS_COLOR
+    return image
+
+
+def spectrogram_image(log_mel: np.ndarray, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                      top_db: float = 80.0) -> np.ndarray:
+    """Colour-mapped log-mel spectrogram (low frequencies at the bottom) resized to width x height."""
+    if log_mel.size == 0:
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = BACKGROUND
+        return image
+    bands, frames = log_mel.shape
+    # average frames per column when shrinking, repeat when stretching
+    edges = np.linspace(0, frames, width + 1).astype(np.int64)
+    if frames >= width:
+        columns = np.add.reduceat(np.asarray(log_mel, dtype=np.float32), edges[:-1], axis=1) / np.diff(edges)
+    else:
+        columns = np.asarray(log_mel, dtype=np.float32)[:, np.minimum(edges[:-1], frames - 1)]
+    rows = np.minimum((np.arange(height) * bands) // height, bands - 1)[::-1]
+    grid = columns[rows]
+    peak = float(grid.max())
+    level = np.clip((grid - (peak - top_db)) / top_db, 0.0, 1.0)
+    position = level * (len(COLORMAP_STOPS) - 1)
+    low = np.minimum(position.astype(np.int64), len(COLORMAP_STOPS) - 2)
+    frac = (position - low)[..., None]
+    colors = COLORMAP_STOPS[low] * (1 - frac) + COLORMAP_STOPS[low + 1] * frac
+    return colors.astype(np.uint8)
+
+
+# ---------------------------------------------------------------- files
+
+def thumbnail_path(audio_path: str, out_dir: str, kind: str = "waveform") -> str:
+    """<out_dir>/<name>_<path hash>_<kind>.png; the hash of the absolute path keeps same-named files apart."""
+    audio_path = os.path.abspath(audio_path)
+    digest = hashlib.blake2b(audio_path.encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(out_dir, f"{os.path.splitext(os.path.basename(audio_path))[0]}_{digest}_{kind}.png")
+
+
+def is_fresh(audio_path: str, thumb_path: str) -> bool:
+    """True when the thumbnail exists and is newer than the audio file."""
+    try:
+        return os.stat(thumb_path).st_mtime_ns >= os.stat(audio_path).st_mtime_ns
+    except OSError:
+        return False
+
+
+def render_thumbnail(audio_path: str, out_dir: str, kind: str = "waveform",
+                     width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT) -> Optional[str]:
+    """Render one thumbnail; returns its path, or None if the audio could not be read."""
+    if kind == "spectrogram":
+        image = spectrogram_image(SPECTROGRAM.extract(audio_path)["log_mel"], width, height)
+    else:
+        pyramid = get_peaks(audio_path)
+        if pyramid is None:
+            return None
+        image = waveform_image(*pyramid.view(width=width), width=width, height=height)
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = thumbnail_path(audio_path, out_dir, kind)
+    write_png(out_path, image)
+    return out_path
+
+
+def render_thumbnails(
+    paths: Iterable[str],
+    out_dir: str,
+    kind: str = "waveform",
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> List[str]:
+    """Render thumbnails for `paths` on a process pool, skipping up-to-date ones. Returns written paths."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown thumbnail kind '{kind}' (expected one of {', '.join(KINDS)})")
+    paths = list(paths)
+    todo = [p for p in paths if force or not is_fresh(p, thumbnail_path(p, out_dir, kind))]
+    render = partial(render_thumbnail, out_dir=out_dir, kind=kind, width=width, height=height)
+    written = [out for _, out in run_batch(render, todo, workers=workers, description=f"Rendering {kind}s") if out]
+    log_event(f"Thumbnails: {len(written)} {kind}(s) written, {len(paths) - len(todo)} up to date")
+    return written
@@ -1 +1,27 @@
-# Empty module: sample_browser_gui
+# gui/components/sample_browser_gui.py
+
+"""
+SampleMindAI – Sample Browser (GUI data layer)
+Backs the GUI sample browser with the shared catalog tag index: tag queries,
+facet sidebars and paging are answered in memory, never by reading sidecars.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from core.tag_index import browse
+
+FACET_FIELDS = ("genre", "mood", "instrument")
+
+
+def load_page(
+    query: str = "",
+    folder: Optional[str] = None,
+    page: int = 0,
+    page_size: int = 50,
+    facet_fields: Iterable[str] = FACET_FIELDS,
+) -> Dict[str, Any]:
+    """Return one page of results plus facet counts for the sidebar."""
+    result = browse(query, folder=folder, facet_fields=facet_fields, limit=page_size, offset=page * page_size)
+    result["page"] = page
+    result["page_size"] = page_size
+    return result
@@ -1 +1,17 @@
-# Empty module: waveform
+# gui/components/waveform.py
+
+"""
+SampleMindAI – Waveform (GUI data layer)
+Envelope data for waveform widgets, served from the cached peak pyramid
+(core.peaks): any zoom level or scroll position is answered without touching
+the source audio.
+"""
+
+from typing import Any, Dict, Optional
+
+from core.peaks import waveform_envelope
+
+
+def load_waveform(path: str, start: int = 0, stop: Optional[int] = None, width: int = 800) -> Dict[str, Any]:
+    """Min/max/RMS columns for frames [start, stop) of `path`, at most `width` of them."""
+    return waveform_envelope(path, start, stop, width) or {"path": path, "error": "unreadable"}
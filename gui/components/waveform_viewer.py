@@ -0,0 +1,43 @@
+# gui/components/waveform_viewer.py
+
+"""
+SampleMindAI – Waveform Viewer (GUI state)
+Zoom/scroll state for the waveform viewer; each change asks the peak pyramid
+(via gui.components.waveform) for just the visible columns.
+"""
+
+from typing import Any, Dict
+
+from core.peaks import LEVELS
+from gui.components.waveform import load_waveform
+
+
+class WaveformViewer:
+    """Visible frame range of one file, zoomed around a centre point."""
+
+    def __init__(self, path: str, frame_count: int, width: int = 800) -> None:
+        self.path = path
+        self.frame_count = frame_count
+        self.width = width
+        self.start = 0
+        self.stop = frame_count
+
+    def zoom(self, factor: float, center: float = 0.5) -> Dict[str, Any]:
+        """Zoom in (factor > 1) or out around `center` (0..1 of the visible range)."""
+        span = self.stop - self.start
+        anchor = self.start + span * center
+        # deepest zoom: one finest-level bucket per pixel
+        new_span = int(min(self.frame_count, max(self.width * LEVELS[0], span / factor)))
+        self.start = int(max(0, min(self.frame_count - new_span, anchor - new_span * center)))
+        self.stop = self.start + new_span
+        return self.visible()
+
+    def scroll(self, fraction: float) -> Dict[str, Any]:
+        """Move the visible range by `fraction` of its width (negative = left)."""
+        span = self.stop - self.start
+        self.start = int(max(0, min(self.frame_count - span, self.start + span * fraction)))
+        self.stop = self.start + span
+        return self.visible()
+
+    def visible(self) -> Dict[str, Any]:
+        return load_waveform(self.path, self.start, self.stop, self.width)
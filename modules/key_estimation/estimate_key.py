@@ -0,0 +1,147 @@
+# modules/key_estimation/estimate_key.py
+
+"""
+SampleMindAI – Key Estimation
+Musical key from a file's mean chroma profile (core.features "chroma_means",
+computed once per file content and cached by core.feature_cache), correlated
+against Krumhansl-Kessler major/minor profiles in all 12 transpositions.
+
+The 24 templates are z-normalized once into a (24, 12) matrix, so a stacked
+batch of chroma vectors is scored with a single matmul. Confidence is the gap
+between the best and the runner-up correlation.
+
+Results go to the catalog `key` / `key_confidence` columns; the catalog keeps
+the indexed `camelot` column in step with `key` for key and harmonic-neighbour
+queries.
+
+Usage:
+    from modules.key_estimation.estimate_key import estimate_key, estimate_keys, analyze_keys
+    estimate_key("pad.wav")            # {"key": "A minor", "camelot": "8A", "confidence": 0.21}
+    estimate_keys(chroma_matrix)       # (n, 12) -> list of the same dicts
+"""
+
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.config import config
+from utils.logger import log_event
+from utils.music_keys import PITCH_CLASSES, key_name, to_camelot
+from core.batch_executor import run_batch
+from core.catalog import LibraryCatalog, get_catalog
+from core.features import FeatureExtractor
+
+# Krumhansl & Kessler (1982) probe-tone ratings, tonic first
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+MIN_CORRELATION = 0.3          # below this there is no tonal centre worth reporting
+
+CHROMA = FeatureExtractor(["chroma_means"])
+
+
+def _zscore(matrix: np.ndarray) -> np.ndarray:
+    centered = matrix - matrix.mean(axis=-1, keepdims=True)
+    norm = np.linalg.norm(centered, axis=-1, keepdims=True)
+    return centered / np.where(norm > 0, norm, 1.0)
+
+
+def key_templates() -> np.ndarray:
+    """(24, 12) z-normalized templates: rows 0-11 major on C..B, rows 12-23 minor on C..B."""
+    rotations = [np.roll(MAJOR_PROFILE, tonic) for tonic in range(12)]
+    rotations += [np.roll(MINOR_PROFILE, tonic) for tonic in range(12)]
+    return _zscore(np.array(rotations))
+
+
+TEMPLATES = key_templates()
+KEY_NAMES = [key_name(pc, "major") for pc in PITCH_CLASSES] + [key_name(pc, "minor") for pc in PITCH_CLASSES]
+
+
+def estimate_keys(chroma: np.ndarray) -> List[Optional[Dict[str, Any]]]:
+    """
+    Keys for a stacked batch of chroma vectors, shape (n, 12) (or one vector).
+    Entries are None where no key correlates above MIN_CORRELATION.
+    """
+    chroma = np.atleast_2d(np.asarray(chroma, dtype=np.float64))
+    correlations = _zscore(chroma) @ TEMPLATES.T               # Pearson r, (n, 24)
+    order = np.argsort(correlations, axis=1)
+    best, second = order[:, -1], order[:, -2]
+    rows = np.arange(len(chroma))
+    top = correlations[rows, best]
+    gap = top - correlations[rows, second]
+    results: List[Optional[Dict[str, Any]]] = []
+    for index, r, margin in zip(best, top, gap):
+        if r < MIN_CORRELATION:
+            results.append(None)
+            continue
+        name = KEY_NAMES[index]
+        results.append({"key": name, "camelot": to_camelot(name), "confidence": round(float(margin), 4),
+                        "correlation": round(float(r), 4)})
+    return results
+
+
+def estimate_key(path: str) -> Optional[Dict[str, Any]]:
+    """Key of one file from its (cached) mean chroma profile, or None when atonal."""
+    return estimate_keys(CHROMA.extract(path)["chroma_means"])[0]
+
+
+def _chroma_means(path: str) -> List[float]:
+    return list(CHROMA.extract(path)["chroma_means"])
+
+
+def analyze_keys(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+    force: bool = False,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Estimate keys for `paths` and store key / key_confidence in the catalog.
+    Chroma profiles are extracted on a process pool; all files are then scored
+    together in one matmul. Every file read is stamped with key_analyzed_at, so
+    files that already have a key are reused and atonal or undecodable files are
+    not read again (they map to None), unless `force`.
+    """
+    catalog = catalog or get_catalog()
+    paths = list(paths)
+    cached = {} if force else catalog.get_samples(paths, ("key", "camelot", "key_confidence", "key_analyzed_at"))
+    result: Dict[str, Optional[Dict[str, Any]]] = {}
+    todo: List[str] = []
+    for path in paths:
+        row = cached.get(os.path.abspath(path))
+        if row is not None and row["key"]:
+            result[path] = {"key": row["key"], "camelot": row["camelot"], "confidence": row["key_confidence"]}
+        elif row is not None and row["key_analyzed_at"] is not None:
+            result[path] = None
+        else:
+            todo.append(path)
+
+    reused = len(result)
+    chromas = dict(run_batch(_chroma_means, todo, workers=workers, description="Extracting chroma"))
+    profiles = {path: chroma for path, chroma in chromas.items() if chroma is not None and len(chroma) == 12}
+    estimated = dict(zip(profiles, estimate_keys(np.array(list(profiles.values())))) if profiles else {})
+    now = time.time()
+    with catalog.transaction():
+        for path in chromas:
+            key = estimated.get(path)
+            fields = {"key": key["key"], "key_confidence": key["confidence"]} if key else {}
+            catalog.update_fields(path, {**fields, "key_analyzed_at": now})
+    result.update(estimated)
+    found = sum(1 for key in estimated.values() if key is not None)
+    log_event(f"Key estimation: {found} estimated, {len(chromas) - found} atonal or unreadable, {reused} reused")
+    return result
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.prompt import Prompt
+    from utils.file_utils import find_all_audio_files
+
+    console = Console()
+    folder = Prompt.ask("Folder to estimate keys for", default=config.SAMPLES_DIR)
+    keys = analyze_keys(find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS))
+    for path, key in sorted(keys.items()):
+        label = f"{key['key']} ({key['camelot']})" if key else "no key"
+        console.print(f"{os.path.basename(path)}: {label}")
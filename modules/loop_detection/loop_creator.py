@@ -0,0 +1,111 @@
+# modules/loop_detection/loop_creator.py
+
+"""
+SampleMindAI – Loop Creator
+Writes seamless loops from detected loop points (loop_detector): frames
+[start, end) are copied block by block and the seam is crossfaded with the
+audio that naturally follows the end (or leads into the start when the file
+stops at the end), so playback wraps without a click.
+
+The crossfade is equal-gain: loop points are chosen where both sides correlate,
+and equal-power fades would bump the level of correlated audio by 3 dB.
+
+Usage:
+    from modules.loop_detection.loop_creator import create_loop, create_loops
+    create_loop("pad.wav", "out/pad_loop.wav", start=0, end=176400)
+    create_loops(detect_loops(paths), "out/loops", root="data/loops", workers=8)
+"""
+
+import os
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.logger import log_event
+from core.batch_executor import run_batch
+from core.audio.slicing.trim_and_normalize import WRITE_FRAMES, output_subtype
+from modules.loop_detection.loop_detector import FrameSource
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+CROSSFADE_SEC = 0.01
+MIN_SCORE = 0.5                # loop points scoring lower are not worth writing
+
+
+def create_loop(path: str, out_path: str, start: int, end: int, crossfade_sec: float = CROSSFADE_SEC) -> Dict[str, Any]:
+    """
+    Write frames [start, end) of `path` to `out_path` (WAV) with a crossfaded seam.
+    Returns {"path", "source", "frames", "crossfade"} where crossfade is "after",
+    "before" or None (no room on either side of the loop).
+    """
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("soundfile is required to write loops")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with FrameSource(path) as source:
+        end = min(end, source.frame_count)
+        fade = min(int(crossfade_sec * source.sample_rate), (end - start) // 2)
+        ramp = ((np.arange(fade, dtype=np.float32) + 0.5) / max(fade, 1))[:, None]
+        if fade and end + fade <= source.frame_count:
+            # the head fades in over what would have followed the end
+            mode, position = "after", start
+            blend = source.read(end, end + fade) * (1.0 - ramp) + source.read(start, start + fade) * ramp
+        elif fade and start >= fade:
+            # the tail fades out into what leads into the start
+            mode, position = "before", end - fade
+            blend = source.read(end - fade, end) * (1.0 - ramp) + source.read(start - fade, start) * ramp
+        else:
+            mode, position, blend = None, start, None
+
+        with sf.SoundFile(tmp, "w", source.sample_rate, source.channels,
+                          subtype=output_subtype(path), format="WAV") as dst:
+            for offset in range(start, end, WRITE_FRAMES):
+                block = source.read(offset, min(offset + WRITE_FRAMES, end))
+                if blend is not None and offset < position + fade and position < offset + len(block):
+                    lo, hi = max(offset, position), min(offset + len(block), position + fade)
+                    block[lo - offset:hi - offset] = blend[lo - position:hi - position]
+                dst.write(block)
+    os.replace(tmp, out_path)
+    return {"path": out_path, "source": path, "frames": end - start, "crossfade": mode}
+
+
+def _create_item(item: tuple, crossfade_sec: float) -> Dict[str, Any]:
+    path, out_path, start, end = item
+    return create_loop(path, out_path, start, end, crossfade_sec)
+
+
+def create_loops(
+    loops: Dict[str, Dict[str, Any]],
+    out_dir: str,
+    workers: Optional[int] = None,
+    crossfade_sec: float = CROSSFADE_SEC,
+    min_score: float = MIN_SCORE,
+    root: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Write a seamless "<name>_loop.wav" for every {path: loop points} entry
+    (detect_loops() results) scoring at least `min_score`, on a process pool.
+    Loops keep the source's path relative to `root` (default: the folder all
+    sources share) inside `out_dir`, so same-named files never collide.
+    """
+    selected = {
+        os.path.abspath(path): points for path, points in loops.items()
+        if points and points.get("end") is not None and (points.get("score") or 0.0) >= min_score
+    }
+    if not selected:
+        return []
+    root = os.path.abspath(root) if root else os.path.commonpath([os.path.dirname(path) for path in selected])
+    items = [
+        (path, os.path.join(out_dir, os.path.splitext(os.path.relpath(path, root))[0] + "_loop.wav"),
+         points["start"], points["end"])
+        for path, points in selected.items()
+    ]
+    written = [result for _, result in run_batch(partial(_create_item, crossfade_sec=crossfade_sec), items,
+                                                 workers=workers, description="Writing loops") if result]
+    log_event(f"Loop creator: {len(written)} of {len(items)} loop(s) written to {out_dir}")
+    return written
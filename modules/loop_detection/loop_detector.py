@@ -1 +1,263 @@
-# Empty module: loop_detector
+# modules/loop_detection/loop_detector.py
+
+"""
+SampleMindAI – Loop Point Detector
+Finds seamless loop boundaries in loops and longer recordings:
+
+1. start: the first frame above the silence threshold
+2. candidate lengths: whole numbers of 4/4 bars at the file's tempo (catalog
+   bpm, estimated by core.tempo when missing)
+3. each candidate end is searched within +-4% of its bar length (the margin
+   core.tempo may move a tempo by when snapping to whole bars) by FFT
+   cross-correlation of the window after the start against the windows after
+   each possible end (loop_smoothness_detector)
+4. when there is no audio past a candidate end (a loop trimmed to its bars),
+   the wrap seam itself is scored: the tail before the end joined to the head
+   at the start is compared with the same transition at the loop's midpoint,
+   so a trimmed 4-bar loop yields a 4-bar loop point
+
+Only the head and the few small search windows are read: PCM WAV through the
+memory-mapped reader (core.pcm_reader), other formats with seek + read. Results
+are stored in the catalog `loop_start` / `loop_end` / `loop_score` columns
+(frames, score 0-1); loop_creator writes the crossfaded loops.
+
+Usage:
+    from modules.loop_detection.loop_detector import find_loop_points, detect_loops
+    find_loop_points("pad_120bpm.wav", bpm=120.0)   # {"start": 0, "end": 176400, "bars": 2, "score": 0.98, ...}
+    detect_loops(paths, workers=8)                    # batch + catalog
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.config import config
+from utils.logger import log_event
+from core.batch_executor import run_batch
+from core.catalog import LibraryCatalog, get_catalog
+from core.pcm_reader import open_pcm
+from core.tempo import BAR_COUNTS, BAR_TOLERANCE, analyze_tempo
+from modules.loop_detection.loop_smoothness_detector import find_seam, seam_score, smoothness_curve
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+BEATS_PER_BAR = 4
+SEAM_SEC = 0.05                # compared window on each side of the seam
+TOLERANCE = BAR_TOLERANCE      # end search range around the exact bar length
+SILENCE_DB = -60.0
+SCAN_FRAMES = 1 << 16
+DEVIATION_PENALTY = 0.05       # score cost of ending a full TOLERANCE away from the bar line
+TIE_MARGIN = 0.01              # longer loops win over shorter ones ranked at most this much higher
+SEAMLESS_SCORE = 0.9
+
+
+class FrameSource:
+    """Random access to float32 frames of one file, without decoding the rest."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._wave = open_pcm(path)
+        self._file = None
+        if self._wave is not None:
+            self.sample_rate, self.channels, self.frame_count = \
+                self._wave.sample_rate, self._wave.channels, self._wave.frame_count
+        else:
+            if not SOUNDFILE_AVAILABLE:
+                raise RuntimeError("soundfile is required to read non-WAV files")
+            self._file = sf.SoundFile(path)
+            self.sample_rate, self.channels, self.frame_count = \
+                self._file.samplerate, self._file.channels, self._file.frames
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Frames [start, stop) as float32, shape (frames, channels)."""
+        start, stop = max(0, start), min(self.frame_count, stop)
+        if stop <= start:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        if self._wave is not None:
+            return self._wave.read(start, stop)
+        self._file.seek(start)
+        return self._file.read(stop - start, dtype="float32", always_2d=True)
+
+    def read_mono(self, start: int, stop: int) -> np.ndarray:
+        block = self.read(start, stop)
+        return block[:, 0].copy() if self.channels == 1 else block.mean(axis=1, dtype=np.float32)
+
+    def first_sound(self, silence_db: float = SILENCE_DB) -> Optional[int]:
+        """First frame above `silence_db`, scanning from the start; None when silent."""
+        threshold = 10.0 ** (silence_db / 20.0)
+        for offset in range(0, self.frame_count, SCAN_FRAMES):
+            loud = np.flatnonzero(np.abs(self.read(offset, offset + SCAN_FRAMES)).max(axis=1) > threshold)
+            if len(loud):
+                return offset + int(loud[0])
+        return None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "FrameSource":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def bar_frames(bpm: float, sample_rate: int, bars: int, beats_per_bar: int = BEATS_PER_BAR) -> int:
+    return int(round(bars * beats_per_bar * 60.0 / bpm * sample_rate))
+
+
+def _candidate(source: FrameSource, start: int, length: int, window: int) -> Optional[Dict[str, Any]]:
+    """Best end point for a loop of about `length` frames from `start`, or None if it does not fit."""
+    n = source.frame_count
+    slack = max(window, int(length * TOLERANCE))
+    lo, hi = start + length - slack, start + length + slack
+    if lo <= start + window:
+        return None
+    if hi + window <= n:
+        # the audio after the end should flow on like the audio after the start
+        offset, score = find_seam(source.read_mono(start, start + window), source.read_mono(lo, hi + window))
+        end = lo + offset
+    else:
+        # too little audio follows the end: score the seam as it plays back (tail before
+        # the end into the head at the start) against the same transition inside the
+        # loop, at the point near its middle (a beat line) where the audio flows on
+        # like the head
+        head = source.read_mono(start, start + window)
+        reach = slack // 2
+        around = start + length // 2 - reach
+        offset, _ = find_seam(head, source.read_mono(around, around + 2 * reach + window))
+        middle = around + offset
+        if middle - window < start:
+            return None
+        hi = min(hi, n)
+        # a tail window matches many sustained positions equally well, so the distance
+        # from the bar line decides between them here rather than only in the rank
+        curve = smoothness_curve(source.read_mono(middle - window, middle), source.read_mono(lo - window, hi))
+        if not len(curve):
+            return None
+        deviations = np.abs(lo + np.arange(len(curve)) - (start + length)) / float(slack)
+        end = lo + int(np.argmax(curve - DEVIATION_PENALTY * deviations))
+        seam = np.concatenate((source.read_mono(end - window, end), head))
+        score = seam_score(source.read_mono(middle - window, middle + window), seam)
+    deviation = abs(end - (start + length)) / float(slack)
+    return {"end": end, "score": score, "rank": score - DEVIATION_PENALTY * deviation}
+
+
+def find_loop_points(
+    path: str,
+    bpm: float,
+    bar_counts: Iterable[int] = BAR_COUNTS,
+    beats_per_bar: int = BEATS_PER_BAR,
+    silence_db: float = SILENCE_DB,
+) -> Optional[Dict[str, Any]]:
+    """
+    Best whole-bar loop in `path` at `bpm`: {"start", "end", "bars", "score", "bpm",
+    "sample_rate"} with frame positions, or None when the file is silent or too
+    short for one bar.
+    """
+    with FrameSource(path) as source:
+        start = source.first_sound(silence_db)
+        if start is None or not bpm:
+            return None
+        window = max(1, int(SEAM_SEC * source.sample_rate))
+        best = None
+        for bars in bar_counts:
+            length = bar_frames(bpm, source.sample_rate, bars, beats_per_bar)
+            if start + int(length * (1.0 - TOLERANCE)) > source.frame_count:
+                break  # even the shortest end of the search range is past the file
+            candidate = _candidate(source, start, length, window)
+            # on (nearly) equal ranks the longer loop wins: it repeats less audibly
+            if candidate is not None and (best is None or candidate["rank"] >= best["rank"] - TIE_MARGIN):
+                best = {**candidate, "bars": bars}
+        if best is None:
+            return None
+        return {
+            "start": start,
+            "end": best["end"],
+            "bars": best["bars"],
+            "score": round(best["score"], 4),
+            "bpm": bpm,
+            "sample_rate": source.sample_rate,
+        }
+
+
+def _find_pair(pair: Tuple[str, float]) -> Optional[Dict[str, Any]]:
+    return find_loop_points(pair[0], pair[1])
+
+
+def detect_loops(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    catalog: Optional[LibraryCatalog] = None,
+    force: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Find loop points for `paths` on a process pool and store loop_start / loop_end /
+    loop_score in the catalog. Files without a tempo get one from core.tempo first;
+    files that already have loop points are reused unless `force`.
+    """
+    catalog = catalog or get_catalog()
+    paths = list(paths)
+    cached = catalog.get_samples(paths, ("bpm", "loop_start", "loop_end", "loop_score"))
+    result: Dict[str, Dict[str, Any]] = {}
+    todo: List[str] = []
+    for path in paths:
+        row = cached.get(os.path.abspath(path))
+        if not force and row is not None and row["loop_end"] is not None:
+            result[path] = {"start": row["loop_start"], "end": row["loop_end"], "score": row["loop_score"],
+                            "bpm": row["bpm"]}
+        else:
+            todo.append(path)
+
+    reused = len(result)
+    bpms = {path: cached[os.path.abspath(path)]["bpm"] for path in todo
+            if os.path.abspath(path) in cached and cached[os.path.abspath(path)]["bpm"]}
+    missing = [path for path in todo if path not in bpms]
+    if missing:
+        tempos = analyze_tempo(missing, workers=workers, catalog=catalog)
+        bpms.update({path: tempo["bpm"] for path, tempo in tempos.items()})
+
+    pairs = [(path, bpms[path]) for path in todo if bpms.get(path)]
+    found = {
+        pair[0]: points
+        for pair, points in run_batch(_find_pair, pairs, workers=workers, chunksize=16,
+                                      description="Finding loop points")
+        if points is not None
+    }
+    with catalog.transaction():
+        for path, points in found.items():
+            catalog.update_fields(path, {"loop_start": points["start"], "loop_end": points["end"],
+                                         "loop_score": points["score"]})
+    result.update(found)
+    log_event(f"Loop points: {len(found)} found, {reused} reused, {len(todo) - len(found)} without a loop")
+    return result
+
+
+# Debug/test entry point
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.prompt import Confirm, Prompt
+    from rich.table import Table
+    from utils.file_utils import find_all_audio_files
+    from modules.loop_detection.loop_creator import create_loops
+
+    console = Console()
+    folder = Prompt.ask("Loops folder", default=config.LOOPS_DIR)
+    loops = detect_loops(find_all_audio_files(folder, config.SUPPORTED_EXTENSIONS))
+    table = Table(title=f"Loop points in {folder}")
+    for column in ("File", "Start", "End", "Score"):
+        table.add_column(column, justify="left" if column == "File" else "right")
+    for path, points in sorted(loops.items()):
+        style = "green" if points["score"] >= SEAMLESS_SCORE else "yellow"
+        table.add_row(os.path.basename(path), str(points["start"]), str(points["end"]),
+                      f"[{style}]{points['score']:.2f}[/{style}]")
+    console.print(table)
+    if loops and Confirm.ask("Write crossfaded loops?", default=False):
+        out_dir = Prompt.ask("Output folder", default=os.path.join(config.OUTPUT_DIR, "loops"))
+        written = create_loops(loops, out_dir, root=folder)
+        console.print(f"[green]Wrote {len(written)} loop(s) to {out_dir}[/green]")
@@ -0,0 +1,69 @@
+# modules/loop_detection/loop_smoothness_detector.py
+
+"""
+SampleMindAI – Loop Smoothness Detector
+Scores how seamlessly audio continues across a loop seam. A seam from `end`
+back to `start` is smooth when the audio around `end` looks like the audio
+around `start`, so the score is the normalized cross-correlation of a window
+at one side with a window at the other, scaled down when their levels differ
+(a fading tail correlates well but still jumps in level at the seam).
+
+find_seam() scores every offset of a search region in one FFT correlation
+instead of one dot product per candidate end point.
+
+Usage:
+    from modules.loop_detection.loop_smoothness_detector import find_seam, seam_score
+    offset, score = find_seam(head_window, search_region)
+    seam_score(window_a, window_b)     # 0.97
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+
+EPSILON = 1e-12
+
+
+def sliding_energy(signal: np.ndarray, width: int) -> np.ndarray:
+    """Sum of squares of every `width`-long window of `signal` (len(signal) - width + 1 values)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(np.square(signal, dtype=np.float64))))
+    return np.maximum(cumulative[width:] - cumulative[:-width], 0.0)
+
+
+def _score(correlation: np.ndarray, energy: np.ndarray, template_energy: float) -> np.ndarray:
+    ncc = correlation / np.sqrt(energy * template_energy + EPSILON)
+    level = np.sqrt(np.minimum(energy, template_energy) / (np.maximum(energy, template_energy) + EPSILON))
+    return np.clip(ncc, -1.0, 1.0) * level
+
+
+def smoothness_curve(template: np.ndarray, region: np.ndarray) -> np.ndarray:
+    """
+    Seam score of `template` against every window of `region` (valid offsets only,
+    len(region) - len(template) + 1 values), from a single FFT cross-correlation.
+    """
+    template = np.asarray(template, dtype=np.float64)
+    region = np.asarray(region, dtype=np.float64)
+    width = len(template)
+    if not width or len(region) < width:
+        return np.zeros(0)
+    size = next_fast_len(len(region) + width - 1)
+    correlation = irfft(rfft(region, size) * np.conj(rfft(template, size)), size)[:len(region) - width + 1]
+    return _score(correlation, sliding_energy(region, width), float(np.dot(template, template)))
+
+
+def find_seam(template: np.ndarray, region: np.ndarray) -> Tuple[int, float]:
+    """(offset into `region`, score) of the window that best matches `template`; (0, 0.0) if none fits."""
+    curve = smoothness_curve(template, region)
+    if not len(curve):
+        return 0, 0.0
+    offset = int(np.argmax(curve))
+    return offset, float(curve[offset])
+
+
+def seam_score(a: np.ndarray, b: np.ndarray) -> float:
+    """Seam score of two equally long windows: 1.0 for identical audio, <= 0 for unrelated or silent audio."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    energy_a, energy_b = float(np.dot(a, a)), float(np.dot(b, b))
+    return float(_score(np.array([np.dot(a, b)]), np.array([energy_b]), energy_a)[0])
@@ -0,0 +1,47 @@
+# tests/conftest.py
+
+import pytest
+
+from utils.config import config
+from core.catalog import get_catalog
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """The shared library catalog, redirected to a fresh database in tmp_path."""
+    monkeypatch.setattr(config, "CATALOG_PATH", str(tmp_path / "library_catalog.sqlite"))
+    return get_catalog()
+
+
+@pytest.fixture
+def write_wav(tmp_path):
+    """write_wav(name, signal, sr=22050, subtype="PCM_16") -> path of a WAV file in tmp_path."""
+    import soundfile as sf
+
+    def _write(name, signal, sr=22050, subtype="PCM_16"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sf.write(str(path), signal, sr, subtype=subtype)
+        return str(path)
+
+    return _write
+
+
+@pytest.fixture
+def feature_cache(catalog, tmp_path, monkeypatch):
+    """The shared feature cache, with arrays under tmp_path and scalars in the test catalog."""
+    from core import feature_cache as feature_cache_module
+
+    cache = feature_cache_module.FeatureCache(root=str(tmp_path / "features"))
+    monkeypatch.setattr(feature_cache_module, "_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def peaks_dir(catalog, tmp_path, monkeypatch):
+    """Peak pyramid cache directory under tmp_path."""
+    from core import peaks
+
+    path = str(tmp_path / "peaks")
+    monkeypatch.setattr(peaks, "PEAKS_DIR", path)
+    return path
@@ -0,0 +1,45 @@
+# tests/test_audio_probe.py
+
+import numpy as np
+import pytest
+
+from core import audio_probe
+from core.audio_probe import probe_file, probe_files
+
+
+@pytest.mark.parametrize("name, subtype, sample_width", [
+    ("tone.wav", "PCM_24", 3),
+    ("tone.flac", "PCM_16", 2),
+    ("tone.aiff", "PCM_16", 2),
+    ("tone.ogg", "VORBIS", None),
+])
+def test_probe_reads_headers(write_wav, name, subtype, sample_width):
+    path = write_wav(name, np.zeros((44100, 2)), sr=44100, subtype=subtype)
+
+    stats = probe_file(path)
+
+    assert stats["format"] == name.rsplit(".", 1)[1]
+    assert (stats["sample_rate"], stats["channels"], stats["sample_width"]) == (44100, 2, sample_width)
+    assert (stats["frame_count"], stats["duration_sec"]) == (44100, 1.0)
+
+
+def test_probe_files_reuses_catalog_rows(catalog, write_wav, monkeypatch):
+    path = write_wav("kick.wav", np.zeros(22050))
+    calls = []
+    real_probe = audio_probe.probe_file
+    monkeypatch.setattr(audio_probe, "probe_file", lambda p: calls.append(p) or real_probe(p))
+
+    first = probe_files([path], workers=1)
+    second = probe_files([path], workers=1)
+
+    assert calls == [path]
+    assert first[path]["duration_sec"] == second[path]["duration_sec"] == 1.0
+    assert second[path]["format"] == "wav"
+    assert catalog.get_sample(path)["sample_rate"] == 22050
+
+
+def test_unknown_file_is_not_probed(tmp_path):
+    path = tmp_path / "notes.wav"
+    path.write_bytes(b"plain text, not audio")
+
+    assert probe_file(str(path)) is None
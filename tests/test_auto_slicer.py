@@ -0,0 +1,70 @@
+# tests/test_auto_slicer.py
+
+import os
+
+import numpy as np
+import soundfile as sf
+
+from core.audio.slicing.auto_slicer import slice_file, slice_folder
+
+SR = 22050
+
+
+def _hits(count=4, spacing=0.5):
+    rng = np.random.RandomState(5)
+    y = np.zeros(int(count * spacing * SR))
+    decay = np.exp(-np.arange(int(0.2 * SR)) / (0.03 * SR))
+    for i in range(count):
+        start = int(i * spacing * SR)
+        y[start:start + len(decay)] += 0.8 * rng.uniform(-1, 1, len(decay)) * decay
+    return y
+
+
+def _bursts(count=3):
+    t = np.arange(int(0.3 * SR)) / SR
+    burst = 0.5 * np.sin(2 * np.pi * 330 * t)
+    gap = np.zeros(int(0.5 * SR))
+    return np.concatenate([np.concatenate([burst, gap]) for _ in range(count)])
+
+
+def test_onset_slices_start_at_each_hit(tmp_path, write_wav):
+    path = write_wav("break.wav", _hits())
+
+    slices = slice_file(path, str(tmp_path / "slices"), mode="onset")
+
+    assert len(slices) == 4
+    starts = np.array([info["start"] for info in slices]) / SR
+    hits = np.array([0.0, 0.5, 1.0, 1.5])
+    assert np.all(starts <= hits) and np.all(starts > hits - 0.05)   # never cut into a transient
+    assert slices[-1]["stop"] == len(_hits())
+    data, rate = sf.read(slices[1]["path"])
+    assert rate == SR and len(data) == slices[1]["frame_count"]
+
+
+def test_silence_slices_and_catalog_registration(catalog, tmp_path, write_wav):
+    source = write_wav("vocals/phrases.wav", _bursts())
+    out_dir = tmp_path / "slices"
+
+    results = slice_folder(str(tmp_path / "vocals"), str(out_dir), mode="silence", workers=1)
+
+    slices = results[source]
+    assert len(slices) == 3
+    for info, expected in zip(slices, (0.0, 0.8, 1.6)):
+        assert abs(info["start"] / SR - expected) < 0.05
+        tags = catalog.get_tags(info["path"])
+        assert tags["slice_of"] == source
+        assert tags["slice_range"] == f"{info['start']}-{info['stop']}"
+        assert tags["slice_mode"] == "silence"
+
+
+def test_same_named_sources_keep_their_subfolders(catalog, tmp_path, write_wav):
+    kit_a = write_wav("kits/a/break.wav", _hits(count=2))
+    kit_b = write_wav("kits/b/break.wav", _hits(count=3))
+    out_dir = tmp_path / "slices"
+
+    results = slice_folder(str(tmp_path / "kits"), str(out_dir), mode="onset", workers=1)
+
+    assert [len(results[kit_a]), len(results[kit_b])] == [2, 3]
+    assert os.path.dirname(results[kit_a][0]["path"]) == str(out_dir / "a")
+    assert os.path.dirname(results[kit_b][0]["path"]) == str(out_dir / "b")
+    assert len({info["path"] for slices in results.values() for info in slices}) == 5
@@ -0,0 +1,85 @@
+# tests/test_batch_executor.py
+
+import os
+import threading
+import time
+
+from core.batch_executor import run_batch
+
+release = threading.Event()
+
+
+def _double(x):
+    if x == 3:
+        raise ValueError("bad item")
+    time.sleep(0.001 * (10 - x))   # finish out of order
+    return x * 2
+
+
+def _interrupt_at_three(x):
+    if x == 0:
+        release.wait(5)            # never finishes before the interrupt
+    if x == 3:
+        time.sleep(0.2)            # let 1 and 2 be collected first
+        raise KeyboardInterrupt
+    return x
+
+
+def _die_on_five(x):
+    if x == 5:
+        os._exit(1)
+    return x
+
+
+def test_ordered_results_follow_input_order():
+    results = list(run_batch(_double, range(10), kind="thread", workers=4, ordered=True, chunksize=1,
+                             show_progress=False))
+
+    assert [item for item, _ in results] == list(range(10))
+    assert results[3] == (3, None)
+    assert [result for item, result in results if item != 3] == [x * 2 for x in range(10) if x != 3]
+
+
+def test_unordered_results_cover_every_item():
+    results = dict(run_batch(_double, range(10), kind="thread", workers=4, chunksize=2, show_progress=False))
+
+    assert sorted(results) == list(range(10))
+    assert results[9] == 18 and results[3] is None
+
+
+def test_lazy_items_are_read_as_chunks_are_submitted():
+    drawn = []
+
+    def walk():
+        for x in range(1000):
+            drawn.append(x)
+            yield x
+
+    results = run_batch(str, walk(), kind="thread", workers=2, chunksize=4, ordered=True, show_progress=False)
+    first = next(results)
+
+    assert first == (0, "0")
+    assert len(drawn) <= 2 * 2 * 4                # the chunks in flight, not the whole walk
+    assert [item for item, _ in results] == list(range(1, 1000))
+
+
+def test_interrupt_in_ordered_mode_flushes_finished_results():
+    release.clear()
+    try:
+        results = list(run_batch(_interrupt_at_three, range(4), kind="thread", workers=2, ordered=True,
+                                 chunksize=1, show_progress=False))
+    finally:
+        release.set()
+
+    # item 0 never finished, so nothing was in order yet: 1 and 2 come out after the gap
+    assert results == [(1, 1), (2, 2)]
+
+
+def test_broken_process_pool_counts_lost_items_and_continues():
+    results = dict(run_batch(_die_on_five, range(40), workers=2, chunksize=2, show_progress=False))
+
+    assert sorted(results) == list(range(40))
+    assert results[5] is None
+    assert results[39] == 39
+    lost = [item for item, result in results.items() if result is None]
+    assert 5 in lost and len(lost) < 40
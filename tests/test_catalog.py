@@ -0,0 +1,74 @@
+# tests/test_catalog.py
+
+import os
+
+from core.catalog import DERIVED_FIELDS, GENERATION_COLUMNS
+from core.range_index import NUMERIC_COLUMNS
+
+
+def _rewrite(path, data):
+    st = os.stat(path)
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_content_change_resets_derived_fields_and_bumps_generation(catalog, tmp_path):
+    path = tmp_path / "kick.wav"
+    path.write_bytes(b"RIFF-one")
+    catalog.upsert_file(str(path))
+    catalog.update_fields(str(path), {"bpm": 120.0, "bpm_confidence": 0.8, "key": "A minor",
+                                      "key_confidence": 0.7, "quality_score": 91.0, "fingerprint_version": 1})
+    assert catalog.get_sample(str(path))["camelot"] == "8A"
+    generation = catalog.generation()
+
+    _rewrite(path, b"RIFF-two!")
+    catalog.upsert_file(str(path))
+
+    record = catalog.get_sample(str(path))
+    assert all(record[name] is None for name in DERIVED_FIELDS)
+    assert catalog.generation() > generation
+
+
+def test_unchanged_file_keeps_derived_fields(catalog, tmp_path):
+    path = tmp_path / "snare.wav"
+    path.write_bytes(b"RIFF-snare")
+    catalog.upsert_file(str(path))
+    catalog.update_fields(str(path), {"bpm": 96.0, "key": "C major"})
+
+    catalog.upsert_file(str(path))
+
+    record = catalog.get_sample(str(path))
+    assert (record["bpm"], record["key"], record["camelot"]) == (96.0, "C major", "8B")
+
+
+def test_paths_missing_includes_outdated_versions(catalog, tmp_path):
+    for name, version in (("a.wav", 1), ("b.wav", 0), ("c.wav", None)):
+        (tmp_path / name).write_bytes(name.encode())
+        catalog.upsert_file(str(tmp_path / name))
+        if version is not None:
+            catalog.update_fields(str(tmp_path / name), {"fingerprint_version": version})
+
+    missing = catalog.paths_missing(str(tmp_path), "fingerprint_version")
+    outdated = catalog.paths_missing(str(tmp_path), "fingerprint_version", current=1)
+
+    assert [os.path.basename(p) for p in missing] == ["c.wav"]
+    assert [os.path.basename(p) for p in outdated] == ["b.wav", "c.wav"]
+
+
+def test_generation_only_moves_for_indexed_data(catalog, tmp_path):
+    path = tmp_path / "pad.wav"
+    path.write_bytes(b"RIFF-pad")
+    catalog.upsert_file(str(path))
+    generation = catalog.generation()
+
+    catalog.upsert_file(str(path))
+    catalog.update_fields(str(path), {"loop_start": 0, "loop_end": 44100, "content_hash": "blake2b:4567"})
+    assert catalog.generation() == generation
+
+    catalog.update_fields(str(path), {"loudness_range_lu": 4.5})
+    assert catalog.generation() > generation
+    generation = catalog.generation()
+    catalog.set_tags(str(path), {"mood": "dark"}, sync_sidecar=False)
+    assert catalog.generation() > generation
+    assert set(NUMERIC_COLUMNS) <= GENERATION_COLUMNS
@@ -0,0 +1,39 @@
+# tests/test_content_hash.py
+
+import os
+
+from core import content_hash as content_hash_module
+from core.content_hash import content_hash, content_hashes, hash_range
+
+
+def test_hashes_are_reused_until_the_file_changes(catalog, tmp_path, monkeypatch):
+    path = tmp_path / "loop.wav"
+    path.write_bytes(b"RIFF" + bytes(4096))
+    calls = []
+    real_hash_file = content_hash_module.hash_file
+    monkeypatch.setattr(content_hash_module, "hash_file", lambda p: calls.append(p) or real_hash_file(p))
+
+    first = content_hash(str(path))
+    assert content_hash(str(path)) == first
+    assert len(calls) == 1
+
+    st = os.stat(path)
+    path.write_bytes(b"RIFF" + bytes(4095) + b"\x01")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert content_hash(str(path)) != first
+    assert len(calls) == 2
+
+
+def test_identical_content_shares_a_digest(catalog, tmp_path):
+    data = os.urandom(10_000)
+    paths = []
+    for name in ("a.wav", "b.wav"):
+        (tmp_path / name).write_bytes(data)
+        paths.append(str(tmp_path / name))
+    missing = str(tmp_path / "missing.wav")
+
+    digests = content_hashes(paths + [missing], workers=2)
+
+    assert set(digests) == set(paths)
+    assert digests[paths[0]] == digests[paths[1]]
+    assert hash_range(paths[0], 100, 50) == hash_range(paths[1], 100, 50)
@@ -0,0 +1,89 @@
+# tests/test_dedup.py
+
+import os
+
+import pytest
+
+from core.dedup import EDGE_BYTES, apply_plan, find_duplicates
+
+
+@pytest.fixture
+def library(tmp_path):
+    body = os.urandom(3 * EDGE_BYTES)
+    middle = len(body) // 2
+    files = {
+        "a/loop.wav": body,
+        "b/loop_copy.wav": body,
+        "c/tail_differs.wav": body[:-1] + bytes([body[-1] ^ 0xFF]),
+        "d/middle_differs.wav": body[:middle] + bytes([body[middle] ^ 0xFF]) + body[middle + 1:],
+        "e/other_size.wav": body + b"tail",
+    }
+    paths = {}
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir()
+        path.write_bytes(data)
+        paths[name] = str(path)
+    return paths
+
+
+def test_stages_narrow_candidates(catalog, library):
+    plan = find_duplicates(library.values(), workers=1)
+
+    assert plan["stats"]["files"] == 5
+    assert plan["stats"]["after_size"] == 4       # the other-size file is ruled out by size
+    assert plan["stats"]["after_edges"] == 3      # the tail-differs file by its last 64 KB
+    assert len(plan["groups"]) == 1                # the middle-differs file by the full hash
+    group = plan["groups"][0]
+    assert group["keep"] == library["a/loop.wav"]
+    assert group["duplicates"] == [library["b/loop_copy.wav"]]
+    assert plan["stats"]["reclaimable"] == group["size"]
+
+
+def test_apply_plan_deletes_unchanged_duplicates(catalog, library):
+    plan = find_duplicates([library["a/loop.wav"], library["b/loop_copy.wav"]], workers=1)
+
+    assert apply_plan(plan, dry_run=True)["done"] == [library["b/loop_copy.wav"]]
+    assert os.path.exists(library["b/loop_copy.wav"])
+
+    result = apply_plan(plan)
+    assert result["done"] == [library["b/loop_copy.wav"]]
+    assert not os.path.exists(library["b/loop_copy.wav"])
+    assert os.path.exists(library["a/loop.wav"])
+
+
+def test_apply_plan_skips_files_changed_since_planning(catalog, library):
+    plan = find_duplicates([library["a/loop.wav"], library["b/loop_copy.wav"]], workers=1)
+    duplicate = library["b/loop_copy.wav"]
+    st = os.stat(duplicate)
+    with open(duplicate, "r+b") as f:              # same size, new content
+        f.write(b"edited")
+    os.utime(duplicate, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    result = apply_plan(plan)
+
+    assert result == {"done": [], "skipped": [duplicate], "errors": []}
+    assert os.path.exists(duplicate)
+
+
+def test_apply_plan_skips_when_keeper_changed(catalog, library):
+    plan = find_duplicates([library["a/loop.wav"], library["b/loop_copy.wav"]], workers=1)
+    os.remove(library["a/loop.wav"])
+
+    result = apply_plan(plan)
+
+    assert result["skipped"] == [library["b/loop_copy.wav"]]
+    assert os.path.exists(library["b/loop_copy.wav"])
+
+
+def test_apply_plan_hardlink(catalog, library):
+    plan = find_duplicates([library["a/loop.wav"], library["b/loop_copy.wav"]], action="hardlink", workers=1)
+
+    catalog.update_fields(library["a/loop.wav"], {"bpm": 120.0, "key": "A minor"})
+
+    apply_plan(plan)
+
+    assert os.path.samefile(library["a/loop.wav"], library["b/loop_copy.wav"])
+    keeper, linked = catalog.get_sample(library["a/loop.wav"]), catalog.get_sample(library["b/loop_copy.wav"])
+    assert (linked["inode"], linked["mtime_ns"]) == (keeper["inode"], keeper["mtime_ns"])
+    assert (linked["bpm"], linked["camelot"], linked["content_hash"]) == (120.0, "8A", keeper["content_hash"])
@@ -0,0 +1,44 @@
+# tests/test_feature_cache.py
+
+import numpy as np
+
+from core.features import FeatureExtractor
+
+
+def test_store_and_load_round_trip(feature_cache):
+    log_mel = np.arange(12, dtype=np.float32).reshape(3, 4)
+    feature_cache.store("xxh3_128:abc", {
+        "tempo": (1, {"hop_length": 512}, 123.0),
+        "log_mel": (1, {"n_mels": 3}, log_mel),
+    })
+
+    loaded = feature_cache.load("xxh3_128:abc", {"tempo": (1, {"hop_length": 512}), "log_mel": (1, {"n_mels": 3})})
+
+    assert loaded["tempo"] == 123.0
+    np.testing.assert_array_equal(loaded["log_mel"], log_mel)
+    # another version or parameter set is a miss
+    assert feature_cache.load("xxh3_128:abc", {"tempo": (2, {"hop_length": 512})}) == {}
+    assert feature_cache.load("xxh3_128:abc", {"tempo": (1, {"hop_length": 256})}) == {}
+
+
+def test_extractor_skips_decoding_on_a_cache_hit(feature_cache, write_wav, monkeypatch):
+    t = np.arange(22050) / 22050
+    path = write_wav("tone.wav", 0.5 * np.sin(2 * np.pi * 440 * t))
+    extractor = FeatureExtractor(["spectral_centroid", "mfcc"])
+    first = extractor.extract(path)
+
+    def no_analysis(*args, **kwargs):
+        raise AssertionError("analyzed again despite a cache hit")
+
+    monkeypatch.setattr(FeatureExtractor, "extract_signal", no_analysis)
+    second = extractor.extract(path)
+
+    assert second["spectral_centroid"] == first["spectral_centroid"]
+    np.testing.assert_array_equal(second["mfcc"], first["mfcc"])
+
+
+def test_prune_drops_outdated_versions(feature_cache):
+    feature_cache.store("xxh3_128:abc", {"mfcc": (1, {}, np.zeros(3)), "tempo": (1, {}, 120.0)})
+
+    assert feature_cache.prune({"mfcc": 2, "tempo": 2}) == 2
+    assert feature_cache.load("xxh3_128:abc", {"mfcc": (1, {}), "tempo": (1, {})}) == {}
@@ -0,0 +1,63 @@
+# tests/test_features.py
+
+import librosa
+import numpy as np
+import pytest
+
+from core.features import FeatureExtractor, StreamingExtractor
+
+SR = 22050
+
+
+def _tone(seconds=2.0, freq=440.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_graph_matches_direct_librosa_calls():
+    y = _tone()
+    features = FeatureExtractor(["duration", "sample_rate", "spectral_centroid", "mfcc_means", "chroma_means",
+                                 "zero_crossings"]).extract_signal(y, SR)
+
+    assert features["duration"] == pytest.approx(2.0)
+    assert features["sample_rate"] == SR
+    assert features["spectral_centroid"] == pytest.approx(
+        float(librosa.feature.spectral_centroid(y=y, sr=SR).mean()), rel=1e-5)
+    np.testing.assert_allclose(features["mfcc_means"], librosa.feature.mfcc(y=y, sr=SR).mean(axis=1),
+                               rtol=1e-4, atol=1e-3)
+    assert int(np.argmax(features["chroma_means"])) == 9          # A
+    assert features["zero_crossings"] == int(librosa.zero_crossings(y).sum())
+
+
+def test_rms_matches_time_domain_rms():
+    y = _tone() * np.linspace(0, 1, int(2.0 * SR), dtype=np.float32)
+
+    rms = FeatureExtractor(["rms"]).extract_signal(y, SR)["rms"]
+
+    assert rms == pytest.approx(float(librosa.feature.rms(y=y).mean()), rel=1e-6)
+
+
+def test_unknown_features_and_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        FeatureExtractor(["loudness_war"])
+    with pytest.raises(ValueError):
+        FeatureExtractor(["rms"], window="hann")
+
+
+def test_streaming_matches_a_full_decode(feature_cache, write_wav):
+    rng = np.random.RandomState(3)
+    y = np.concatenate([_tone(20.0, 220.0), np.zeros(SR * 5, dtype=np.float32),
+                        0.2 * rng.uniform(-1, 1, SR * 15).astype(np.float32)])
+    path = write_wav("session.wav", y, subtype="FLOAT")
+    names = ["duration", "sample_rate", "rms", "zero_crossings", "mfcc_mean"]
+
+    full = FeatureExtractor(names, cache=False).extract(path)
+    streamed = StreamingExtractor(names, block_frames=64, cache=False).extract(path)
+
+    assert streamed["duration"] == full["duration"]
+    assert streamed["sample_rate"] == full["sample_rate"]
+    assert streamed["zero_crossings"] == full["zero_crossings"]
+    assert streamed["rms"] == pytest.approx(full["rms"], rel=5e-3)
+    assert streamed["mfcc_mean"] == pytest.approx(full["mfcc_mean"], rel=5e-3)
+    with pytest.raises(ValueError):
+        StreamingExtractor(["spectral_centroid"])
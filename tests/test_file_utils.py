@@ -0,0 +1,34 @@
+# tests/test_file_utils.py
+
+from utils.file_utils import find_all_audio_files, iter_audio_files
+
+
+def _library(root):
+    names = ["kick.wav", "Loops/Beat.WAV", "Loops/deep/pad.flac", "Loops/deep/notes.txt", "vocals/take.mp3"]
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    return {name: str(root / name) for name in names}
+
+
+def test_parallel_and_serial_walks_agree(tmp_path):
+    files = _library(tmp_path)
+    expected = sorted(path for name, path in files.items() if not name.endswith(".txt"))
+
+    assert sorted(iter_audio_files(tmp_path, [".wav", ".flac", ".mp3"], workers=4)) == expected
+    assert sorted(iter_audio_files(tmp_path, [".wav", ".flac", ".mp3"], workers=1)) == expected
+
+
+def test_extension_filter_and_depth(tmp_path):
+    files = _library(tmp_path)
+
+    assert find_all_audio_files(str(tmp_path), [".wav"]) == sorted([files["kick.wav"], files["Loops/Beat.WAV"]])
+    assert list(iter_audio_files(tmp_path, [".wav"], recursive=False)) == [files["kick.wav"]]
+
+
+def test_empty_extension_list_matches_nothing(tmp_path):
+    _library(tmp_path)
+
+    assert list(iter_audio_files(tmp_path, [])) == []
+    assert find_all_audio_files(str(tmp_path), [], workers=1) == []
@@ -0,0 +1,54 @@
+# tests/test_fingerprint.py
+
+import numpy as np
+
+from cli.options.import_samples import import_sample
+from core import fingerprint
+from core.fingerprint import compute_fingerprint, find_near_duplicates, fingerprint_folder, similar_to
+
+
+def _melody(seed, seconds=8.0, sr=22050):
+    rng = np.random.RandomState(seed)
+    notes = []
+    for freq in rng.uniform(200, 2000, size=int(seconds * 4)):
+        t = np.arange(int(sr / 4)) / sr
+        notes.append(np.sin(2 * np.pi * freq * t) * np.hanning(len(t)))
+    return 0.5 * np.concatenate(notes)
+
+
+def test_near_duplicates_are_grouped(catalog, tmp_path, write_wav):
+    original = _melody(1)
+    noise = np.random.RandomState(9).normal(0, 0.002, len(original))
+    paths = [
+        write_wav("a/melody.wav", original),
+        write_wav("b/melody_quiet.wav", 0.6 * original + noise),
+        write_wav("c/other.wav", _melody(2)),
+    ]
+
+    assert fingerprint_folder(str(tmp_path), workers=1) == 3
+    assert fingerprint_folder(str(tmp_path), workers=1) == 0     # incremental: nothing new
+
+    groups = find_near_duplicates(str(tmp_path))
+    assert [group["paths"] for group in groups] == [paths[:2]]
+    assert [match[0] for match in similar_to(paths[0])] == [paths[1]]
+
+
+def test_unreadable_file_is_skipped(tmp_path):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"not audio")
+
+    assert compute_fingerprint(str(path)) is None
+
+
+def test_import_checks_for_duplicates_only_when_asked(tmp_path, write_wav, monkeypatch):
+    checked = []
+    monkeypatch.setattr(fingerprint, "similar_to", lambda path: checked.append(path) or [])
+    source = write_wav("incoming/kick.wav", _melody(3, seconds=1.0))
+    library = tmp_path / "library"
+    library.mkdir()
+
+    import_sample(source, str(library))
+    assert checked == []
+
+    import_sample(source, str(library), check_duplicates=True)
+    assert checked == [str(library / "kick.wav")]
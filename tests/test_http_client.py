@@ -0,0 +1,84 @@
+# tests/test_http_client.py
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.config import config
+from core.http_client import get_session, make_session, timeouts
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"          # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server.requests += 1
+        server.clients.add(self.client_address)
+        status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.delay)
+        body = b'{"ok": true}'
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass                             # the client gave up waiting
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(config, "HTTP_BACKOFF", 0.0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests, httpd.clients, httpd.statuses, httpd.delay = 0, set(), [], 0.0
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/api/generate"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_session_reuses_one_connection(server):
+    session = get_session()
+    assert get_session() is session
+
+    for _ in range(3):
+        assert session.post(server.url, json={"prompt": "hi"}, timeout=timeouts()).json() == {"ok": True}
+
+    assert server.requests == 3
+    assert len(server.clients) == 1
+
+
+def test_refused_requests_are_retried(server):
+    server.statuses = [503, 429]
+
+    response = make_session(retries=2).post(server.url, json={"prompt": "hi"}, timeout=timeouts())
+
+    assert response.status_code == 200
+    assert server.requests == 3
+
+
+def test_timeouts_split_connect_and_read(monkeypatch):
+    monkeypatch.setattr(config, "HTTP_CONNECT_TIMEOUT", 3.0)
+    monkeypatch.setattr(config, "HTTP_READ_TIMEOUT", 120.0)
+
+    assert timeouts() == (3.0, 120.0)
+    assert timeouts(read=10.0) == (3.0, 10.0)
+
+
+def test_read_timeout_is_not_retried(server):
+    server.delay = 0.5
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        make_session(retries=3).post(server.url, json={"prompt": "hi"}, timeout=(1.0, 0.1))
+
+    assert server.requests == 1
@@ -0,0 +1,47 @@
+# tests/test_key_estimation.py
+
+import numpy as np
+import pytest
+
+from modules.key_estimation.estimate_key import KEY_NAMES, MAJOR_PROFILE, MINOR_PROFILE, analyze_keys, estimate_keys
+
+SR = 22050
+
+
+def _progression():
+    """i - iv - V in A minor: Am, Dm, E major (the G# marks the minor key)."""
+    chords = [(220.0, 261.63, 329.63), (293.66, 349.23, 440.0), (329.63, 415.30, 493.88)]
+    t = np.arange(SR) / SR
+    return np.concatenate([sum(0.2 * np.sin(2 * np.pi * f * t) for f in chord) for chord in chords] * 2)
+
+
+def test_profiles_map_to_their_keys():
+    chroma = [np.roll(profile, tonic) for profile in (MAJOR_PROFILE, MINOR_PROFILE) for tonic in range(12)]
+
+    keys = estimate_keys(np.array(chroma))
+
+    assert [key["key"] for key in keys] == KEY_NAMES
+    assert keys[9 + 12]["key"] == "A minor" and keys[9 + 12]["camelot"] == "8A"
+    assert estimate_keys(np.ones(12)) == [None]                   # no tonal centre
+
+
+def test_analyze_keys_stores_key_and_camelot(catalog, feature_cache, write_wav):
+    path = write_wav("progression.wav", _progression())
+
+    result = analyze_keys([path], workers=1)
+
+    assert result[path]["key"] == "A minor"
+    record = catalog.get_sample(path)
+    assert (record["key"], record["camelot"]) == ("A minor", "8A")
+    assert record["key_confidence"] == result[path]["confidence"]
+
+
+def test_atonal_files_are_read_once(catalog, feature_cache, write_wav, monkeypatch):
+    path = write_wav("noise.wav", np.zeros(SR, dtype=np.float32))
+
+    assert analyze_keys([path], workers=1)[path] is None
+    assert catalog.get_sample(path)["key_analyzed_at"] is not None
+
+    monkeypatch.setattr("modules.key_estimation.estimate_key._chroma_means",
+                        lambda path: pytest.fail("re-read an atonal file"))
+    assert analyze_keys([path], workers=1) == {path: None}
@@ -0,0 +1,65 @@
+# tests/test_library_query.py
+
+import pytest
+
+from core.library_query import parse_range, search
+from utils.music_keys import parse_key
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("118-124", (118.0, 124.0)),
+    ("124..118", (118.0, 124.0)),
+    ("118 – 124", (118.0, 124.0)),
+    ("<8", (None, 8.0)),
+    (">=120", (120.0, None)),
+    ("128", (128.0, 128.0)),
+    ("-14--6", (-14.0, -6.0)),
+    ("", None),
+    (None, None),
+])
+def test_parse_range(text, expected):
+    assert parse_range(text) == expected
+
+
+def test_parse_range_rejects_invalid():
+    with pytest.raises(ValueError):
+        parse_range("fast")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("A minor", ("A", "minor")),
+    ("Am", ("A", "minor")),
+    ("F#", ("F#", "major")),
+    ("Gb major", ("F#", "major")),
+    ("Bbm", ("A#", "minor")),
+    ("8A", ("A", "minor")),
+    ("8b", ("C", "major")),
+    ("H major", None),
+    ("", None),
+])
+def test_parse_key(text, expected):
+    assert parse_key(text) == expected
+
+
+def test_search_combines_tags_ranges_and_keys(catalog, tmp_path):
+    rows = {
+        "kick.wav": ("techno", 124.0, "A minor"),
+        "bass.wav": ("techno", 126.0, "E minor"),
+        "pad.wav": ("techno", 90.0, "A minor"),
+        "pluck.wav": ("house", 124.0, "A minor"),
+    }
+    paths = {}
+    for name, (genre, bpm, key) in rows.items():
+        paths[name] = str(tmp_path / name)
+        open(paths[name], "wb").close()
+        catalog.upsert_file(paths[name])
+        catalog.set_tags(paths[name], {"genre": genre}, sync_sidecar=False)
+        catalog.update_fields(paths[name], {"bpm": bpm, "key": key})
+
+    result = search("genre:techno", ranges={"bpm": (120, 130)})
+    assert sorted(result["paths"]) == sorted([paths["kick.wav"], paths["bass.wav"]])
+
+    assert search("genre:techno", ranges={"bpm": (120, 130)}, key="8A")["paths"] == [paths["kick.wav"]]
+    assert search(key="Am", compatible=True)["total"] == 4
+    with pytest.raises(ValueError):
+        search(ranges={"size": (1, 2)})
@@ -0,0 +1,63 @@
+# tests/test_library_scanner.py
+
+import os
+
+from core.library_scanner import files_to_analyze, pending_files
+
+
+def _touch(path, data=b"RIFF"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_rescan_only_reports_what_changed(catalog, tmp_path):
+    kick = _touch(tmp_path / "drums" / "kick.wav")
+    pad = _touch(tmp_path / "synths" / "pad.flac")
+    _touch(tmp_path / "synths" / "notes.txt")
+
+    first = catalog.sync_folder(str(tmp_path))
+    assert first["added"] == sorted([kick, pad])
+    assert pending_files(first) == sorted([kick, pad])
+
+    second = catalog.sync_folder(str(tmp_path))
+    assert pending_files(second) == [] and second["deleted"] == []
+    assert second["dirs_scanned"] == 0 and second["unchanged"] == 2
+
+    snare = _touch(tmp_path / "drums" / "snare.wav")
+    os.remove(pad)
+    third = catalog.sync_folder(str(tmp_path))
+    assert third["added"] == [snare]
+    assert third["deleted"] == [pad]
+    assert catalog.get_sample(pad) is None
+
+
+def test_report_filters_extensions_but_tracks_everything(catalog, tmp_path):
+    kick = _touch(tmp_path / "kick.wav")
+    _touch(tmp_path / "pad.flac")
+
+    report = catalog.sync_folder(str(tmp_path), [".wav"])
+
+    assert report["added"] == [kick]
+    assert catalog.get_sample(str(tmp_path / "pad.flac")) is not None
+
+
+def test_files_to_analyze_skips_analyzed_files(catalog, tmp_path):
+    kick = _touch(tmp_path / "kick.wav")
+    snare = _touch(tmp_path / "snare.wav")
+    exts = [".wav"]
+
+    assert files_to_analyze(str(tmp_path), exts, "duration_sec") == [kick, snare]
+    catalog.update_fields(kick, {"duration_sec": 0.5})
+
+    assert files_to_analyze(str(tmp_path), exts, "duration_sec") == [snare]
+    assert files_to_analyze(str(tmp_path), exts, "duration_sec", incremental=False) == [kick, snare]
+
+
+def test_empty_extension_list_reports_nothing(catalog, tmp_path):
+    _touch(tmp_path / "kick.wav")
+
+    report = catalog.sync_folder(str(tmp_path), [])
+
+    assert pending_files(report) == []
+    assert catalog.paths_missing(str(tmp_path), "duration_sec", []) == []
@@ -0,0 +1,58 @@
+# tests/test_llm_cache.py
+
+import pytest
+
+import core.llm_cache as llm_cache
+from core.llm_cache import LLMCache, cache_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_entries=2, ttl=0)
+    cache.put("a", "answer a")
+    cache.put("b", "answer b")
+    assert cache.get("a") == "answer a"     # a is now more recent than b
+
+    cache.put("c", "answer c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "answer a"
+    assert cache.get("c") == "answer c"
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+    cache.close()
+
+
+def test_ttl_expires_entries(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_entries=10, ttl=60)
+    cache.put("a", "answer a")
+    assert cache.get("a") == "answer a"
+
+    clock.now += 120
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["expired"], stats["entries"]) == (1, 0)
+    cache.close()
+
+
+def test_cache_key_covers_options():
+    base = cache_key("hermes", "hermes-samplemind", None, "Describe this loop")
+    assert base == cache_key("hermes", "hermes-samplemind", "", "Describe this loop", {})
+    assert base != cache_key("hermes", "hermes-samplemind", None, "Describe this loop", {"stream": True})
+    assert base != cache_key("openai", "hermes-samplemind", None, "Describe this loop")
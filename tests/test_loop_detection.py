@@ -0,0 +1,79 @@
+# tests/test_loop_detection.py
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from modules.loop_detection.loop_creator import create_loops
+from modules.loop_detection.loop_detector import SEAMLESS_SCORE, bar_frames, detect_loops, find_loop_points
+
+SR = 22050
+BPM = 120.0
+
+
+def _bar_pattern():
+    """One 4/4 bar at BPM: a decaying note per beat over a sustained bass tone."""
+    bar = bar_frames(BPM, SR, 1)
+    t = np.arange(bar) / SR
+    y = 0.2 * np.sin(2 * np.pi * 55.0 * t)
+    beat = bar // 4
+    for i, freq in enumerate((440.0, 330.0, 392.0, 330.0)):
+        note = np.arange(beat) / SR
+        y[i * beat:(i + 1) * beat] += 0.4 * np.sin(2 * np.pi * freq * note) * np.exp(-note * 8)
+    return y
+
+
+def _loop_file(write_wav, name, bars, lead=0.25):
+    return write_wav(name, np.concatenate([np.zeros(int(lead * SR)), np.tile(_bar_pattern(), bars)]), sr=SR)
+
+
+def test_loop_points_land_on_the_bar_line(write_wav):
+    points = find_loop_points(_loop_file(write_wav, "groove.wav", bars=3), BPM, bar_counts=(1, 2))
+
+    lead = int(0.25 * SR)
+    assert points["start"] == pytest.approx(lead, abs=2)
+    assert points["bars"] == 2
+    assert points["end"] - points["start"] == pytest.approx(bar_frames(BPM, SR, 2), abs=8)
+    assert points["score"] >= SEAMLESS_SCORE
+
+
+def test_silent_or_short_files_have_no_loop(write_wav):
+    assert find_loop_points(write_wav("silence.wav", np.zeros(SR * 3), sr=SR), BPM) is None
+    assert find_loop_points(write_wav("short.wav", _bar_pattern()[:SR // 2], sr=SR), BPM) is None
+
+
+def test_detect_and_create_loops(catalog, tmp_path, write_wav):
+    path = _loop_file(write_wav, "groove.wav", bars=3)
+    catalog.upsert_file(path)
+    catalog.update_fields(path, {"bpm": BPM})
+
+    loops = detect_loops([path], workers=1)
+    record = catalog.get_sample(path)
+    assert (record["loop_start"], record["loop_end"]) == (loops[path]["start"], loops[path]["end"])
+
+    written = create_loops(loops, str(tmp_path / "loops"), workers=1)
+    assert len(written) == 1 and written[0]["crossfade"] == "after"
+    data, rate = sf.read(written[0]["path"])
+    assert rate == SR and len(data) == loops[path]["end"] - loops[path]["start"]
+
+
+def test_trimmed_loop_is_scored_across_its_wrap(write_wav):
+    path = _loop_file(write_wav, "trimmed.wav", bars=2, lead=0.0)
+
+    points = find_loop_points(path, BPM, bar_counts=(1, 2))
+
+    assert points["bars"] == 2
+    assert points["end"] == pytest.approx(2 * bar_frames(BPM, SR, 1), abs=8)
+    assert points["score"] >= SEAMLESS_SCORE
+
+
+def test_same_named_loops_keep_their_subfolders(tmp_path, write_wav):
+    first = _loop_file(write_wav, "packs/a/pad.wav", bars=2)
+    second = _loop_file(write_wav, "packs/b/pad.wav", bars=2)
+    points = {"start": 0, "end": bar_frames(BPM, SR, 1), "score": 1.0}
+    out_dir = tmp_path / "loops"
+
+    written = create_loops({first: points, second: points}, str(out_dir), workers=1)
+
+    assert sorted(info["path"] for info in written) == [str(out_dir / "a" / "pad_loop.wav"),
+                                                        str(out_dir / "b" / "pad_loop.wav")]
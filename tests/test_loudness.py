@@ -0,0 +1,50 @@
+# tests/test_loudness.py
+
+import numpy as np
+import pytest
+
+from core import loudness
+from core.loudness import analyze_loudness, measure_loudness
+
+SR = 48000
+
+
+def _sine(amplitude, seconds, freq=997.0, phase=0.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return amplitude * np.sin(2 * np.pi * freq * t + phase)
+
+
+def test_integrated_loudness_of_reference_tones(write_wav):
+    tone = _sine(0.1, 10.0)                        # -20 dBFS peak, 997 Hz
+
+    mono = measure_loudness(write_wav("mono.wav", tone, sr=SR, subtype="FLOAT"))
+    stereo = measure_loudness(write_wav("stereo.wav", np.column_stack([tone, tone]), sr=SR, subtype="FLOAT"))
+
+    assert mono["integrated_lufs"] == pytest.approx(-23.01, abs=0.05)
+    assert stereo["integrated_lufs"] == pytest.approx(-20.0, abs=0.05)
+    assert stereo["loudness_range_lu"] == pytest.approx(0.0, abs=0.1)
+    assert stereo["sample_peak_db"] == pytest.approx(-20.0, abs=0.01)
+
+
+def test_loudness_range_and_true_peak(write_wav):
+    steps = np.concatenate([_sine(0.1, 10.0), _sine(0.1 * 10 ** (-10 / 20), 10.0)])
+    # a quarter-rate sine sampled 45 degrees off its crests: samples miss the peak by 3 dB
+    between = _sine(0.5, 2.0, freq=SR / 4, phase=np.pi / 4)
+
+    assert measure_loudness(write_wav("steps.wav", steps, sr=SR, subtype="FLOAT"))["loudness_range_lu"] == \
+        pytest.approx(10.0, abs=0.5)
+    stats = measure_loudness(write_wav("between.wav", between, sr=SR, subtype="FLOAT"))
+    assert stats["sample_peak_db"] == pytest.approx(20 * np.log10(0.5 * np.sqrt(0.5)), abs=0.01)
+    assert stats["true_peak_db"] == pytest.approx(20 * np.log10(0.5), abs=0.5)
+
+
+def test_analyze_loudness_stores_and_reuses_columns(catalog, write_wav, monkeypatch):
+    path = write_wav("tone.wav", _sine(0.1, 3.0), sr=SR)
+
+    first = analyze_loudness([path], workers=1)
+    monkeypatch.setattr(loudness, "measure_loudness", lambda p: pytest.fail("measured a stored file again"))
+    second = analyze_loudness([path], workers=1)
+
+    assert first[path]["loudness_lufs"] == pytest.approx(-23.01, abs=0.1)
+    assert second == first
+    assert catalog.get_sample(path)["true_peak_db"] == pytest.approx(first[path]["true_peak_db"])
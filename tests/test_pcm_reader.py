@@ -0,0 +1,49 @@
+# tests/test_pcm_reader.py
+
+import numpy as np
+import pytest
+
+from core.pcm_reader import open_pcm
+
+sf = pytest.importorskip("soundfile")
+
+
+@pytest.mark.parametrize("subtype, frames, channels", [
+    ("PCM_16", 1000, 2),
+    ("PCM_24", 999, 1),      # odd-sized data chunk: needs the RIFF pad byte
+    ("PCM_U8", 501, 1),
+    ("FLOAT", 640, 2),
+])
+def test_write_segment_round_trip(tmp_path, subtype, frames, channels):
+    rng = np.random.RandomState(7)
+    audio = (rng.uniform(-0.9, 0.9, size=(frames, channels))).astype(np.float32)
+    source = tmp_path / "source.wav"
+    sf.write(str(source), audio, 44100, subtype=subtype)
+    wave = open_pcm(str(source))
+    assert wave is not None
+
+    out = tmp_path / "segment.wav"
+    written = wave.write_segment(str(out), 100, frames - 50)
+
+    assert written == frames - 150
+    data = out.read_bytes()
+    assert len(data) % 2 == 0
+    segment = open_pcm(str(out))
+    assert (segment.sample_rate, segment.channels, segment.bits) == (44100, channels, wave.bits)
+    expected, _ = sf.read(str(source), start=100, stop=frames - 50, dtype="float32", always_2d=True)
+    decoded, rate = sf.read(str(out), dtype="float32", always_2d=True)
+    assert rate == 44100
+    np.testing.assert_array_equal(decoded, expected)
+    np.testing.assert_array_equal(segment.read(), expected)
+
+
+def test_empty_ranges(tmp_path):
+    source = tmp_path / "source.wav"
+    sf.write(str(source), np.zeros(10, dtype=np.float32), 8000, subtype="PCM_16")
+    wave = open_pcm(str(source))
+
+    assert len(wave.raw_bytes(5, 5)) == 0
+    assert wave.write_segment(str(tmp_path / "empty.wav"), 4, 2) == 0
+    empty = open_pcm(str(tmp_path / "empty.wav"))
+    assert empty.frame_count == 0
+    assert len(empty.raw_bytes()) == 0
@@ -0,0 +1,54 @@
+# tests/test_peaks.py
+
+import os
+
+import numpy as np
+import pytest
+
+from core import peaks
+from core.peaks import LEVELS, build_peaks, get_peaks, waveform_envelope
+
+SR = 22050
+
+
+def _signal():
+    t = np.arange(SR * 2) / SR
+    y = 0.25 * np.sin(2 * np.pi * 100 * t)
+    y[:1024] = 0.5                                   # four finest buckets of constant level
+    return y
+
+
+def test_pyramid_levels_hold_min_max_rms(write_wav):
+    pyramid = build_peaks(write_wav("tone.wav", _signal(), sr=SR, subtype="FLOAT"))
+
+    assert (pyramid.sample_rate, pyramid.frame_count) == (SR, SR * 2)
+    assert sorted(pyramid.levels) == list(LEVELS)
+    finest = pyramid.levels[256].astype(np.float32) / 32767
+    assert len(finest) == -(-SR * 2 // 256)
+    np.testing.assert_allclose(finest[:4], 0.5, atol=1e-4)
+    coarse = pyramid.levels[16384].astype(np.float32) / 32767
+    assert coarse[0, 1] == pytest.approx(0.5, abs=1e-4)
+    assert coarse[1, 0] == pytest.approx(-0.25, abs=1e-3)
+    assert coarse[1, 2] == pytest.approx(0.25 / np.sqrt(2), abs=1e-3)
+
+
+def test_view_reduces_to_the_requested_width(write_wav):
+    pyramid = build_peaks(write_wav("tone.wav", _signal(), sr=SR, subtype="FLOAT"))
+
+    mins, maxs, rms = pyramid.view(width=10)
+
+    assert len(mins) == len(maxs) == len(rms) == 10
+    assert maxs.max() == pytest.approx(0.5, abs=1e-4)
+    assert mins.min() == pytest.approx(-0.25, abs=1e-3)
+
+
+def test_pyramid_is_cached_by_content(peaks_dir, write_wav, monkeypatch):
+    path = write_wav("tone.wav", _signal(), sr=SR)
+    first = get_peaks(path)
+    assert len(os.listdir(peaks_dir)) == 1
+
+    monkeypatch.setattr(peaks, "build_peaks", lambda p: pytest.fail("rebuilt a cached pyramid"))
+    envelope = waveform_envelope(path, width=50)
+
+    assert envelope["frame_count"] == first.frame_count
+    assert len(envelope["max"]) == 50
@@ -0,0 +1,81 @@
+# tests/test_quality.py
+
+import numpy as np
+import pytest
+
+from core.quality import analyze_quality, measure_quality, quality_issues, quality_score
+
+SR = 44100
+
+
+def _faded_tone(seconds=2.0, amplitude=0.5, freq=440.0):
+    t = np.arange(int(seconds * SR)) / SR
+    fade = np.minimum(1.0, np.minimum(t, t[-1] - t) / 0.05)
+    return amplitude * np.sin(2 * np.pi * freq * t) * fade
+
+
+def _issues(path):
+    return [text for text, _ in quality_issues(measure_quality(path, cache=False))]
+
+
+def test_clean_tone_scores_full_marks(write_wav):
+    metrics = measure_quality(write_wav("clean.wav", _faded_tone(), sr=SR, subtype="FLOAT"), cache=False)
+
+    assert quality_score(metrics) == 100.0
+    assert metrics["loudness"]["sample_peak_db"] == pytest.approx(-6.02, abs=0.05)
+
+
+def test_clipping_and_dc_offset_are_reported(write_wav):
+    clipped = np.clip(_faded_tone(amplitude=2.0), -1.0, 1.0)
+    offset = _faded_tone() + 0.05
+
+    assert _issues(write_wav("clipped.wav", clipped, sr=SR, subtype="FLOAT"))[0].startswith("clipping")
+    assert any(text.startswith("DC offset") for text in _issues(write_wav("dc.wav", offset, sr=SR, subtype="FLOAT")))
+
+
+def test_noise_bed_and_band_limit_are_reported(write_wav):
+    rng = np.random.RandomState(0)
+    noise = 0.01 * rng.normal(size=2 * SR)                       # about -40 dBFS
+    hiss = np.concatenate([_faded_tone(1.0) + noise[:SR], noise[SR:]])
+    spectrum = np.fft.rfft(0.3 * rng.normal(size=2 * SR))
+    spectrum[np.fft.rfftfreq(2 * SR, 1 / SR) > 8000] = 0           # brick-wall low-pass, as in a lossy transcode
+    lowpassed = np.fft.irfft(spectrum) * np.minimum(1.0, np.minimum(np.arange(2 * SR), np.arange(2 * SR)[::-1]) / 2000)
+
+    assert any(text.startswith("noise floor") for text in _issues(write_wav("hiss.wav", hiss, sr=SR, subtype="FLOAT")))
+    metrics = measure_quality(write_wav("lowpassed.wav", lowpassed, sr=SR, subtype="FLOAT"), cache=False)
+    assert metrics["bandwidth_limited"] and metrics["bandwidth_hz"] == pytest.approx(8000, abs=1000)
+    assert quality_issues(metrics)[0][0].startswith("band-limited")
+
+
+def test_analyze_quality_stores_scores(catalog, feature_cache, write_wav):
+    path = write_wav("clean.wav", _faded_tone(freq=997.0), sr=SR)
+
+    result = analyze_quality([path], workers=1)
+
+    assert result[path]["quality_score"] == 100.0 and result[path]["issues"] == []
+    record = catalog.get_sample(path)
+    assert record["quality_score"] == 100.0
+    assert record["loudness_lufs"] == pytest.approx(-9.03, abs=0.3)
+    assert analyze_quality([path], workers=1)[path]["issues"] is None     # reused from the catalog
+
+
+def test_decays_are_not_a_noise_floor(write_wav):
+    t = np.arange(SR) / SR
+    kick = 0.9 * np.sin(2 * np.pi * (50 + 150 * np.exp(-t / 0.02)) * t) * np.exp(-t / 0.08)
+    t2 = np.arange(2 * SR) / SR
+    ringing = 0.8 * np.sin(2 * np.pi * 440 * t2 + 0.3) * np.exp(-t2 / 0.3)
+
+    for name, signal in (("kick.wav", np.concatenate([kick, np.zeros(SR // 4)])), ("ringing.wav", ringing)):
+        metrics = measure_quality(write_wav(name, signal, sr=SR, subtype="FLOAT"), cache=False)
+        assert metrics["noise_floor_db"] < -60.0
+        assert not any(text.startswith("noise floor") for text, _ in quality_issues(metrics))
+
+
+def test_transient_start_is_not_a_cut(write_wav):
+    rng = np.random.RandomState(1)
+    snare = 0.8 * rng.uniform(-1, 1, SR // 2) * np.exp(-np.arange(SR // 2) / (0.06 * SR))
+    t = np.arange(2 * SR) / SR
+    pad = 0.5 * np.sin(2 * np.pi * 220 * t + 1.0) * np.minimum(1.0, (t[-1] - t) / 0.05)
+
+    assert _issues(write_wav("snare.wav", snare, sr=SR, subtype="FLOAT")) == []
+    assert _issues(write_wav("pad.wav", pad, sr=SR, subtype="FLOAT")) == ["cut off at the start"]
@@ -0,0 +1,56 @@
+# tests/test_tag_index.py
+
+import pytest
+
+from core.catalog import normalize_tag
+from core.tag_index import TagIndex, bitmap_from_positions, get_tag_index, parse_query
+
+
+@pytest.fixture
+def index():
+    paths = ["/lib/kick.wav", "/lib/pad.wav", "/lib/bass.wav", "/lib/hat.wav"]
+    tags = {
+        ("genre", "techno"): [0, 2, 3],
+        ("genre", "ambient"): [1],
+        ("instrument", "drums"): [0, 3],
+        ("instrument", "synth bass"): [2],
+        ("mood", "dark"): [1, 2],
+    }
+    postings = {(field, normalize_tag(value)): bitmap_from_positions(pos, len(paths))
+                for (field, value), pos in tags.items()}
+    labels = {(field, normalize_tag(value)): value for field, value in tags}
+    return TagIndex(paths, list(range(1, len(paths) + 1)), postings, labels)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("genre:techno", ["/lib/kick.wav", "/lib/bass.wav", "/lib/hat.wav"]),
+    ("genre:techno instrument:drums", ["/lib/kick.wav", "/lib/hat.wav"]),
+    ("genre:techno AND NOT instrument:drums", ["/lib/bass.wav"]),
+    ("genre:ambient OR instrument:drums", ["/lib/kick.wav", "/lib/pad.wav", "/lib/hat.wav"]),
+    ("mood:dark (genre:ambient OR genre:techno)", ["/lib/pad.wav", "/lib/bass.wav"]),
+    ('instrument:"Synth Bass"', ["/lib/bass.wav"]),
+    ("Genre:TECHNO mood:dark", ["/lib/bass.wav"]),
+])
+def test_parse_query(index, expression, expected):
+    assert index.to_paths(parse_query(expression)(index)) == expected
+
+
+@pytest.mark.parametrize("expression", ["techno", "(genre:techno", "genre:techno OR", "NOT"])
+def test_parse_query_rejects_invalid(expression):
+    with pytest.raises(ValueError):
+        parse_query(expression)
+
+
+def test_index_follows_catalog_tags(catalog, tmp_path):
+    paths = [str(tmp_path / name) for name in ("kick.wav", "snare.wav", "pad.wav")]
+    for path, genre in zip(paths, ("Techno", "techno", "Ambient")):
+        open(path, "wb").close()
+        catalog.upsert_file(path)
+        catalog.set_tags(path, {"genre": genre}, sync_sidecar=False)
+
+    index = get_tag_index(catalog)
+    assert index.to_paths(index.query("genre:techno")) == paths[:2]
+    assert index.facets("genre") == [("Techno", 2), ("Ambient", 1)]
+
+    catalog.set_tags(paths[2], {"genre": "Techno"}, sync_sidecar=False)
+    assert get_tag_index(catalog).count(get_tag_index(catalog).query("genre:techno")) == 3
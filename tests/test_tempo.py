@@ -0,0 +1,68 @@
+# tests/test_tempo.py
+
+import os
+
+import numpy as np
+import pytest
+
+from core.tempo import analyze_tempo, bpm_hint, estimate_tempo_signal
+
+SR = 22050
+
+
+def _drum_loop(bpm, bars=4, tail=0.0):
+    beat = 60.0 / bpm
+    y = np.zeros(int((bars * 4 * beat + tail) * SR), dtype=np.float32)
+    click = (np.random.RandomState(1).uniform(-1, 1, 400) * np.exp(-np.arange(400) / 60)).astype(np.float32)
+    for i in range(bars * 4):
+        start = int(i * beat * SR)
+        y[start:start + len(click)] += click * (1.0 if i % 4 == 0 else 0.6)
+    return y
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Deep_Loop_124BPM.wav", 124.0),
+    ("128 bpm house.aif", 128.0),
+    ("beat-92.5bpm.wav", 92.5),
+    ("kick_909.wav", None),
+    ("loop_1200bpm.wav", None),
+])
+def test_bpm_hint(name, expected):
+    assert bpm_hint(f"/lib/{name}") == expected
+
+
+@pytest.mark.parametrize("bpm", [90.0, 126.0, 174.0])
+def test_loops_snap_to_whole_bars(bpm):
+    tempo = estimate_tempo_signal(_drum_loop(bpm), SR)
+
+    assert tempo["bpm"] == pytest.approx(bpm, abs=0.05)
+    assert tempo["source"] == "bars"
+
+
+def test_free_running_tempo_and_silence():
+    tempo = estimate_tempo_signal(_drum_loop(110.0, bars=6, tail=0.37), SR)
+
+    assert tempo["bpm"] == pytest.approx(110.0, abs=1.0) and tempo["source"] == "autocorrelation"
+    assert estimate_tempo_signal(np.zeros(SR * 4, dtype=np.float32), SR)["bpm"] is None
+
+
+def test_analyze_tempo_stores_bpm(catalog, write_wav):
+    path = write_wav("loop.wav", _drum_loop(126.0))
+
+    result = analyze_tempo([path], workers=1)
+
+    assert result[path]["bpm"] == pytest.approx(126.0, abs=0.05)
+    record = catalog.get_sample(path)
+    assert record["bpm"] == result[path]["bpm"] and record["bpm_confidence"] > 0
+    assert analyze_tempo([path], workers=1)[path]["source"] == "catalog"
+
+
+def test_files_without_a_pulse_are_read_once(catalog, write_wav, monkeypatch):
+    path = write_wav("pad.wav", np.zeros(SR * 2, dtype=np.float32))
+
+    assert path not in analyze_tempo([path], workers=1)
+    assert catalog.get_sample(path)["bpm_analyzed_at"] is not None
+
+    monkeypatch.setattr("core.tempo.estimate_tempo", lambda path: pytest.fail("re-read a file without a pulse"))
+    assert path not in analyze_tempo([path], workers=1)
+    assert catalog.paths_missing(os.path.dirname(path), "bpm_analyzed_at") == []
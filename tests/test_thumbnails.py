@@ -0,0 +1,65 @@
+# tests/test_thumbnails.py
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from core.thumbnails import encode_png, render_thumbnails, thumbnail_path, waveform_image
+
+
+def _decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    rows = np.frombuffer(zlib.decompress(data[41:41 + idat_length]), dtype=np.uint8)
+    return rows.reshape(height, 1 + width * 3)[:, 1:].reshape(height, width, 3)
+
+
+def test_png_encoder_round_trip():
+    image = np.random.RandomState(0).randint(0, 256, size=(7, 5, 3)).astype(np.uint8)
+
+    np.testing.assert_array_equal(_decode_png(encode_png(image)), image)
+
+
+def test_waveform_image_fills_the_envelope():
+    mins = np.array([-0.5, 0.0], dtype=np.float32)
+    maxs = np.array([0.5, 0.0], dtype=np.float32)
+    rms = np.zeros(2, dtype=np.float32)
+
+    image = waveform_image(mins, maxs, rms, width=2, height=101)
+
+    drawn = (image != image[0, 0]).any(axis=2)
+    assert drawn[:, 0].sum() == 51                 # rows 25..75 for a +-0.5 envelope
+    assert drawn[:, 1].sum() == 1                  # silence is the centre line only
+
+
+def test_render_skips_up_to_date_thumbnails(peaks_dir, feature_cache, tmp_path, write_wav):
+    t = np.arange(22050) / 22050
+    path = write_wav("tone.wav", 0.5 * np.sin(2 * np.pi * 440 * t))
+    out_dir = str(tmp_path / "thumbs")
+
+    written = render_thumbnails([path], out_dir, width=64, height=32, workers=1)
+    spectrograms = render_thumbnails([path], out_dir, kind="spectrogram", width=64, height=32, workers=1)
+
+    assert len(written) == len(spectrograms) == 1
+    assert _decode_png(open(written[0], "rb").read()).shape == (32, 64, 3)
+    assert render_thumbnails([path], out_dir, width=64, height=32, workers=1) == []
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+    assert render_thumbnails([path], out_dir, width=64, height=32, workers=1) == written
+
+
+def test_same_named_files_get_their_own_thumbnails(peaks_dir, tmp_path, write_wav):
+    t = np.arange(22050) / 22050
+    first = write_wav("kit_a/kick.wav", 0.5 * np.sin(2 * np.pi * 60 * t))
+    second = write_wav("kit_b/kick.wav", 0.5 * np.sin(2 * np.pi * 80 * t))
+    out_dir = str(tmp_path / "thumbs")
+
+    written = render_thumbnails([first, second], out_dir, width=64, height=32, workers=1)
+
+    assert len(set(written)) == 2
+    assert sorted(written) == sorted([thumbnail_path(first, out_dir), thumbnail_path(second, out_dir)])
+    assert render_thumbnails([first, second], out_dir, width=64, height=32, workers=1) == []
@@ -0,0 +1,46 @@
+# tests/test_trim_and_normalize.py
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from core.audio.slicing.trim_and_normalize import PAD_SEC, analyze, process, process_folder
+
+SR = 44100
+
+
+def _padded_tone(amplitude=0.25):
+    t = np.arange(SR) / SR
+    silence = np.zeros(SR // 2)
+    return np.concatenate([silence, amplitude * np.sin(2 * np.pi * 997 * t), silence])
+
+
+def test_analysis_finds_sound_bounds_and_levels(feature_cache, write_wav):
+    analysis = analyze(write_wav("tone.wav", _padded_tone(), sr=SR, subtype="FLOAT"))
+
+    assert analysis["start"] == pytest.approx(SR // 2, abs=2)
+    assert analysis["stop"] == pytest.approx(SR // 2 + SR, abs=2)
+    assert analysis["sample_peak_db"] == pytest.approx(-12.04, abs=0.05)
+    assert analysis["trimmed_lufs"] == pytest.approx(-12.04 - 3.01, abs=0.1)
+
+
+def test_process_trims_and_normalizes(feature_cache, tmp_path, write_wav):
+    source = write_wav("tone.wav", _padded_tone(), sr=SR, subtype="FLOAT")
+
+    peak = process(source, str(tmp_path / "peak.wav"), target_peak_db=-3.0)
+    loud = process(source, str(tmp_path / "loud.wav"), target_lufs=-20.0)
+
+    data, rate = sf.read(peak["path"])
+    assert rate == SR
+    assert len(data) == pytest.approx(SR + 2 * int(PAD_SEC * SR), abs=4)
+    assert 20 * np.log10(np.abs(data).max()) == pytest.approx(-3.0, abs=0.05)
+    assert loud["gain_db"] == pytest.approx(-20.0 - (-12.04 - 3.01), abs=0.1)
+
+
+def test_process_folder_keeps_the_layout(feature_cache, tmp_path, write_wav):
+    write_wav("in/drums/kick.wav", _padded_tone(), sr=SR)
+    write_wav("in/silent.wav", np.zeros(SR), sr=SR)
+
+    results = process_folder(str(tmp_path / "in"), str(tmp_path / "out"), workers=1, target_peak_db=-1.0)
+
+    assert [r["path"] for r in results] == [str(tmp_path / "out" / "drums" / "kick.wav")]
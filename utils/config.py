@@ -28,6 +28,9 @@ class SampleMindConfig:
         self.MODELS_DIR: str = os.path.join(self.PROJECT_ROOT, "models")
         self.OUTPUT_DIR: str = os.path.join(self.PROJECT_ROOT, "output")
 
+        # Persistent library catalog (SQLite) – single source of truth for queries
+        self.CATALOG_PATH: str = os.getenv("SAMPLEMIND_CATALOG", os.path.join(self.CACHE_DIR, "library_catalog.sqlite"))
+
         # AI backend configuration
         self.AI_BACKEND: str = os.getenv("SAMPLEMIND_AI_BACKEND", "hermes")  # "hermes", "librosa", "fallback_cnn"
         self.OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -35,9 +38,28 @@ class SampleMindConfig:
         self.HERMES_MODEL: str = os.getenv("HERMES_MODEL", "hermes-2-pro")
         self.FALLBACK_CNN_MODEL: str = os.path.join(self.MODELS_DIR, "cnn_audio_classifier.h5")
 
+        # Pooled HTTP sessions for model backends (core.http_client)
+        self.HTTP_POOL_SIZE: int = int(os.getenv("SAMPLEMIND_HTTP_POOL_SIZE", "16"))
+        self.HTTP_CONNECT_TIMEOUT: float = float(os.getenv("SAMPLEMIND_HTTP_CONNECT_TIMEOUT", "5"))
+        self.HTTP_READ_TIMEOUT: float = float(os.getenv("SAMPLEMIND_HTTP_READ_TIMEOUT", "60"))
+        self.HTTP_RETRIES: int = int(os.getenv("SAMPLEMIND_HTTP_RETRIES", "3"))
+        self.HTTP_BACKOFF: float = float(os.getenv("SAMPLEMIND_HTTP_BACKOFF", "0.5"))  # seconds, doubled per retry
+
+        # Persistent LLM response cache (core.llm_cache); CLI: --no-cache
+        self.LLM_CACHE: bool = os.getenv("SAMPLEMIND_LLM_CACHE", "1") != "0"
+        self.LLM_CACHE_PATH: str = os.getenv("SAMPLEMIND_LLM_CACHE_PATH", os.path.join(self.CACHE_DIR, "llm_cache.sqlite"))
+        self.LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("SAMPLEMIND_LLM_CACHE_MAX_ENTRIES", "50000"))
+        self.LLM_CACHE_TTL: float = float(os.getenv("SAMPLEMIND_LLM_CACHE_TTL", "0"))  # seconds, 0 = no expiry
+
         # Supported audio file formats
         self.SUPPORTED_EXTENSIONS: List[str] = [".wav", ".mp3", ".flac", ".aiff", ".ogg", ".m4a"]
 
+        # Thread pool size for I/O-bound work (directory walks, header probes)
+        self.IO_WORKERS: int = int(os.getenv("SAMPLEMIND_IO_WORKERS", "8"))
+
+        # Worker count for batch analysis/tagging (core.batch_executor); CLI: --workers
+        self.WORKERS: int = int(os.getenv("SAMPLEMIND_WORKERS", str(os.cpu_count() or 1)))
+
         # Debug/Test mode
         self.DEBUG_MODE: bool = os.getenv("SAMPLEMIND_DEBUG", "0") == "1"
 
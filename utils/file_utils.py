@@ -2,29 +2,102 @@
 
 """
 File utilities for SampleMindAI.
+
+Audio discovery uses one engine for the whole project: `os.scandir` (DirEntry
+type caching, so no extra stat per entry), a frozenset suffix lookup, and a
+thread pool that fans out across subdirectories. `iter_audio_files` is a lazy
+generator so consumers can start working before the walk finishes.
 """
 
 import os
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from utils.config import config
 
 def ensure_folder_exists(path: str) -> None:
     """Create folder if it does not exist."""
     os.makedirs(path, exist_ok=True)
 
-def find_all_audio_files(folder_path: str, supported_exts: List[str]) -> List[str]:
+def _suffix_set(supported_exts: Optional[Iterable[str]]) -> FrozenSet[str]:
+    # None means the configured audio formats; an empty list matches nothing
+    exts = config.SUPPORTED_EXTENSIONS if supported_exts is None else supported_exts
+    return frozenset(ext.lower() for ext in exts)
+
+def _scan_dir(path: str, suffixes: FrozenSet[str]) -> Tuple[List[str], List[str]]:
+    """List one directory: returns (matching audio files, subdirectories)."""
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    name = entry.name
+                    dot = name.rfind(".")
+                    if dot != -1 and name[dot:].lower() in suffixes and entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+def iter_audio_files(
+    folder_path: str,
+    supported_exts: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    recursive: bool = True,
+) -> Iterator[str]:
+    """
+    Lazily yield audio files below `folder_path` whose extension is in supported_exts
+    (None: config.SUPPORTED_EXTENSIONS; an empty list yields nothing). Subdirectories are listed in parallel
+    on a thread pool; order follows directory completion, not path order.
+    """
+    suffixes = _suffix_set(supported_exts)
+    root = os.fspath(folder_path)
+    workers = config.IO_WORKERS if workers is None else workers
+
+    if not recursive or workers <= 1:
+        stack = [root]
+        while stack:
+            files, subdirs = _scan_dir(stack.pop(), suffixes)
+            yield from files
+            if recursive:
+                stack.extend(subdirs)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scandir") as pool:
+        pending: Set[Future] = {pool.submit(_scan_dir, root, suffixes)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(pool.submit(_scan_dir, subdir, suffixes))
+                    yield from files
+        finally:
+            # Consumer stopped early: don't keep walking the rest of the tree
+            for future in pending:
+                future.cancel()
+
+def find_all_audio_files(
+    folder_path: str,
+    supported_exts: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+) -> List[str]:
     """
     Recursively finds all audio files with supported extensions in a folder.
+    Returns a sorted list; use iter_audio_files to stream results instead.
     """
-    result = []
-    for root, _, files in os.walk(folder_path):
-        for filename in files:
-            if any(filename.lower().endswith(ext) for ext in supported_exts):
-                result.append(os.path.join(root, filename))
-    return result
+    return sorted(iter_audio_files(folder_path, supported_exts, workers=workers))
 
 # Debug/test mode
 if __name__ == "__main__":
     print("Testing file_utils...")
     test_dir = "./test_samples"
     ensure_folder_exists(test_dir)
-    # Add test logic as needed
+    print(f"Found {len(find_all_audio_files(config.DATA_DIR))} audio files in {config.DATA_DIR}")
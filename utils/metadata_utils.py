@@ -9,6 +9,7 @@ import json
 import os
 from utils.config import config
 from utils.logger import log_event
+from core.catalog import get_catalog
 
 def save_metadata(file_path: str, metadata: dict, supported_exts: list) -> None:
     """
@@ -30,6 +31,9 @@ def save_metadata(file_path: str, metadata: dict, supported_exts: list) -> None:
         log_event(f"Saved metadata for {file_path} to {json_path}")
     except Exception as e:
         raise Exception(f"Failed to save metadata for {file_path}: {e}")
+
+    # Keep the library catalog in sync with the sidecar
+    get_catalog().import_sidecar(file_path)
     
     # Optionally, log the saved metadata (for debug purposes)
     log_event(f"Metadata for {file_path}: {metadata}")
@@ -0,0 +1,84 @@
+# utils/music_keys.py
+
+"""
+SampleMindAI – Musical Key Utilities
+Parse key names ("A minor", "Am", "F#m", "Bb major", "8A"), convert them to
+Camelot wheel codes, and list harmonically compatible keys for key-matched browsing.
+"""
+
+import re
+from typing import List, Optional, Set
+
+PITCH_CLASSES: List[str] = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+_FLATS = {"DB": "C#", "EB": "D#", "GB": "F#", "AB": "G#", "BB": "A#", "CB": "B", "FB": "E"}
+_SHARP_ALIASES = {"E#": "F", "B#": "C"}
+
+# Camelot number for each tonic pitch class (major = "B" ring, minor = "A" ring)
+CAMELOT_MAJOR = {"B": 1, "F#": 2, "C#": 3, "G#": 4, "D#": 5, "A#": 6, "F": 7, "C": 8, "G": 9, "D": 10, "A": 11, "E": 12}
+CAMELOT_MINOR = {"G#": 1, "D#": 2, "A#": 3, "F": 4, "C": 5, "G": 6, "D": 7, "A": 8, "E": 9, "B": 10, "F#": 11, "C#": 12}
+
+_KEY_RE = re.compile(r"^\s*([A-Ga-g])\s*([#♯b♭]?)\s*(major|maj|minor|min|m|dur|moll)?\s*$", re.IGNORECASE)
+_CAMELOT_RE = re.compile(r"^\s*(1[0-2]|[1-9])\s*([ABab])\s*$")
+
+
+def parse_key(text: Optional[str]) -> Optional[tuple]:
+    """
+    Parse a key name or Camelot code into (tonic, mode) with mode 'major'/'minor'.
+    Returns None if the text is not a recognizable key.
+    """
+    if not text:
+        return None
+    camelot = _CAMELOT_RE.match(str(text))
+    if camelot:
+        number, ring = int(camelot.group(1)), camelot.group(2).upper()
+        table = CAMELOT_MINOR if ring == "A" else CAMELOT_MAJOR
+        tonic = next(pc for pc, n in table.items() if n == number)
+        return tonic, "minor" if ring == "A" else "major"
+    m = _KEY_RE.match(str(text))
+    if not m:
+        return None
+    letter, accidental, mode = m.group(1).upper(), m.group(2), (m.group(3) or "major")
+    accidental = {"♯": "#", "♭": "b"}.get(accidental, accidental)
+    tonic = letter + accidental
+    if accidental.lower() == "b":
+        tonic = _FLATS.get(tonic.upper(), tonic)
+    tonic = _SHARP_ALIASES.get(tonic, tonic)
+    # A bare lowercase "m" means minor; "M"/"maj" means major
+    minor = mode.lower() in ("minor", "min", "moll") or mode == "m"
+    return tonic, "minor" if minor else "major"
+
+
+def key_name(tonic: str, mode: str) -> str:
+    """Canonical display name, e.g. 'A minor'."""
+    return f"{tonic} {mode}"
+
+
+def normalize_key(text: Optional[str]) -> Optional[str]:
+    """Canonical key name for any parseable key text, else None."""
+    parsed = parse_key(text)
+    return key_name(*parsed) if parsed else None
+
+
+def to_camelot(text: Optional[str]) -> Optional[str]:
+    """Camelot code (e.g. '8A') for a key name or code, else None."""
+    parsed = parse_key(text)
+    if not parsed:
+        return None
+    tonic, mode = parsed
+    return f"{CAMELOT_MINOR[tonic]}A" if mode == "minor" else f"{CAMELOT_MAJOR[tonic]}B"
+
+
+def compatible_camelot(code: Optional[str]) -> Set[str]:
+    """Harmonically compatible Camelot codes: same code, ±1 on the wheel, and the relative key."""
+    camelot = to_camelot(code)
+    if not camelot:
+        return set()
+    number, ring = int(camelot[:-1]), camelot[-1]
+    other = "B" if ring == "A" else "A"
+    return {
+        camelot,
+        f"{(number % 12) + 1}{ring}",
+        f"{((number - 2) % 12) + 1}{ring}",
+        f"{number}{other}",
+    }
@@ -2,18 +2,27 @@ from utils.config import config
 # utils/openai_utils.py
 
 import os
-import requests
+from typing import Optional
+from core.http_client import get_session, timeouts
+from core.llm_cache import cache_enabled, cache_key, get_llm_cache
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = "gpt-4o"  # This is GPT-4.1 (latest as of 2024/2025)
 
-def query_openai(prompt: str, stream: bool = False, **kwargs) -> str:
+def query_openai(prompt: str, stream: bool = False, use_cache: Optional[bool] = None, **kwargs) -> str:
     # ...your existing logic...
     """
     Query OpenAI's GPT-4.1 model for completions.
+    Answers are cached (core.llm_cache); use_cache=False forces a fresh one.
     """
     if not OPENAI_API_KEY:
         return "OpenAI API key not set."
+    cached = cache_enabled(use_cache)
+    key = cache_key("openai", OPENAI_MODEL, None, prompt, {"stream": stream, **kwargs})
+    if cached:
+        answer = get_llm_cache().get(key)
+        if answer is not None:
+            return answer
     url = "https://api.openai.com/v1/chat/completions"
     headers = {"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"}
     payload = {
@@ -22,9 +31,12 @@ def query_openai(prompt: str, stream: bool = False, **kwargs) -> str:
         "stream": stream,
     }
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = get_session().post(url, headers=headers, json=payload, timeout=timeouts())
         response.raise_for_status()
         data = response.json()
-        return data['choices'][0]['message']['content'].strip()
+        answer = data['choices'][0]['message']['content'].strip()
+        if cached and answer:
+            get_llm_cache().put(key, answer, "openai", OPENAI_MODEL)
+        return answer
     except Exception as e:
         return f"OpenAI Error: {e}"
\ No newline at end of file